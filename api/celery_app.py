@@ -1,4 +1,4 @@
 from api.app import init_celery
 
 app = init_celery()
-app.conf.imports = app.conf.imports + ("api.tasks.example",)
+app.conf.imports = app.conf.imports + ("api.tasks.example", "api.tasks.curation")
@@ -0,0 +1,276 @@
+'''
+Copyright (c) 2026 MTG-lab, University of Calgary
+
+You should have received a copy of the license along with this program.
+'''
+
+import gzip
+import logging
+import random
+import resource
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+from bson import json_util
+from mongoengine import connect, disconnect
+from mongoengine.connection import get_db
+
+from .models import AssociationInformation, CurationRun, GeneEntry, ParsedSection, PubmedEntry
+from .pubmed_cache import pubmed_cache
+
+
+BENCHMARK_DB = 'gpad_benchmark'
+FIXTURE_PATH = Path(__file__).parent / 'fixtures' / 'benchmark_corpus.json.gz'
+CORPUS_DOCUMENTS = [GeneEntry, PubmedEntry, AssociationInformation]
+
+
+def sample_paragraphs(sections: list, limit: int = 200):
+    """Paragraphs of the text sections of OMIM entries
+
+    Args:
+        sections (list): Text section names to take the paragraphs from
+        limit (int, optional): Number of entries to sample. Defaults to 200. 0 for all entries.
+
+    Returns:
+        list[str]: Paragraphs as the detectors read them
+    """
+    paragraphs = []
+    for entry in GeneEntry.objects(textSectionList__exists=True).only('textSectionList').limit(limit):
+        for text_section in entry.textSectionList:
+            if text_section['textSection']['textSectionName'] in sections:
+                paragraphs += text_section['textSection']['textSectionContent'].replace('al.', 'al').split('\n\n')
+    return paragraphs
+
+
+def component_times(nlp, texts: list):
+    """Time the tokenizer and every pipeline component separately
+
+    Args:
+        nlp (Language): spaCy pipeline
+        texts (list[str]): Texts to parse
+
+    Returns:
+        dict: component name to seconds spent
+    """
+    times = {'tokenizer': 0.0, **{name: 0.0 for name in nlp.pipe_names}}
+    for text in texts:
+        start = time.perf_counter()
+        doc = nlp.make_doc(text)
+        times['tokenizer'] += time.perf_counter() - start
+        for name, component in nlp.pipeline:
+            start = time.perf_counter()
+            doc = component(doc)
+            times[name] += time.perf_counter() - start
+    return times
+
+
+def profile_benchmark(curator, paragraphs: list):
+    """Parse time of each detection module with its pipeline profile compared to the full pipeline
+
+    Args:
+        curator (Curator): Curator with the pipeline and its profiles
+        paragraphs (list[str]): Paragraphs to parse
+
+    Returns:
+        dict: module name to profile, profile seconds, full pipeline seconds and seconds saved
+    """
+    times = component_times(curator.nlp, paragraphs)
+    full = sum(times.values())
+    logging.info(f"Component times for {len(paragraphs)} paragraphs: {times}")
+    results = {}
+    for module, profile in curator.module_profiles.items():
+        if profile is None:
+            continue
+        excluded = curator.pipeline_profiles[profile]
+        if excluded is None:
+            seconds = times['tokenizer']
+        else:
+            seconds = sum(t for name, t in times.items() if name not in excluded)
+        results[module] = {'profile': profile, 'seconds': seconds, 'full_seconds': full, 'saved': full - seconds}
+    return results
+
+
+############ Frozen corpus ############
+
+SURNAMES = ["Smith", "Lee", "Nakajima", "Armfield", "Tarui", "Fischer-Zirnsak", "Yoo", "Garcia", "Chen",
+            "Olsen", "Muller", "Rossi", "Kowalski", "Dubois", "Tanaka", "Haddad"]
+ANIMALS = ["mice", "zebrafish", "Drosophila", "rats", "C. elegans", "mouse", "yeast", "Xenopus"]
+COUNTS = ["2", "3", "four", "5", "11", "a", "seven", "14", "an"]
+PATIENTS = ["patients", "families", "children", "individuals", "girls", "boys", "infants", "women"]
+MODIFIERS = ["unrelated", "affected", "additional", "separate", "sporadic", "new"]
+BACKGROUND = [
+    "The encoded protein contains an N-terminal kinase domain and a C-terminal coiled-coil region.",
+    "Northern blot analysis detected a 4.2-kb transcript in all tissues examined, with highest expression in brain.",
+    "The gene spans approximately 60 kb and contains 14 exons.",
+    "Immunofluorescence showed localization to the mitochondrial inner membrane.",
+    "By fluorescence in situ hybridization, the gene maps to chromosome 3p21.",
+]
+
+
+def generate_corpus(n_genes: int = 60, seed: int = 2026):
+    """Generate a deterministic OMIM-like corpus of gene and phenotype entries, their PubMed entries
+    and the gene-phenotype associations to curate.
+
+    Args:
+        n_genes (int, optional): Number of gene entries. Defaults to 60.
+        seed (int, optional): Random seed. Defaults to 2026.
+
+    Returns:
+        dict: Document class name to raw documents
+    """
+    rnd = random.Random(seed)
+    fetched = datetime(2026, 1, 1)
+    corpus = defaultdict(list)
+    pmids = iter(range(30000000, 40000000))
+
+    def references(count):
+        refs = []
+        for number in range(1, count + 1):
+            refs.append({'reference': {'referenceNumber': number, 'pubmedID': next(pmids),
+                                       'authors': rnd.choice(SURNAMES), 'year': rnd.randint(1978, 2025)}})
+        return refs
+
+    def cite(refs):
+        ref = rnd.choice(refs)['reference']
+        return f"{{{ref['referenceNumber']}:{ref['authors']} et al. ({ref['year']})}}"
+
+    def cohort():
+        return f"{rnd.choice(COUNTS)} {rnd.choice(MODIFIERS)} {rnd.choice(PATIENTS)}"
+
+    for g in range(n_genes):
+        gene_mim = 600000 + g
+        symbol = f"GPD{g}"
+        phenos = [100000 + g * 10 + k for k in range(rnd.randint(1, 3))]
+        gene_refs = references(rnd.randint(4, 12))
+        alleles = []
+        for number in range(1, rnd.randint(2, 6)):
+            pheno = rnd.choice(phenos)
+            alleles.append({'allelicVariant': {'number': number, 'text': "\n\n".join([
+                f"In {cohort()} with the disorder ({pheno}), {cite(gene_refs)} identified a homozygous "
+                f"missense mutation in the {symbol} gene.",
+                f"{rnd.choice(BACKGROUND)} {cite(gene_refs)} showed reduced activity of the mutant protein.",
+            ])}})
+        corpus['GeneEntry'].append(GeneEntry(
+            mimNumber=gene_mim, prefix='*', epochUpdated=1767225600, mtgUpdated=fetched,
+            geneMap={'geneSymbols': symbol, 'approvedGeneSymbols': symbol, 'geneName': f"Gene {g}",
+                     'phenotypeMapList': [{'phenotypeMap': {
+                         'phenotype': f"Disorder {pheno}", 'phenotypeMimNumber': pheno, 'phenotypeMappingKey': 3,
+                         'phenotypeInheritance': rnd.choice(['Autosomal recessive', 'Autosomal dominant', 'X-linked'])}}
+                         for pheno in phenos]},
+            textSectionList=[{'textSection': {'textSectionName': 'text',
+                                              'textSectionContent': " ".join(rnd.sample(BACKGROUND, 3))}}],
+            allelicVariantList=alleles, referenceList=gene_refs).to_mongo().to_dict())
+        for pheno in phenos:
+            refs = references(rnd.randint(5, 20))
+            paragraphs = []
+            for _ in range(rnd.randint(2, 6)):
+                paragraphs.append(rnd.choice([
+                    f"{cite(refs)} reported {cohort()} with a similar disorder. {rnd.choice(BACKGROUND)}",
+                    f"In {cohort()} with the disorder, {cite(refs)} identified mutations in the {symbol} gene ({gene_mim}). "
+                    f"The family was originally reported by {cite(refs)}.",
+                    f"{cite(refs)} and {cite(refs)} found {symbol} variants through GeneMatcher.",
+                    f"{rnd.choice(BACKGROUND)} {rnd.choice(BACKGROUND)} {cite(refs)}",
+                ]))
+            sections = [{'textSection': {'textSectionName': 'molecularGenetics', 'textSectionContent': "\n\n".join(paragraphs)}}]
+            if rnd.random() < 0.6:
+                sections.append({'textSection': {'textSectionName': 'animalModel', 'textSectionContent':
+                    f"{cite(refs)} found that {symbol}-null {rnd.choice(ANIMALS)} developed the disorder.\n\n"
+                    f"{rnd.choice(BACKGROUND)} {cite(refs)} generated {rnd.choice(ANIMALS)} lacking {symbol}."}})
+            corpus['GeneEntry'].append(GeneEntry(
+                mimNumber=pheno, prefix='#', epochUpdated=1767225600, mtgUpdated=fetched,
+                textSectionList=sections, referenceList=refs).to_mongo().to_dict())
+            corpus['AssociationInformation'].append(AssociationInformation(
+                gene_mimNumber=gene_mim, pheno_mimNumber=pheno, mapping_key=3,
+                gene_entry_fetched=fetched, pheno_entry_fetched=fetched).to_mongo().to_dict())
+    for entry in corpus['GeneEntry']:
+        for ref in entry['referenceList']:
+            year = ref['reference']['year']
+            corpus['PubmedEntry'].append(PubmedEntry(
+                pmid=ref['reference']['pubmedID'], journal_name=rnd.choice(['Am J Hum Genet', 'Nat Genet', 'Hum Mol Genet']),
+                pub_date=datetime(year, rnd.randint(1, 12), rnd.randint(1, 28)), pub_year=str(year)).to_mongo().to_dict())
+    return dict(corpus)
+
+
+def save_corpus(corpus: dict, path=FIXTURE_PATH):
+    """Write a corpus as gzipped extended JSON
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    # Fixed mtime keeps the file identical when the corpus is regenerated
+    with gzip.GzipFile(path, 'wb', mtime=0) as f:
+        f.write(json_util.dumps(corpus, sort_keys=True).encode('utf-8'))
+
+
+def load_corpus(path=FIXTURE_PATH):
+    """Read a corpus written by `save_corpus`
+    """
+    with gzip.open(path, 'rt') as f:
+        return json_util.loads(f.read())
+
+
+def connect_benchmark_db(mongo_uri: str = None):
+    """Connect the default alias to the benchmark database.
+    Uses mongomock when no URI is given.
+
+    Args:
+        mongo_uri (str, optional): URI of a mongod to benchmark against. Defaults to None (mongomock).
+    """
+    disconnect()
+    if mongo_uri:
+        connect(db=BENCHMARK_DB, host=mongo_uri)
+    else:
+        import mongomock
+        connect(db=BENCHMARK_DB, host='mongodb://localhost', mongo_client_class=mongomock.MongoClient)
+    if not get_db().name.endswith('benchmark'):
+        raise ValueError(f"Refusing to load the benchmark corpus into database '{get_db().name}'")
+
+
+def install_corpus(corpus: dict):
+    """Replace the corpus collections of the connected database with the corpus
+    """
+    for document in CORPUS_DOCUMENTS + [ParsedSection, CurationRun]:
+        document.drop_collection()
+    for document in CORPUS_DOCUMENTS:
+        document._get_collection().insert_many([dict(doc) for doc in corpus[document.__name__]])
+
+
+############ Curation benchmark ############
+
+def curation_benchmark(curator, dry_run: bool = False):
+    """Curate every association of the connected database and collect the metrics of the Curator.
+    See `Curator.instrumentation`.
+
+    Args:
+        curator (Curator): Curator to benchmark
+        dry_run (bool, optional): Curate without writing the results. Defaults to False.
+
+    Returns:
+        dict: Throughput, time per detector and spaCy, peak RSS and the metrics of every stage
+    """
+    pubmed_cache.clear()
+    curator.instrumentation.reset()
+    associations = AssociationInformation.objects.count()
+    start = time.perf_counter()
+    curator.curate([], force_update=True, dry_run=dry_run)
+    seconds = time.perf_counter() - start
+    metrics = curator.instrumentation.snapshot()
+    stages = {stage: {'calls': calls, 'seconds': total, 'self_seconds': own}
+              for stage, (calls, total, own) in metrics['stages'].items()}
+    detectors = {stage: stages.get(stage, {'calls': 0, 'seconds': 0.0})
+                 for stage in ['association', 'animal', 'cohort', 'coreport']}
+    spacy_seconds = sum(stages.get(stage, {'seconds': 0.0})['seconds'] for stage in ['spacy', 'tokenize'])
+    return {
+        'associations': associations,
+        'seconds': seconds,
+        'associations_per_second': associations / seconds if seconds else 0.0,
+        'detector_seconds': {stage: d['seconds'] for stage, d in detectors.items()},
+        'detector_calls': {stage: d['calls'] for stage, d in detectors.items()},
+        'spacy_seconds': spacy_seconds,
+        'spacy_share': spacy_seconds / seconds if seconds else 0.0,
+        # ru_maxrss is in kilobytes on Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'doc_cache': curator.doc_cache.stats(),
+        'stages': stages,
+        'counters': metrics['counters'],
+    }
@@ -0,0 +1,46 @@
+'''
+Copyright (c) 2026 MTG-lab, University of Calgary
+
+You should have received a copy of the license along with this program.
+'''
+
+import logging
+import pendulum
+
+from .models import EntryChange
+
+
+def record_change(mim_number: int, epoch_updated: int, previous_epoch_updated: int = None):
+    """Record that an OMIM entry was added or updated
+
+    Args:
+        mim_number (int): MIM number of the entry
+        epoch_updated (int): epochUpdated of the fetched entry
+        previous_epoch_updated (int, optional): epochUpdated of the stored entry. None for a new entry.
+    """
+    change = EntryChange()
+    change.mimNumber = mim_number
+    change.epochUpdated = epoch_updated
+    change.previous_epochUpdated = previous_epoch_updated
+    change.recorded = pendulum.now()
+    change.save()
+    logging.debug(f"Change recorded for {mim_number}: {previous_epoch_updated} -> {epoch_updated}")
+
+
+def pending_changes():
+    """Changes that are not curated yet
+
+    Returns:
+        list[EntryChange]: Uncurated changes
+    """
+    return list(EntryChange.objects(curated=None).only('id', 'mimNumber'))
+
+
+def mark_curated(changes: list):
+    """Mark changes as curated
+
+    Args:
+        changes (list[EntryChange]): Curated changes
+    """
+    if changes:
+        EntryChange.objects(id__in=[c.id for c in changes]).update(set__curated=pendulum.now())
@@ -0,0 +1,93 @@
+'''
+Copyright (c) 2026 MTG-lab, University of Calgary
+
+You should have received a copy of the license along with this program.
+'''
+
+from collections import namedtuple
+
+from .proximity import NONE, enclosing, nearest, offsets_array, within
+
+
+Citation = namedtuple('Citation', ['start', 'end', 'ref_no', 'author', 'year', 'sent', 'match'])
+
+
+class CitationIndex:
+    """Citations of a text with their character offsets, sentence and year, found with a single regex pass.
+    Citations are kept in order of their offsets, so lookups are searches over the offset array.
+    """
+
+    def __init__(self, text: str, pattern, doc=None) -> None:
+        """
+        Args:
+            text (str): Text to index
+            pattern (re.Pattern): Compiled citation pattern with reference number, author and year groups
+            doc (Doc, optional): Parsed text. Required for sentence lookups. Defaults to None.
+        """
+        self.text = text
+        matches = list(pattern.finditer(text))
+        self.starts = offsets_array([m.start(0) for m in matches])
+        self.sent_bounds = [(s.start_char, s.end_char) for s in doc.sents] if doc is not None else []
+        sents = [None] * len(matches)
+        if doc is not None:
+            sents = enclosing(offsets_array([start for start, end in self.sent_bounds]), self.starts).tolist()
+        self.citations = [Citation(m.start(0), m.end(0), m.group(1), m.group(2), int(m.group(3)), sent, m)
+                          for m, sent in zip(matches, sents)]
+        # Reference numbers of the "original" reporting studies. Set by the user of the index.
+        self.original_study_refs = []
+        # Citations that can be evidence for an anchor. Set by the user of the index, see `set_candidates`.
+        self.candidates = None
+        self.candidate_starts = None
+
+    def __len__(self):
+        return len(self.citations)
+
+    def __iter__(self):
+        return iter(self.citations)
+
+    def between(self, start: int, end: int):
+        """Citations that are completely within a character span
+
+        Args:
+            start (int): Start offset
+            end (int): End offset
+
+        Returns:
+            list[Citation]: Citations in order of offsets
+        """
+        first, last = within(self.starts, start, end)
+        return [c for c in self.citations[first:last] if c.end <= end]
+
+    def same_sentence(self, citation: Citation):
+        """Citations in the sentence of a citation
+
+        Args:
+            citation (Citation): Citation of this index
+
+        Returns:
+            list[Citation]: Citations in order of offsets
+        """
+        if citation.sent is None or citation.sent < 0:
+            return []
+        return self.between(*self.sent_bounds[citation.sent])
+
+    def set_candidates(self, matches):
+        """Set the citation matches anchors are resolved to
+
+        Args:
+            matches (list[Match]): Citation matches. Matches at the same offset are the same citation.
+        """
+        by_start = {m.start(0): m for m in matches}
+        self.candidates = [by_start[start] for start in sorted(by_start)]
+        self.candidate_starts = offsets_array(sorted(by_start))
+
+    def nearest_candidates(self, anchors):
+        """Nearest candidate of each anchor. See `proximity.nearest`.
+
+        Args:
+            anchors (list[int]): Anchor offsets
+
+        Returns:
+            list[Match]: Nearest candidate match for each anchor. None if there is no candidate.
+        """
+        return [self.candidates[i] if i != NONE else None for i in nearest(self.candidate_starts, anchors).tolist()]
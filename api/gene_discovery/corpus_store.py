@@ -0,0 +1,64 @@
+'''
+Copyright (c) 2026 MTG-lab, University of Calgary
+
+You should have received a copy of the license along with this program.
+'''
+
+import logging
+import pendulum
+
+from mongoengine.queryset.visitor import Q
+from spacy.tokens import DocBin
+
+from .models import ParsedSection
+
+
+class CorpusStore:
+    """Persistent store of parsed OMIM text. Sections are keyed by (mimNumber, epochUpdated, section),
+    so a section is parsed again only when OMIM updates the entry.
+    """
+
+    def __init__(self, nlp) -> None:
+        """
+        Args:
+            nlp (Language): spaCy pipeline the Docs are parsed with
+        """
+        self.nlp = nlp
+        self.model = f"{nlp.meta.get('name', '')}-{nlp.meta.get('version', '')}"
+
+    def load(self, sections):
+        """Load the stored Docs of entry sections
+
+        Args:
+            sections (list): (GeneEntry, section name, paragraphs) to load
+
+        Returns:
+            dict: paragraph text to Doc of the sections found in the store
+        """
+        keyed = [s for s in sections if s[0].epochUpdated is not None]
+        if not keyed:
+            return {}
+        query = Q(model=self.model) & Q(mimNumber__in=list({s[0].mimNumber for s in keyed}))
+        wanted = {(s[0].mimNumber, s[0].epochUpdated, s[1]) for s in keyed}
+        docs = {}
+        for stored in ParsedSection.objects(query):
+            if (stored.mimNumber, stored.epochUpdated, stored.section) in wanted:
+                for doc in DocBin().from_bytes(stored.docbin).get_docs(self.nlp.vocab):
+                    docs[doc.text] = doc
+        logging.debug(f"Loaded {len(docs)} parsed paragraphs from the corpus store")
+        return docs
+
+    def save(self, entry, section: str, docs: list):
+        """Store the Docs of an entry section and drop the ones parsed from older versions of the entry
+
+        Args:
+            entry (GeneEntry): OMIM entry of the section
+            section (str): Section name
+            docs (list[Doc]): Parsed paragraphs of the section
+        """
+        if entry.epochUpdated is None:
+            return
+        ParsedSection.objects(mimNumber=entry.mimNumber, epochUpdated=entry.epochUpdated, section=section, model=self.model).update_one(
+            upsert=True, set__docbin=DocBin(docs=docs).to_bytes(), set__created=pendulum.now())
+        ParsedSection.objects(Q(mimNumber=entry.mimNumber) & Q(section=section) &
+                              (Q(epochUpdated__ne=entry.epochUpdated) | Q(model__ne=self.model))).delete()
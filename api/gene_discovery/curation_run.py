@@ -0,0 +1,152 @@
+'''
+Copyright (c) 2026 MTG-lab, University of Calgary
+
+You should have received a copy of the license along with this program.
+'''
+
+import logging
+import uuid
+import pendulum
+
+from .models import CurationRun
+
+
+def new_run(assoc_ids: list, shard_size: int, mims: list = [], detect: str = 'all', force_update: bool = False,
+            changes: list = [], incremental: bool = False):
+    """Plan a curation run. The run is not saved until `Checkpoint.start`.
+
+    Args:
+        assoc_ids (list): Ids of the associations to curate
+        shard_size (int): Associations per shard
+        mims (list, optional): MIM numbers the associations were selected with. Defaults to [].
+        detect (str, optional): Detection modules. Defaults to 'all'.
+        force_update (bool, optional): Curate associations that are already curated. Defaults to False.
+        changes (list, optional): EntryChange ids curated by the run. Defaults to [].
+        incremental (bool, optional): The associations were selected incrementally, see `Curator.selection_query`.
+                                    Defaults to False.
+
+    Returns:
+        CurationRun: Planned run
+    """
+    assoc_ids = sorted(assoc_ids)
+    run = CurationRun()
+    run.run_id = f"{pendulum.now().format('YYYYMMDDHHmmss')}-{uuid.uuid4().hex[:6]}"
+    run.mims = list(mims)
+    run.detect = detect
+    run.force_update = force_update
+    run.incremental = incremental
+    run.changes = list(changes)
+    run.shards = [[assoc_ids[i], assoc_ids[min(i + shard_size, len(assoc_ids)) - 1]]
+                  for i in range(0, len(assoc_ids), shard_size)]
+    run.completed_shards = []
+    run.counters = {}
+    return run
+
+
+def load_run(run_id: str):
+    """Load a run to resume
+
+    Args:
+        run_id (str): Run id
+
+    Raises:
+        ValueError: If there is no such run or it is finished
+
+    Returns:
+        CurationRun: Run
+    """
+    run = CurationRun.objects(run_id=run_id).first()
+    if run == None:
+        raise ValueError(f"No curation run {run_id}")
+    if run.finished != None:
+        raise ValueError(f"Curation run {run_id} finished at {run.finished}")
+    return run
+
+
+def pending_shards(run: CurationRun):
+    """Shards of a run that are not completed
+
+    Args:
+        run (CurationRun): Run
+
+    Returns:
+        list: (index, first id, last id) of each pending shard in id order
+    """
+    completed = set(run.completed_shards)
+    return [(i, first, last) for i, (first, last) in enumerate(run.shards) if i not in completed]
+
+
+class Checkpoint:
+    """Records the completed shards of a run, at most every `interval` associations.
+    Completed shards are only recorded after the curated associations are written,
+    so a killed run loses at most the shards since the last checkpoint.
+    """
+
+    def __init__(self, run: CurationRun, write_buffer=None, interval: int = 500, enabled: bool = True) -> None:
+        """
+        Args:
+            run (CurationRun): Run
+            write_buffer (WriteBuffer, optional): Buffer to flush before recording. Defaults to None.
+            interval (int, optional): Associations between checkpoints. Defaults to 500.
+            enabled (bool, optional): Record the progress into database. Defaults to True.
+        """
+        self.run = run
+        self.write_buffer = write_buffer
+        self.interval = interval
+        self.enabled = enabled
+        self.shards = []        # Shards completed since the last checkpoint
+        self.associations = 0
+        self.written = write_buffer.written if write_buffer else 0
+
+    def start(self):
+        """Save a new run
+        """
+        if self.enabled and self.run.pk == None:
+            self.run.started = self.run.updated = pendulum.now()
+            self.run.save()
+            logging.info(f"Curation run {self.run.run_id} started with {len(self.run.shards)} shards")
+
+    def completed(self, shard: int, associations: int):
+        """Mark a shard as completed
+
+        Args:
+            shard (int): Shard index
+            associations (int): Number of associations curated in the shard
+        """
+        self.shards.append(shard)
+        self.associations += associations
+        if self.associations >= self.interval:
+            self.save()
+
+    def save(self):
+        """Write the buffered updates and record the completed shards
+        """
+        if self.write_buffer:
+            self.write_buffer.flush()
+        if not self.shards:
+            return
+        written = self.write_buffer.written if self.write_buffer else 0
+        counters = {'associations': self.associations, 'shards': len(self.shards), 'written': written - self.written}
+        if self.enabled:
+            CurationRun.objects(id=self.run.id).update(
+                add_to_set__completed_shards=self.shards, set__last_id=self.run.shards[max(self.shards)][1],
+                set__updated=pendulum.now(), **{f"inc__counters__{k}": v for k, v in counters.items()})
+            logging.debug(f"Curation run {self.run.run_id} checkpoint: {counters}")
+        self.run.completed_shards += self.shards
+        self.shards = []
+        self.associations = 0
+        self.written = written
+
+    def finish(self):
+        """Record the last shards and finish the run if all shards are completed
+
+        Returns:
+            bool: True if the run is finished
+        """
+        self.save()
+        if pending_shards(self.run):
+            logging.info(f"Curation run {self.run.run_id} paused with {len(pending_shards(self.run))} shards left")
+            return False
+        if self.enabled:
+            CurationRun.objects(id=self.run.id).update(set__finished=pendulum.now())
+        return True
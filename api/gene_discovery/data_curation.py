@@ -8,33 +8,71 @@ You should have received a copy of the license along with this program.
 '''
 
 import logging
+import multiprocessing
 import re
 import pendulum
 from datetime import date, timedelta, datetime
 
 import click
-import spacy
 from dateutil import parser
+from functools import cached_property
 from spacy.matcher import DependencyMatcher, PhraseMatcher
 from tqdm import tqdm, trange
 from word2number import w2n
+from mongoengine import connect, disconnect
 from mongoengine.queryset.visitor import Q
-from Bio import Entrez
 
+from .change_log import mark_curated, pending_changes
+from .citation_index import CitationIndex
+from .proximity import NONE, nearest, offsets_array
+from .corpus_store import CorpusStore
+from .curation_run import Checkpoint, load_run, new_run, pending_shards
+from .doc_cache import DocCache
+from .instrumentation import Instrumentation, timed
+from .lexical_gate import LexicalGate
+from .nlp_registry import frozen, get_nlp, preload
 from .models import *
+from .pubmed_cache import pubmed_cache
+from .pubmed_resolver import PubmedResolver
 from .settings import *
+from .streaming import Stream
+from .write_buffer import WriteBuffer
 
 
 class Curator:
     INF = 99999
     ignore_before = 1980
     max_cohort_size = 3000
-    pubmed_date_regex = r"(\d{4})\ ?(\S{3})?( \d{2})?"
     publication_regex = r"([0-9]{1,}):([a-zA-Z0-9' \/-]{3,}\.?),?\ [\(]?([0-9]{4})[\)]?"
     publication_mask = r"\{REF#([0-9]{1,})\}"
     date_regex = r"^\d{1,2}\/\d{1,2}\/\d{4}$"
     determinant = ["a", "an"]
     detection_modules = ['basic','association','animal','cohort']
+    # Fields of AssociationInformation that are written by `process`
+    curated_fields = ['gene_prefix', 'pheno_prefix', 'gene_symbols', 'gene_name', 'phenotype_marked_with',
+                      'evidence', 'animal_model', 'cohort', 'all_cohorts', 'total_cohort_size', 'gpad_updated']
+    shard_size = 50     # Associations per worker shard in parallel curation
+    curated_sections = ['animalModel', 'molecularGenetics']    # Text sections the detectors read
+    parse_batch_size = 64   # Paragraphs per `nlp.pipe` batch
+    parse_processes = 1     # Processes used by `nlp.pipe`. Keep 1 inside curation workers.
+    doc_cache_size = 4096   # Parsed paragraphs kept in memory
+    doc_cache_dir = None    # Directory to spill parsed paragraphs evicted from memory. None to disable.
+    use_corpus_store = True # Load/persist parsed sections keyed by the entry's epochUpdated
+    nlp_model = NLP_MODEL   # spaCy model, loaded on first use of `nlp`
+    chunk_size = 100        # Associations whose entries are fetched and parsed together
+    write_batch_size = 500  # Curated associations per bulk write
+    stream_batch_size = 1000    # Associations per cursor batch when selecting the associations to curate
+    checkpoint_interval = 500   # Curated associations between checkpoints of a curation run
+    # spaCy components left out by each pipeline profile, from the smallest profile to the largest.
+    # 'tokens' only runs the tokenizer. Docs of a larger profile serve the smaller ones.
+    pipeline_profiles = {'tokens': None, 'syntax': ['ner'], 'full': []}
+    # Largest profile each detection module parses with. PhraseMatchers only need 'tokens',
+    # citations need sentences and dependencies and the cohort pattern needs entities.
+    module_profiles = {'basic': None, 'association': 'syntax', 'animal': 'syntax', 'cohort': 'full'}
+    instrumentation_class = Instrumentation    # NullInstrumentation to collect no metrics
+    # GeneEntry fields used in curation
+    entry_fields = ['mimNumber', 'prefix', 'epochUpdated', 'mtgUpdated', 'geneMap',
+                    'textSectionList', 'allelicVariantList', 'referenceList']
     animal_models = [
         "Saccharomyces cerevisiae", "S. cerevisiae", "Yeast",
         "Pisum sativum", "Pea plant",
@@ -155,26 +193,193 @@ class Curator:
 
     def __init__(self) -> None:
         # text_variations = {}
-        # Defining NLP matchers
-        self.nlp = spacy.load("en_core_web_sm")
-        # Cohort
-        self.cohort_matcher = DependencyMatcher(self.nlp.vocab)
-        self.cohort_matcher.add("Cohort", [self.cohort_pattern["cohort_pattern"]])
-        self.cohort_matcher.add("CohortDet", [self.cohort_pattern["cohort_with_det"]])
+        # The spaCy pipeline, matchers and parsed paragraph caches are created on first use. See `nlp`.
+        # Lexical gates of the paragraphs to parse and of the paragraphs to look for cohorts in
+        cohort_lemmas = [lemma for pattern in self.cohort_pattern.values() for node in pattern
+                         if node['RIGHT_ID'] == 'anchor_patients' for lemma in node['RIGHT_ATTRS']['LEMMA']['IN']]
+        self.cohort_gate = LexicalGate(cohort_lemmas)
+        self.parse_gate = LexicalGate(cohort_lemmas, self.animal_models + self.matcher_platform)
+        # Reference indices by (mimNumber, epochUpdated) of the current chunk, or of the current `process` call
+        # outside of chunks, and publications built within a `process` call
+        self.reference_indices = {}
+        self.publications = {}
+        self.pubmed_resolver = PubmedResolver()
+        # Citation indices of the paragraphs in the current chunk, or of the current `process` call outside of chunks
+        self.publication_pattern = re.compile(self.publication_regex)
+        self.citation_indices = {}
+        # Timers and counters of the curation stages
+        self.instrumentation = self.instrumentation_class()
+
+    @cached_property
+    def nlp(self):
+        """spaCy pipeline, loaded through the model registry and shared by all Curators of the process
+        """
+        return get_nlp(self.nlp_model)
+
+    # Defining NLP matchers
+    @cached_property
+    def cohort_matcher(self):
+        matcher = DependencyMatcher(self.nlp.vocab)
+        matcher.add("Cohort", [self.cohort_pattern["cohort_pattern"]])
+        matcher.add("CohortDet", [self.cohort_pattern["cohort_with_det"]])
         # Unrelated Patient
         # self.unrelated_cohort_matcher = DependencyMatcher(self.nlp.vocab)
         # self.unrelated_cohort_matcher.add("UnrelatedCohort", [self.unrelated_cohort_phrase_pattern])
-        # Original Study Matcher
-        self.original_study_matcher = DependencyMatcher(self.nlp.vocab)
-        self.original_study_matcher.add("OriginalStudy", [self.original_study_pattern])
-        # Animal Matcher
-        self.animal_matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
-        self.patterns = [self.nlp.make_doc(a) for a in self.animal_models]
-        self.animal_matcher.add("Animal", self.patterns)
+        return matcher
+
+    @cached_property
+    def original_study_matcher(self):
+        matcher = DependencyMatcher(self.nlp.vocab)
+        matcher.add("OriginalStudy", [self.original_study_pattern])
+        return matcher
+
+    @cached_property
+    def animal_matcher(self):
+        matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
+        matcher.add("Animal", [self.nlp.make_doc(a) for a in self.animal_models])
+        return matcher
+
+    @cached_property
+    def matcher_platform_matcher(self):
         # Gene matcher platforms
-        self.matcher_platform_matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
-        self.patterns = [self.nlp.make_doc(a) for a in self.matcher_platform]
-        self.matcher_platform_matcher.add("Platform", self.patterns)
+        matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
+        matcher.add("Platform", [self.nlp.make_doc(a) for a in self.matcher_platform])
+        return matcher
+
+    @cached_property
+    def doc_cache(self):
+        """Parsed paragraphs, shared by all associations curated with this Curator
+        """
+        return DocCache(self.nlp.vocab, max_size=self.doc_cache_size, spill_dir=self.doc_cache_dir)
+
+    @cached_property
+    def corpus_store(self):
+        return CorpusStore(self.nlp) if self.use_corpus_store else None
+
+    def __paragraphs(self, text):
+        return text.replace('al.', 'al').split('\n\n')
+
+    def __accepted_profiles(self, profile):
+        """Profiles whose Docs serve a profile, largest first
+        """
+        profiles = list(self.pipeline_profiles)
+        return tuple(reversed(profiles[profiles.index(profile):]))
+
+    def detect_profile(self, detect='all'):
+        """Largest pipeline profile needed by the detection modules
+
+        Args:
+            detect (str|list, optional): Detection modules. Defaults to 'all'.
+
+        Returns:
+            str: Pipeline profile name
+        """
+        if detect == 'all':
+            detect = self.detection_modules
+        needed = {self.module_profiles.get(module) for module in detect}
+        for profile in reversed(list(self.pipeline_profiles)):
+            if profile in needed:
+                return profile
+        return 'tokens'
+
+    def pipe(self, texts, profile='full'):
+        """Parse texts in batches with the components of a pipeline profile
+        """
+        if self.pipeline_profiles[profile] is None:
+            return (self.nlp.make_doc(text) for text in texts)
+        disable = [c for c in self.pipeline_profiles[profile] if c in self.nlp.pipe_names]
+        return self.nlp.pipe(texts, batch_size=self.parse_batch_size, n_process=self.parse_processes, disable=disable)
+
+    def anchors(self, gene_entry, pheno_mim):
+        """Texts the detectors anchor on for an association
+
+        Args:
+            gene_entry (GeneEntry): Gene entry of the association
+            pheno_mim (int): Phenotype MIM number of the association
+
+        Returns:
+            list: Gene MIM number, approved gene symbols and phenotype MIM number
+        """
+        anchors = [gene_entry.mimNumber, pheno_mim]
+        if gene_entry.geneMap is not None and 'approvedGeneSymbols' in gene_entry.geneMap:
+            anchors.append(gene_entry.geneMap['approvedGeneSymbols'])
+        return anchors
+
+    @timed('preparse')
+    def preparse(self, pheno_entries, gene_entries=[], profile='full', anchors=[], save_parsed=True):
+        """Parse every paragraph that the detectors read from the entries in batches.
+        Sections already parsed for the same version of the entry are loaded from the corpus store.
+        Detectors then use the parsed paragraphs instead of parsing them one by one.
+        Paragraphs without any detector term or anchor are not parsed. See `parse_gate`.
+
+        Args:
+            pheno_entries (list[GeneEntry]): Entries whose text sections will be parsed
+            gene_entries (list[GeneEntry], optional): Entries whose allelic variants will be parsed. Defaults to [].
+            profile (str, optional): Pipeline profile to parse with. See `detect_profile`. Defaults to 'full'.
+                                    Only 'full' Docs are persisted in the corpus store.
+            anchors (list, optional): Anchors of the associations. See `anchors`. Defaults to [].
+            save_parsed (bool, optional): Store newly parsed sections in the corpus store. Defaults to True.
+        """
+        sections = []
+        for entry in pheno_entries:
+            for text_section in entry.textSectionList:
+                if text_section['textSection']['textSectionName'] in self.curated_sections:
+                    sections.append((entry, text_section['textSection']['textSectionName'],
+                                     self.__paragraphs(text_section['textSection']['textSectionContent'])))
+        for entry in gene_entries:
+            for idx, allele in enumerate(entry.allelicVariantList):
+                if 'text' in allele['allelicVariant']:
+                    sections.append((entry, f"allelicVariant/{allele['allelicVariant'].get('number', idx)}",
+                                     self.__paragraphs(allele['allelicVariant']['text'])))
+        if profile == 'tokens':
+            return
+        accepted = self.__accepted_profiles(profile)
+        anchor_pattern = LexicalGate.anchor_pattern(anchors)
+        wanted = {}
+        for entry, section, paragraphs in sections:
+            for p in paragraphs:
+                if p not in wanted and not self.doc_cache.contains(p, accepted):
+                    wanted[p] = self.parse_gate.passes(p, anchor_pattern)
+        wanted = [p for p, passed in wanted.items() if passed]
+        sections = [s for s in sections if any(p in wanted for p in s[2])]
+        loaded = {}
+        if self.corpus_store and sections:
+            loaded = self.corpus_store.load(sections)
+            for paragraph, doc in loaded.items():
+                self.doc_cache.put(paragraph, doc)
+        to_parse = [p for p in wanted if not self.doc_cache.contains(p, accepted)]
+        with self.instrumentation.timer('spacy'):
+            parsed = dict(zip(to_parse, self.pipe(to_parse, profile)))
+        self.instrumentation.count('paragraphs_parsed', len(to_parse))
+        for paragraph, doc in parsed.items():
+            self.doc_cache.put(paragraph, doc, profile)
+        if self.corpus_store and profile == 'full' and save_parsed:
+            # A stored section replaces the previous one, so only complete sections are stored
+            for entry, section, paragraphs in sections:
+                if any(p in parsed for p in paragraphs):
+                    docs = [self.doc_cache.get(p, ('full',)) for p in paragraphs]
+                    if all(doc is not None for doc in docs):
+                        self.corpus_store.save(entry, section, docs)
+        logging.debug(f"Parsed {len(to_parse)} paragraphs with the {profile} profile")
+
+    def __parse(self, text, profile='full'):
+        """Get the parsed Doc of a text. Parse it if it was not pre-parsed.
+
+        Args:
+            text (str): Text to parse
+            profile (str, optional): Smallest pipeline profile the Doc needs. Defaults to 'full'.
+        """
+        if self.pipeline_profiles[profile] is None:
+            # Tokenizing is cheaper than a cache lookup of a larger Doc
+            with self.instrumentation.timer('tokenize'):
+                return self.nlp.make_doc(text)
+        doc = self.doc_cache.get(text, self.__accepted_profiles(profile))
+        if doc is None:
+            with self.instrumentation.timer('spacy'):
+                doc = next(self.pipe([text], profile))
+            self.instrumentation.count('paragraphs_parsed')
+            self.doc_cache.put(text, doc, profile)
+        return doc
 
     def __original_study_finder(self, doc):
         original_study_matches = self.original_study_matcher(doc)
@@ -189,6 +394,7 @@ class Curator:
         return "Ref#" + match.group(1)
     
     
+    @timed('pubmed')
     def __get_pubmed_entry(self, pmid):
         """Get publication date from pubmed ID
 
@@ -196,49 +402,66 @@ class Curator:
             pmid (int): Pubmed PMID
 
         Returns:
-            str: date wit month information
+            PubmedRecord: Publication dates and journal. None if unavailable.
         """
         pe = None
         if pmid:
-            pe = PubmedEntry.objects(pmid=pmid).first()
-            if pe == None:
-                logging.info(f"Sending Entrez request for PMID: {pmid}")
-                pe = PubmedEntry()
-                handle = Entrez.esummary(db="pubmed", id=pmid)
-                record = Entrez.read(handle)
-                handle.close()
-                logging.debug(record)
-                pe.pmid = pmid
-                pe.raw_pub_date = record[0]["PubDate"]
-                dt_match = re.match(self.pubmed_date_regex, record[0]["PubDate"])
-                try:
-                    if dt_match and dt_match.group(3):
-                        pe.pub_date =  datetime.strptime(dt_match.group(), "%Y %b %d")
-                    elif dt_match:
-                        pe.pub_date =  datetime.strptime(dt_match.group(), "%Y %b")
-                except ValueError as e:
-                    logging.exception(repr(e))
-                if dt_match:
-                    pe.pub_year = dt_match.group(1)
-                
-                if 'EPubDate' in record[0]:
-                    pe.raw_epub_date = record[0]["EPubDate"]
-                    epub_dt_match = re.match(self.pubmed_date_regex, record[0]["EPubDate"])                
-                    if epub_dt_match:
-                        if epub_dt_match.group(1):
-                            pe.pub_year = epub_dt_match.group(1)
-                        if epub_dt_match.group(3):
-                            pe.epub_date =  datetime.strptime(epub_dt_match.group(), "%Y %b %d")
-                        elif epub_dt_match:
-                            pe.epub_date =  datetime.strptime(epub_dt_match.group(), "%Y %b")
-                        
-                # Journal name
-                if 'FullJournalName' in record[0]:
-                    pe.journal_name = record[0]["FullJournalName"]
-                pe.save()
+            pe = pubmed_cache.get(pmid)
+            if pe == None and not pubmed_cache.is_missing(pmid):
+                self.pubmed_resolver.add([pmid])
+                self.pubmed_resolver.resolve()
+                pe = pubmed_cache.get(pmid, load=False)
         return pe
     
     
+    def __citation_index(self, text):
+        """Get the citation index of a paragraph. Index is built once per paragraph in a chunk.
+        """
+        index = self.citation_indices.get(text)
+        if index is None:
+            doc = self.__parse(text, 'syntax')
+            index = CitationIndex(text, self.publication_pattern, doc)
+            index.original_study_refs = self.__original_study_finder(doc)
+            logging.debug(f"Ignore: {index.original_study_refs}")
+            candidates = []
+            for citation in index:
+                match = citation.match
+                if citation.year > self.ignore_before:
+                    # Detect same sentence publications and take the earliest one.
+                    for proximal in index.same_sentence(citation):
+                        if proximal.year > self.ignore_before and proximal.year > int(match.group(3)):
+                            # if the same sentence has recent reference
+                            match = proximal.match
+                    # Ignore if it is found as part of "original" patient reporting study
+                    if index.original_study_refs and match.group(1) in index.original_study_refs:
+                        continue
+                    candidates.append(match)
+            index.set_candidates(candidates)
+            self.citation_indices[text] = index
+        return index
+
+    @timed('nearest_publication')
+    def __nearest_publications(self, text, anchors):
+        """Detect nearest citation from each of the anchor tokens of a paragraph
+
+        Args:
+            text (str): Text to look through
+            anchors (list[int]): anchor token positions
+
+        Returns:
+            list: publication Match object for each anchor. None if no citation found.
+        """
+        text = text.replace('al.', 'al')
+        index = self.__citation_index(text)
+        logging.debug(text)
+        # All citation in the text
+        logging.debug(f"Above text has publications? {[c.match.groups() for c in index]}")
+        # Consider proximity of the detected publication to the anchor text.
+        # Nearest preceding publication, otherwise the nearest following one.
+        nearest_matches = index.nearest_candidates(anchors)
+        logging.debug(f"{nearest_matches} passed proximity check from {anchors}")
+        return nearest_matches
+
     def __nearest_publication_detector(self, text, ref_start_position):
         """Detect nearest citation from the anchor token
 
@@ -249,73 +472,51 @@ class Curator:
         Returns:
             Match: publication Match object
         """
-        text = text.replace('al.', 'al')
-        doc = self.nlp(text)
-        logging.debug(text)
-        # logging.debug(ref_start_position)
-        ignore_pub_ids = self.__original_study_finder(doc)
-        logging.debug(f"Ignore: {ignore_pub_ids}")
-        
-        # All citation in the text
-        publication_matches = re.finditer(self.publication_regex, text)
-        logging.debug(f"Above text has publications? {re.findall(self.publication_regex, text)}")
-        nearest_match = None
-        lowest_distance = self.INF
-        for match in publication_matches:
-            logging.debug(f"Checking: {match}")
-            if int(match.group(3)) > self.ignore_before:
-                distance = self.INF
-                logging.debug(f"{match} not ignored")
-                # Detect same sentence publications and take the earliest one.
-                sentence = doc.char_span(match.start(0), match.end(0), alignment_mode='expand').sent.text
-                same_sentence_pubs = re.finditer(self.publication_regex, sentence)
-                if same_sentence_pubs:
-                    for proximal_match in same_sentence_pubs:
-                        if int(proximal_match.group(3)) > self.ignore_before and int(proximal_match.group(3)) > int(match.group(3)):
-                            # if the same sentence has recent reference
-                            # logging.debug(
-                            #     f"{proximal_match.group(3)} > {match.group(3)} = {proximal_match.group(3) > match.group(3)}")
-                            match = proximal_match
-                # Ignore if it is found as part of "original" patient reporting study
-                if ignore_pub_ids and match.group(1) in ignore_pub_ids:
-                    continue
-                logging.debug(f"{match} check proximity from {ref_start_position}")
-                # Consider proximity of the detected publication to the anchor text
-                if match.start(0) < ref_start_position:
-                    distance = abs(ref_start_position - match.start(0))
-                elif nearest_match is None and match.start(0) > ref_start_position:
-                    distance = abs(match.start(0) - ref_start_position)
-                if distance < lowest_distance:
-                    nearest_match = match
-                    lowest_distance = distance
-        
-        logging.debug(f"{nearest_match} passed proximity check")
-        return nearest_match
+        return self.__nearest_publications(text, [ref_start_position])[0]
 
-    def __create_publication_object_from_match(self, pub_match, reference_list=None):
+    def reference_index(self, entry):
+        """Index the referenceList of an entry by referenceNumber. Index is built once per entry version.
+
+        Args:
+            entry (GeneEntry): OMIM entry
+
+        Returns:
+            dict: referenceNumber to (pmid, authors, year)
+        """
+        key = (entry.mimNumber, entry.epochUpdated)
+        if key not in self.reference_indices:
+            index = {}
+            for ref in entry.referenceList or []:
+                if 'referenceNumber' in ref['reference']:
+                    index[ref['reference']['referenceNumber']] = (
+                        ref['reference'].get('pubmedID'), ref['reference'].get('authors'), ref['reference'].get('year'))
+            self.reference_indices[key] = index
+        return self.reference_indices[key]
+
+    def __create_publication_object_from_match(self, pub_match, reference_index=None):
         ref_no = pub_match
         if isinstance(pub_match, re.Match):
             ref_no = pub_match.group(1)
+        # Same citation is matched many times across the detectors of an association
+        key = (id(reference_index), int(ref_no), pub_match.group(2), pub_match.group(3))
+        if key in self.publications:
+            return self.publications[key]
         pmid = None
-        if reference_list:
-            for ref in reference_list:
-                # print(pub_match)
-                if 'referenceNumber' in ref['reference'] \
-                        and ref['reference']['referenceNumber'] == int(ref_no) \
-                        and 'pubmedID' in ref['reference']:
-                    pmid = ref['reference']['pubmedID']
+        if reference_index and int(ref_no) in reference_index:
+            pmid = reference_index[int(ref_no)][0]
         # print(pub_match.group(0))
         pub = PublicationItem()
         pub["pmid"] = pmid
         pub["author"] = pub_match.group(2)
         pub["year"] = pub_match.group(3)
         pe = self.__get_pubmed_entry(pmid)        
-        if pe != None and 'epub_date' in pe and pe.epub_date:
+        if pe != None and pe.epub_date:
             pub["pub_date"] = pe.epub_date
-        elif pe != None and 'pub_date' in pe and pe.pub_date:
+        elif pe != None and pe.pub_date:
             pub["pub_date"] = pe.pub_date
-        if pe != None and 'journal_name' in pe:
+        if pe != None and pe.journal_name != None:
             pub['journal_name'] = pe.journal_name
+        self.publications[key] = pub
         return pub
 
     def __animal_model_type(self, name):
@@ -344,24 +545,16 @@ class Curator:
             int: start position of the closest animal model
         """
         nearest_match = None
-        lowest_distance = self.INF
-        distance = lowest_distance + 1
         start_position = 0
         # Detecting animal model
         matches = self.animal_matcher(doc)
         if matches:
-            for match_id, start, end in matches:
-                m_span = doc[start:end]
-                m_start = m_span.start_char
-                # Consider proximity of the detected publication to the anchor text
-                if m_start < ref_position:
-                    distance = abs(ref_position - m_start)
-                elif nearest_match is None and m_start > ref_position:
-                    distance = abs(m_start - ref_position)
-                if distance < lowest_distance:
-                    nearest_match = m_span.text
-                    lowest_distance = distance
-                    start_position = m_start
+            # Consider proximity of the detected animal model to the anchor text
+            i = nearest(offsets_array([doc[start].idx for match_id, start, end in matches]), [ref_position])[0]
+            if i != NONE:
+                m_span = doc[matches[i][1]:matches[i][2]]
+                nearest_match = m_span.text
+                start_position = m_span.start_char
         # if nearest_match:
         #     logging.debug(f"{doc.text[doc[start:end].start_char:10]}")
         #     logging.debug(f"Nearest match: {nearest_match}")
@@ -369,12 +562,13 @@ class Curator:
         return nearest_match, start_position
         
 
-    def __get_animal_model(self, text, reference_list=None, ref_start_position=0, known_publication=None, section_name=None):
+    @timed('animal')
+    def __get_animal_model(self, text, reference_index=None, ref_start_position=0, known_publication=None, section_name=None):
         """Detect Animal model in a text
 
         Args:
             text (str): String represetntation of the text
-            reference_list (list, optional): List of OMIMM reference. Defaults to None.
+            reference_index (dict, optional): Reference index of the entry. See `reference_index`. Defaults to None.
             ref_start_position (int, optional): Reference start position of the text.
                             This position will be taken into account when searching for the animal model.
                             Defaults to 0.
@@ -407,13 +601,13 @@ class Curator:
                 # logging.debug(f"Paragraph evaluating: {text[p_start:p_end]}")
             reletive_ref_start = ref_start_position - p_start
             paragraph = text[p_start:p_end]
-            doc = self.nlp(paragraph)
+            doc = self.__parse(paragraph, 'tokens')
             mo, ref_start = self.__closest_animal_model(doc, reletive_ref_start)
             if mo != None:                
                 pub_match = self.__nearest_publication_detector(paragraph, ref_start)
                 if pub_match:
                     # logging.debug(pub_match)
-                    pub = self.__create_publication_object_from_match(pub_match, reference_list)
+                    pub = self.__create_publication_object_from_match(pub_match, reference_index)
                     if earliest_animal == None or int(pub.year) < int(earliest_animal.publication_evidence.year):
                         earliest_ref = pub
                         earliest_animal = AnimalModelsItem()
@@ -423,13 +617,13 @@ class Curator:
         # If no animal model found in the paragraph of the reference, search in the whole text
         if earliest_animal == None:
             for p in paras:
-                doc = self.nlp(p)
+                doc = self.__parse(p, 'tokens')
                 mo, ref_start = self.__closest_animal_model(doc)
                 if mo != None:                
                     pub_match = self.__nearest_publication_detector(p, ref_start)
                     if pub_match:
                         # logging.debug(pub_match)
-                        pub = self.__create_publication_object_from_match(pub_match, reference_list)
+                        pub = self.__create_publication_object_from_match(pub_match, reference_index)
                         if earliest_animal == None or int(pub.year) < int(earliest_animal.publication_evidence.year):
                             earliest_ref = pub
                             paragraph = p
@@ -440,12 +634,12 @@ class Curator:
         return earliest_animal
         
         
-    def __cohort_from_paragraph(self, paragraph, reference_list=None, section_name=None):
+    def __cohort_from_paragraph(self, paragraph, reference_index=None, section_name=None):
         """Extract cohort from a paragraph
 
         Args:
             paragraph (str): paragraph text
-            reference_list (list, optional): List of references. Defaults to None.
+            reference_index (dict, optional): Reference index of the entry. See `reference_index`. Defaults to None.
             section_name (str, optional): Name of the OMIM's section. Defaults to None.
             known_publication (Publication, optional): If already known, the publication reference.
 
@@ -455,12 +649,15 @@ class Curator:
         """
         cohorts = []
         total_cohort_size = 0
-        doc = self.nlp(paragraph)
+        if not self.cohort_gate.passes(paragraph):
+            return cohorts, total_cohort_size
+        doc = self.__parse(paragraph, 'full')
         patient_matches = self.cohort_matcher(doc)
         # logging.debug(patient_matches)
         # patient_matches = self.cohort_phrase_pattern(doc)
         if patient_matches:
             match_ids = []
+            found = []
             for match_id, token_ids in patient_matches:
                 ignore = False
                 if match_id not in match_ids:
@@ -488,22 +685,25 @@ class Curator:
                                 cohort['cohort_count'] = -1
                                 logging.warning(f"Cohort count failed: {doc[token_ids[i]].text}")
                     if ignore == False:
-                        nearest_pub = self.__nearest_publication_detector(
-                            doc.text, doc[token_ids[0]:token_ids[1]].start_char)
-                        if nearest_pub:
-                            cohort['publication_evidence'] = self.__create_publication_object_from_match(nearest_pub, reference_list)
-                            cohorts.append(cohort)
+                        found.append((cohort, doc[token_ids[0]:token_ids[1]].start_char))
                         match_ids.append(match_id)
+            if found:
+                nearest_pubs = self.__nearest_publications(doc.text, [anchor for cohort, anchor in found])
+                for (cohort, anchor), nearest_pub in zip(found, nearest_pubs):
+                    if nearest_pub:
+                        cohort['publication_evidence'] = self.__create_publication_object_from_match(nearest_pub, reference_index)
+                        cohorts.append(cohort)
         logging.debug(f"Total Cohort Size: {total_cohort_size}")
         return cohorts, total_cohort_size
         
 
-    def __get_cohorts(self, text, reference_list=None, ref_start_position=0, known_publication=None, section_name='molecularGenetics', ):
+    @timed('cohort')
+    def __get_cohorts(self, text, reference_index=None, ref_start_position=0, known_publication=None, section_name='molecularGenetics', ):
         """ Extract cohorts from a text. Texts can have paragraphs separated by two new lines.
         
         Args:
             text (str): Text to extract cohorts from
-            reference_list (list, optional): List of references. Defaults to None.
+            reference_index (dict, optional): Reference index of the entry. See `reference_index`. Defaults to None.
             ref_start_position (int, optional): Reference start position of the text.
                             This position will be taken into account when searching for the animal model.
                             Defaults to 0.
@@ -537,7 +737,7 @@ class Curator:
                 # logging.debug(f"Paragraph evaluating: {text[p_start:p_end]}")
             # reletive_ref_start = ref_start_position - p_start
             paragraph = text[p_start:p_end]
-            _cohorts, _total_cohort_size = self.__cohort_from_paragraph(paragraph, reference_list, section_name)
+            _cohorts, _total_cohort_size = self.__cohort_from_paragraph(paragraph, reference_index, section_name)
             cohorts += _cohorts
             total_cohort_size += _total_cohort_size
             # check if the cohort has same publication as the already known publication
@@ -550,7 +750,7 @@ class Curator:
         if earliest_cohort == None:
             for paragraph in paras:
                 if already_found == False:
-                    _cohorts, _total_cohort_size = self.__cohort_from_paragraph(paragraph, reference_list, section_name)
+                    _cohorts, _total_cohort_size = self.__cohort_from_paragraph(paragraph, reference_index, section_name)
                     cohorts += _cohorts
                     total_cohort_size += _total_cohort_size
                     # check if the cohort has same publication as the already known publication
@@ -571,14 +771,14 @@ class Curator:
         return earliest_cohort, cohorts, total_cohort_size
 
 
-    def __earliest_ref_from_text(self, query: str, text: str, reference_list: list, sync_matcher=None):
+    def __earliest_ref_from_text(self, query: str, text: str, reference_index: dict, sync_matcher=None):
         """Get earliest publication reference by searching for specific text in large text.
         Text can have paragraph.
 
         Args:
             query (str): Query text
             text (str): Text to search
-            reference_list (list): List of reference to use to extract publication releted info
+            reference_index (dict): Reference index of the entry to use to extract publication releted info
             sync_matcher (Matcher, optional): Spacy Matcher function to sync
                     (cross match check/2ndary value match check) the search. Defaults to None.
 
@@ -598,24 +798,41 @@ class Curator:
         logging.debug(f"Looking for anchors: {query}")
         for p in paras:
             if sync_matcher:
-                sync_match = sync_matcher(self.nlp(p))
+                sync_match = sync_matcher(self.__parse(p, 'tokens'))
             if sync_matcher == None or sync_match:
-                for q in query:
-                    start = p.find(str(q))
-                    if start != -1:
-                        pub_match = self.__nearest_publication_detector(p, start)
-                        if pub_match:
-                            # logging.debug(pub_match)
-                            pub = self.__create_publication_object_from_match(pub_match, reference_list)
-                            if earliest_ref == None or int(pub.year) < int(earliest_ref.year):
-                                anchor_location = start
-                                earliest_ref = pub
-                                paragraph = p
+                anchors = [start for start in (p.find(str(q)) for q in query) if start != -1]
+                if not anchors:
+                    continue
+                for start, pub_match in zip(anchors, self.__nearest_publications(p, anchors)):
+                    if pub_match:
+                        # logging.debug(pub_match)
+                        pub = self.__create_publication_object_from_match(pub_match, reference_index)
+                        if earliest_ref == None or int(pub.year) < int(earliest_ref.year):
+                            anchor_location = start
+                            earliest_ref = pub
+                            paragraph = p
+        if earliest_ref != None:
+            coreport_ref = self.__coreport_from_text(text, earliest_ref, reference_index)
+        return earliest_ref, anchor_location, paragraph, coreport_ref
+
+    @timed('coreport')
+    def __coreport_from_text(self, text: str, earliest_ref, reference_index: dict):
+        """Find a publication of the text that reported the same finding around the same time as the evidence
+
+        Args:
+            text (str): Text to search
+            earliest_ref (Publication): Evidence publication
+            reference_index (dict): Reference index of the entry to use to extract publication releted info
+
+        Returns:
+            None: if there is no coreport publication
+            Publication: Publication entry
+        """
+        coreport_ref = None
         # get all reference in the section
-        pubs = re.finditer(self.publication_regex, text)
-        for pub in pubs:
-            _cr_pub = self.__create_publication_object_from_match(pub, reference_list)
-            if _cr_pub != None and earliest_ref != None:
+        for pub in (c.match for c in CitationIndex(text, self.publication_pattern)):
+            _cr_pub = self.__create_publication_object_from_match(pub, reference_index)
+            if _cr_pub != None:
                 # get pmid date and compare
                 coreport_date = _cr_pub.pub_date
                 earliest_ref_date = earliest_ref.pub_date
@@ -632,23 +849,57 @@ class Curator:
                             logging.debug(f"Coreport publication found: {_cr_pub.pmid}")
                             coreport_ref = _cr_pub
                         break
-        return earliest_ref, anchor_location, paragraph, coreport_ref
+        return coreport_ref
     
 
-    def process(self, item: AssociationInformation, detect='all', dry_run=False):
+    @timed('fetch_entries')
+    def prefetch_entries(self, assocs):
+        """Fetch the gene and phenotype entries of a batch of associations with a single query
+
+        Args:
+            assocs (list[AssociationInformation]): Associations to fetch the entries for
+
+        Returns:
+            dict: MIM number to GeneEntry. Latest updated one is kept if there are duplicates.
+        """
+        mims = {a.gene_mimNumber for a in assocs} | {a.pheno_mimNumber for a in assocs}
+        entries = {}
+        for entry in GeneEntry.objects(mimNumber__in=list(mims)).only(*self.entry_fields).order_by('mtgUpdated'):
+            entries[entry.mimNumber] = entry
+        logging.debug(f"Prefetched {len(entries)} entries for {len(assocs)} associations")
+        return entries
+
+
+    def process(self, item: AssociationInformation, detect='all', dry_run=False, entries=None, write_buffer=None):
         """Update AssociationInformation with information extracted from related the OMIM entries.
 
         Args:
             item (AssociationInformation): Item to update
             detect (str, optional): What modeule/groups of information to update. Defaults to 'all'.
             dry_run (bool, optional): Run without saving it into database. Defaults to False.
+            entries (dict, optional): Prefetched entries by MIM number. See `prefetch_entries`.
+                                    Defaults to None (entries are queried).
+            write_buffer (WriteBuffer, optional): Buffer to write the changed curated fields with.
+                                    Defaults to None (item is saved).
         """
+        with self.instrumentation.association((item.gene_mimNumber, item.pheno_mimNumber)):
+            self.__process(item, detect, dry_run, entries, write_buffer)
+
+    def __process(self, item, detect, dry_run, entries, write_buffer):
         if detect == 'all':
             detect = self.detection_modules
-        gene_entry = GeneEntry.objects(mimNumber=item.gene_mimNumber).order_by('-mtgUpdated').first()        
+        if entries is None:
+            # Not part of a chunk, see `curate_chunk`. Indices of earlier associations are dropped so they do not pile up.
+            self.reference_indices = {}
+            self.citation_indices = {}
+            gene_entry = GeneEntry.objects(mimNumber=item.gene_mimNumber).order_by('-mtgUpdated').first()
+        else:
+            gene_entry = entries.get(item.gene_mimNumber)
         
         if gene_entry and gene_entry.geneMap is not None and 'phenotypeMapList' in gene_entry.geneMap:
             logging.debug(f"Analyzing gene: {item.gene_mimNumber}")
+            gene_refs = self.reference_index(gene_entry)
+            self.publications = {}
             known_phenotypes = gene_entry.geneMap['phenotypeMapList']
             for p in known_phenotypes:
                 cohorts = []
@@ -682,7 +933,14 @@ class Curator:
                             item.gene_name = gene_entry.geneMap['geneName']
                     
                     ####### Look at the phenotype for available information ########
-                    pheno_entry = GeneEntry.objects(mimNumber=pheno_mim).first()
+                    if entries is None:
+                        pheno_entry = GeneEntry.objects(mimNumber=pheno_mim).first()
+                    else:
+                        pheno_entry = entries.get(pheno_mim)
+                    pheno_refs = self.reference_index(pheno_entry) if pheno_entry else None
+                    if entries is None:
+                        self.preparse([pheno_entry] if pheno_entry else [], [gene_entry], self.detect_profile(detect),
+                                      self.anchors(gene_entry, pheno_mim), save_parsed=dry_run == False)
                     if pheno_entry:
                         if 'basic' in detect:
                             item.pheno_prefix = pheno_entry.prefix
@@ -696,12 +954,13 @@ class Curator:
                                 if 'approvedGeneSymbols' in gene_entry.geneMap:
                                     query.append(gene_entry.geneMap['approvedGeneSymbols'])
                                 query.append(gene_entry.mimNumber)
-                                earliest_mo_pub, anchor_location, paragraph, coreport_ref = self.__earliest_ref_from_text(
-                                    query, text, pheno_entry.referenceList, self.animal_matcher)
+                                with self.instrumentation.timer('animal'):
+                                    earliest_mo_pub, anchor_location, paragraph, coreport_ref = self.__earliest_ref_from_text(
+                                        query, text, pheno_refs, self.animal_matcher)
                                 if earliest_mo_pub:
-                                    earliest_animal = self.__get_animal_model(paragraph, pheno_entry.referenceList, anchor_location, earliest_mo_pub, section_name='animalModel')
+                                    earliest_animal = self.__get_animal_model(paragraph, pheno_refs, anchor_location, earliest_mo_pub, section_name='animalModel')
                                 else:
-                                    earliest_animal = self.__get_animal_model(text, pheno_entry.referenceList, section_name='animalModel')
+                                    earliest_animal = self.__get_animal_model(text, pheno_refs, section_name='animalModel')
 
                             ####### Looking at Phenotype's Molecular Genetics for information #######
                             if earliest_evidence == None and pheno_text['textSection']['textSectionName'] == 'molecularGenetics':
@@ -712,8 +971,9 @@ class Curator:
                                     query.append(gene_entry.geneMap['approvedGeneSymbols'])
                                 # GDA
                                 if 'association' in detect:
-                                    earliest_pub, anchor_location, paragraph, coreport_ref = self.__earliest_ref_from_text(
-                                        query, text, pheno_entry.referenceList)
+                                    with self.instrumentation.timer('association'):
+                                        earliest_pub, anchor_location, paragraph, coreport_ref = self.__earliest_ref_from_text(
+                                            query, text, pheno_refs)
                                     logging.debug(earliest_pub)
                                     if earliest_pub != None:
                                         evidence = Evidence()
@@ -725,12 +985,12 @@ class Curator:
                                             earliest_evidence = evidence
                                 # Animal Model
                                 if 'animal' in detect and earliest_animal == None:
-                                    earliest_animal = self.__get_animal_model(text, pheno_entry.referenceList, anchor_location, section_name='molecularGenetics')
+                                    earliest_animal = self.__get_animal_model(text, pheno_refs, anchor_location, section_name='molecularGenetics')
                                 # Cohort
                                 if 'cohort' in detect and earliest_cohort == None:
                                     if earliest_evidence:
                                         known_publication = earliest_evidence.publication_evidence
-                                    earliest_cohort, cohorts, tcs = self.__get_cohorts(text, pheno_entry.referenceList, 
+                                    earliest_cohort, cohorts, tcs = self.__get_cohorts(text, pheno_refs, 
                                                                         ref_start_position=anchor_location, known_publication=known_publication, 
                                                                         section_name="molecularGenetics")
                                     total_cohort_size += tcs
@@ -740,8 +1000,10 @@ class Curator:
                         for allele in gene_entry.allelicVariantList:
                             if 'text' in allele['allelicVariant']:
                                 logging.debug('----AV----')
-                                earliest_pub, anchor_location, paragraph, coreport_ref = self.__earliest_ref_from_text(
-                                    pheno_mim, allele['allelicVariant']['text'], gene_entry.referenceList)
+                                # The anchor paragraph is also looked up for the animal and cohort detectors alone
+                                with self.instrumentation.timer('association' if 'association' in detect else 'allelic_anchor'):
+                                    earliest_pub, anchor_location, paragraph, coreport_ref = self.__earliest_ref_from_text(
+                                        pheno_mim, allele['allelicVariant']['text'], gene_refs)
                                 if 'association' in detect:
                                     logging.debug(earliest_pub)
                                     if earliest_pub != None:
@@ -753,13 +1015,13 @@ class Curator:
                                         if earliest_evidence == None or int(earliest_pub.year) < int(earliest_evidence.publication_evidence.year):
                                             earliest_evidence = evidence
                                 if 'animal' in detect and earliest_animal == None and paragraph != None:
-                                    earliest_animal = self.__get_animal_model(paragraph, gene_entry.referenceList, anchor_location, section_name='allelicVariant')
+                                    earliest_animal = self.__get_animal_model(paragraph, gene_refs, anchor_location, section_name='allelicVariant')
                                     
                                 # Cohort
                                 if 'cohort' in detect and earliest_cohort == None and paragraph != None:
                                     if earliest_evidence:
                                         known_publication = earliest_evidence.publication_evidence
-                                    earliest_cohort, cohorts, tcs = self.__get_cohorts(paragraph, gene_entry.referenceList, 
+                                    earliest_cohort, cohorts, tcs = self.__get_cohorts(paragraph, gene_refs, 
                                                                         ref_start_position=anchor_location, known_publication=earliest_pub, 
                                                                         section_name="allelicVariant")
                                     total_cohort_size += tcs
@@ -774,17 +1036,248 @@ class Curator:
                         item.animal_model = earliest_animal
                     if 'association' in detect and earliest_evidence:
                         item.evidence = earliest_evidence
-                    if 'all' in detect:
+                    if set(self.detection_modules) <= set(detect):
                         item.gpad_updated = pendulum.now()
-                    if dry_run == False:
-                        item.save()
+                    with self.instrumentation.timer('save'):
+                        if dry_run == False and write_buffer != None:
+                            write_buffer.add_document(item, self.curated_fields)
+                        elif dry_run == False:
+                            item.save()
         else:
             logging.debug(f"GeneMap/Entry unavailable for Gene MIM {item.gene_mimNumber}")
 
 
 
-    def curate(self, mims_to_curate: list, force_update: bool = False, detect: str = 'all', dry_run: bool = False):
-        """Curate AssociationInformation entries to extract information from Entry objects
+    def curated_values(self, item: AssociationInformation):
+        """Get the curated fields of an item in their database representation
+
+        Args:
+            item (AssociationInformation): Curated item
+
+        Returns:
+            dict: field name to mongo value of the curated fields that changed
+        """
+        return WriteBuffer.changed_values(item, self.curated_fields)
+
+
+    def __needs_update(self, assoc, force_update=False):
+        """Check if an association is not curated yet or any of its entries was fetched after the last curation
+        """
+        if force_update or assoc.evidence == None or assoc.gpad_updated == None:
+            return True
+        return any(fetched != None and fetched > assoc.gpad_updated
+                   for fetched in [assoc.gene_entry_fetched, assoc.pheno_entry_fetched])
+
+
+    def __hydrate(self, assoc_ids):
+        """Load the associations of a chunk as documents in the given order
+
+        Args:
+            assoc_ids (list): AssociationInformation ids
+
+        Returns:
+            list[AssociationInformation]: Associations
+        """
+        if not assoc_ids:
+            return []
+        assocs = {a.id: a for a in AssociationInformation.objects(id__in=assoc_ids)}
+        return [assocs[i] for i in assoc_ids if i in assocs]
+
+
+    def curate_chunk(self, assocs, detect='all', dry_run=False, write_buffer=None, save_parsed=None):
+        """Fetch and parse the entries of a chunk of associations together, then curate each association
+
+        Args:
+            assocs (list[AssociationInformation]): Associations to curate
+            detect (str, optional): What modeule/groups of information to update. Defaults to 'all'.
+            dry_run (bool, optional): Run without saving it into database. Defaults to False.
+            write_buffer (WriteBuffer, optional): Buffer to write the curated associations with. Defaults to None.
+            save_parsed (bool, optional): Store newly parsed sections in the corpus store.
+                                    Defaults to None (stored unless it is a dry run).
+        """
+        if not assocs:
+            return
+        if save_parsed is None:
+            save_parsed = dry_run == False
+        self.reference_indices = {}
+        self.citation_indices = {}
+        entries = self.prefetch_entries(assocs)
+        # Resolve publication dates of all references of the chunk in batches
+        for entry in entries.values():
+            self.pubmed_resolver.add(ref[0] for ref in self.reference_index(entry).values())
+        with self.instrumentation.timer('pubmed'):
+            self.pubmed_resolver.resolve()
+        self.preparse([entries[a.pheno_mimNumber] for a in assocs if a.pheno_mimNumber in entries],
+                      [entries[a.gene_mimNumber] for a in assocs if a.gene_mimNumber in entries],
+                      self.detect_profile(detect),
+                      [anchor for a in assocs if a.gene_mimNumber in entries
+                       for anchor in self.anchors(entries[a.gene_mimNumber], a.pheno_mimNumber)],
+                      save_parsed=save_parsed)
+        for assoc in assocs:
+            self.process(assoc, detect=detect, dry_run=dry_run, entries=entries, write_buffer=write_buffer)
+
+
+    def select(self, query: dict, force_update=False):
+        """Ids of the associations that need curation, in id order.
+        Only the fields to decide whether to curate are read, associations are hydrated per chunk.
+
+        Args:
+            query (dict): Raw filter of the associations
+            force_update (bool, optional): Select associations that are already curated. Defaults to False.
+
+        Returns:
+            list: AssociationInformation ids
+        """
+        assocs = Stream(AssociationInformation, ['id', 'evidence', 'gpad_updated', 'gene_entry_fetched', 'pheno_entry_fetched'],
+                        query, batch_size=self.stream_batch_size, sort=[('_id', 1)])
+        return [a.id for a in assocs if self.__needs_update(a, force_update)]
+
+
+    @staticmethod
+    def association_query(mims: list):
+        """Raw filter of the associations of MIM numbers
+
+        Args:
+            mims (list): MIM numbers of genes or phenotypes. [] for all associations.
+
+        Returns:
+            dict: Filter
+        """
+        if len(mims):
+            return {'$or': [{'gene_mimNumber': {'$in': mims}}, {'pheno_mimNumber': {'$in': mims}}]}
+        return {}
+
+
+    @staticmethod
+    def selection_query(mims: list, incremental: bool = False):
+        """Raw filter of the associations a run selects from
+
+        Args:
+            mims (list): MIM numbers of genes or phenotypes. [] for all associations.
+            incremental (bool, optional): Select the associations of `mims` and the uncurated associations.
+                                    New associations of stored entries that did not change are not in the change log,
+                                    they are selected by being uncurated. Defaults to False.
+
+        Returns:
+            dict: Filter
+        """
+        if not incremental:
+            return Curator.association_query(mims)
+        uncurated = {'$or': [{'evidence': None}, {'gpad_updated': None}]}
+        if len(mims):
+            return {'$or': [Curator.association_query(mims), uncurated]}
+        return uncurated
+
+
+    def shard(self, run, index: int):
+        """Associations of a shard of a run. Associations curated since the run started,
+        e.g. by an interrupted invocation of the run, are skipped unless the run forces updates.
+
+        Args:
+            run (CurationRun): Run
+            index (int): Shard index
+
+        Returns:
+            list: AssociationInformation ids
+        """
+        first, last = run.shards[index]
+        return self.select({'$and': [self.selection_query(run.mims, run.incremental), {'_id': {'$gte': first, '$lte': last}}]},
+                           run.force_update)
+
+
+    def plan(self, mims_to_curate: list = [], force_update: bool = False, detect: str = 'all', incremental: bool = False):
+        """Select the associations to curate and plan a run. The run is not saved.
+
+        Args:
+            mims_to_curate (list, optional): MIM numbers to curate. Defaults to [] (all associations).
+            force_update (bool, optional): Update even if the entry is already curated. Defaults to False.
+            detect (str, optional): What modeule/groups of information to update. Defaults to 'all'.
+            incremental (bool, optional): Add the entries of the uncurated change log and the uncurated associations.
+                                    Defaults to False.
+
+        Returns:
+            CurationRun: Planned run. None if there is nothing to curate.
+            list[EntryChange]: Changes curated by the run
+        """
+        changes = []
+        if incremental:
+            changes = pending_changes()
+            mims_to_curate = list(set(mims_to_curate) | {c.mimNumber for c in changes})
+            logging.info(f"{len(changes)} changes of {len(mims_to_curate)} entries to curate")
+            force_update = True
+        query = self.selection_query(mims_to_curate, incremental)
+        logging.debug(query)
+        assoc_ids = self.select(query, force_update)
+        if incremental and not assoc_ids and not changes:
+            return None, changes
+        run = new_run(assoc_ids, self.shard_size, mims_to_curate, detect, force_update,
+                      [c.id for c in changes], incremental)
+        return run, changes
+
+
+    def __curate_parallel(self, shards, workers: int, checkpoint, detect='all', dry_run=False):
+        """Curate shards in worker processes and merge the results back with bulk writes.
+        The NLP pipeline is loaded before forking and shared by the workers, every worker builds its own
+        matchers. Workers are always forked, whatever the default start method of the platform is,
+        since they rely on the pipeline of the parent. Shards are consumed in order,
+        so the database ends up in the same state as a serial run.
+
+        Args:
+            shards (list): (shard index, AssociationInformation ids) of each shard. See `shard`
+            workers (int): Number of worker processes
+            checkpoint (Checkpoint): Progress of the run
+            detect (str, optional): What modeule/groups of information to update. Defaults to 'all'.
+            dry_run (bool, optional): Run without saving it into database. Defaults to False.
+        """
+        write_buffer = checkpoint.write_buffer
+        logging.info(f"Curating {sum(len(ids) for _, ids in shards)} associations in {len(shards)} shards with {workers} workers")
+        pbar = tqdm(total=sum(len(ids) for _, ids in shards), desc="Applying NLP!", colour="#fac45f")
+        preload([self.nlp_model])   # forked workers share the pipeline instead of loading their own
+        with frozen(), multiprocessing.get_context('fork').Pool(workers, initializer=_init_worker) as pool:
+            for (index, ids), (results, metrics) in zip(shards, pool.imap(_curate_shard, [(ids, detect, dry_run) for _, ids in shards])):
+                self.instrumentation.merge(metrics)
+                with self.instrumentation.timer('save'):
+                    if dry_run == False:
+                        for assoc_id, values in results:
+                            write_buffer.add(assoc_id, values)
+                    checkpoint.completed(index, len(results))
+                pbar.update(len(results))
+        pbar.close()
+
+
+    def __curate_serial(self, shards, checkpoint, detect='all', dry_run=False):
+        """Curate shards in this process, whole shards per chunk
+
+        Args:
+            shards (list): (shard index, AssociationInformation ids) of each shard. See `shard`
+            checkpoint (Checkpoint): Progress of the run
+            detect (str, optional): What modeule/groups of information to update. Defaults to 'all'.
+            dry_run (bool, optional): Run without saving it into database. Defaults to False.
+        """
+        chunk = []
+        chunk_shards = []
+        pbar = tqdm(total=sum(len(ids) for _, ids in shards), desc="Applying NLP!", colour="#fac45f")
+        for n, (index, ids) in enumerate(shards):
+            chunk += ids
+            chunk_shards.append((index, len(ids)))
+            if len(chunk) >= self.chunk_size or n == len(shards) - 1:
+                self.curate_chunk(self.__hydrate(chunk), detect=detect, dry_run=dry_run, write_buffer=checkpoint.write_buffer)
+                with self.instrumentation.timer('save'):
+                    for shard, size in chunk_shards:
+                        checkpoint.completed(shard, size)
+                pbar.update(len(chunk))
+                chunk = []
+                chunk_shards = []
+        pbar.close()
+        logging.info(f"Parsed paragraph cache: {self.doc_cache.stats()}")
+        logging.info(f"Paragraphs skipped by the lexical gate: parse {self.parse_gate.stats()}, cohort {self.cohort_gate.stats()}")
+
+
+    def curate(self, mims_to_curate: list, force_update: bool = False, detect: str = 'all', dry_run: bool = False, workers: int = 1,
+               incremental: bool = False, resume: str = None, shard_limit: int = None):
+        """Curate AssociationInformation entries to extract information from Entry objects.
+        The associations are curated in shards of consecutive ids and the completed shards are checkpointed
+        in a `CurationRun`, so an interrupted run can be resumed by its run id.
 
         Args:
             mims_to_curate (list): List of MIM numbers to curate. Defaults to []. If [] then all entries will be curated.
@@ -792,20 +1285,39 @@ class Curator:
             detect (str, optional): What modeule/groups of information to update. Defaults to 'all'. 
                                     Available options: 'all', 'basic', 'association', 'animal', 'cohort'
             dry_run (bool, optional): Run without saving it into database. Defaults to False.
+            workers (int, optional): Number of worker processes. Defaults to 1 (curate in this process).
+            incremental (bool, optional): Curate only the associations of the entries changed since the last curation
+                                    according to the change log, in addition to `mims_to_curate`. Defaults to False.
+            resume (str, optional): Run id of an unfinished run to continue. The MIM numbers, detection modules and
+                                    force update of the run are used. Defaults to None (start a new run).
+            shard_limit (int, optional): Curate at most this many shards and leave the rest of the run
+                                    for a later invocation. Defaults to None (all shards).
+
+        Returns:
+            CurationRun: The run. Not saved on dry runs.
         """
-        assocs = []
-        if len(mims_to_curate):
-            # entries = GeneEntry.objects(mimNumber__in=mims_to_curate)
-            assocs = AssociationInformation.objects(
-                    (Q(gene_mimNumber__in=mims_to_curate) | Q(pheno_mimNumber__in=mims_to_curate)))
+        if resume:
+            run = load_run(resume)
+            changes = list(EntryChange.objects(id__in=run.changes).only('id'))
+            logging.info(f"Resuming curation run {run.run_id}: {len(pending_shards(run))} of {len(run.shards)} shards left")
+        else:
+            run, changes = self.plan(mims_to_curate, force_update, detect, incremental)
+            if run == None:
+                return None
+        write_buffer = WriteBuffer(AssociationInformation, self.write_batch_size)
+        checkpoint = Checkpoint(run, write_buffer, self.checkpoint_interval, enabled=dry_run == False)
+        checkpoint.start()
+        shards = [(index, self.shard(run, index)) for index, _, _ in pending_shards(run)[:shard_limit]]
+        if workers > 1:
+            self.__curate_parallel(shards, workers, checkpoint, run.detect, dry_run)
         else:
-            assocs = AssociationInformation.objects
-            # mims = [int(_e.mimNumber) for _e in assocs]
-            # entries = GeneEntry.objects(mimNumber__in=mims)
-        logging.debug(assocs)
-        for assoc in tqdm(assocs, desc="Applying NLP!", colour="#fac45f"):
-            if force_update or assoc.evidence == None or assoc.gpad_updated != assoc.gene_entry_fetched or assoc != assoc.pheno_entry_fetched:
-                self.process(assoc, detect=detect, dry_run=dry_run)
+            self.__curate_serial(shards, checkpoint, run.detect, dry_run)
+        with self.instrumentation.timer('save'):
+            finished = checkpoint.finish()
+        logging.info(f"Curated associations written: {write_buffer.stats()}")
+        if dry_run == False and finished:
+            mark_curated(changes)
+        return run
 
 
         # entries = None
@@ -821,3 +1333,39 @@ class Curator:
         #         self.process(entry)
                 # item = CuratedGeneInfo()
                 # self.extract_and_save(entry, item)
+
+
+
+# Curator of the worker process. See `Curator.curate` for parallel curation.
+_worker_curator = None
+
+
+def _init_worker():
+    """Initialize a curation worker with its own database connection.
+    The NLP pipeline is inherited from the parent, see `nlp_registry.preload`.
+    """
+    global _worker_curator
+    disconnect()
+    connect(host=MONGO_URI)
+    _worker_curator = Curator()
+
+
+def _curate_shard(shard):
+    """Curate a shard of associations without saving them. Parsed sections are stored unless it is a dry run.
+
+    Args:
+        shard (tuple): List of AssociationInformation ids, the detection modules and whether it is a dry run
+
+    Returns:
+        list: (id, curated values) of the associations in id order
+        dict: Metrics of the shard. See `Instrumentation.snapshot`
+    """
+    assoc_ids, detect, dry_run = shard
+    assocs = list(AssociationInformation.objects(id__in=assoc_ids).order_by('id'))
+    _worker_curator.instrumentation.reset()
+    _worker_curator.curate_chunk(assocs, detect=detect, dry_run=True, save_parsed=dry_run == False)
+    results = [(assoc.id, _worker_curator.curated_values(assoc)) for assoc in assocs]
+    logging.info(f"Parsed paragraph cache: {_worker_curator.doc_cache.stats()}")
+    logging.info(f"Paragraphs skipped by the lexical gate: parse {_worker_curator.parse_gate.stats()}, "
+                 f"cohort {_worker_curator.cohort_gate.stats()}")
+    return results, _worker_curator.instrumentation.snapshot()
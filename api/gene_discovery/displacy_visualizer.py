@@ -13,6 +13,7 @@ from word2number import w2n
 from api.gene_discovery.data_curation import Curator
 
 from .models import GeneEntry
+from .nlp_registry import get_nlp
 from .settings import *
 
 # docker exec -it gpad_api python -m api.gene_discovery.displacy_visualizer
@@ -49,8 +50,7 @@ class PatternLab:
     # ADJ -amod- NOUN
 
     text_variations = {}
-    nlp = spacy.load("en_core_web_sm")
-    matcher = DependencyMatcher(nlp.vocab, validate=True)
+    _matcher = None     # Shared by all instances, created with the pipeline on first use
     
     matches = []
 
@@ -244,6 +244,16 @@ class PatternLab:
         ],
     }
     
+    @property
+    def nlp(self):
+        return get_nlp()
+
+    @property
+    def matcher(self):
+        if PatternLab._matcher == None:
+            PatternLab._matcher = DependencyMatcher(self.nlp.vocab, validate=True)
+        return PatternLab._matcher
+
     def __init__(self, pattern="cohort_pattern") -> None:
         if type(pattern) == str:
             self.active_pattern = pattern
@@ -0,0 +1,150 @@
+'''
+Copyright (c) 2026 MTG-lab, University of Calgary
+
+You should have received a copy of the license along with this program.
+'''
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+
+from spacy.tokens import DocBin
+
+
+class DocCache:
+    """LRU cache of parsed spaCy Docs keyed by the hash of the paragraph text.
+
+    The text is expected to be normalized by the caller (e.g. `Curator` replaces 'al.')
+    since character offsets of the Doc index into exactly that text.
+    Docs parsed with a pipeline profile other than 'full' are keyed by the profile as well.
+    Docs evicted from memory are spilled to disk as DocBin when `spill_dir` is given. Spilled Docs live in
+    a directory of their own under `spill_dir`, which is removed with the cache or at exit.
+    """
+
+    def __init__(self, vocab, max_size: int = 4096, spill_dir=None) -> None:
+        """
+        Args:
+            vocab (Vocab): Vocab of the pipeline the Docs were parsed with
+            max_size (int, optional): Maximum number of Docs to keep in memory. Defaults to 4096.
+            spill_dir (str|Path, optional): Directory to spill evicted Docs in. Defaults to None (no spill).
+        """
+        self.vocab = vocab
+        self.max_size = max_size
+        self.spill_dir = None
+        if spill_dir:
+            Path(spill_dir).mkdir(parents=True, exist_ok=True)
+            self.spill_dir = Path(tempfile.mkdtemp(prefix='doc_cache_', dir=spill_dir))
+            weakref.finalize(self, _remove_spill_dir, self.spill_dir, os.getpid())
+        self.docs = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.spill_hits = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(text: str, profile: str = 'full'):
+        if profile != 'full':
+            text = f"{profile}\0{text}"
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def __spill_path(self, key):
+        return self.spill_dir / f"{key}.spacy"
+
+    def __contains__(self, text):
+        return self.contains(text)
+
+    def __find(self, text, profiles):
+        for profile in profiles:
+            key = self.key(text, profile)
+            if key in self.docs or (self.spill_dir is not None and self.__spill_path(key).exists()):
+                return key
+        return None
+
+    def contains(self, text: str, profiles=('full',)):
+        """Check if a text is cached with any of the profiles
+        """
+        return self.__find(text, profiles) is not None
+
+    def __len__(self):
+        return len(self.docs)
+
+    def get(self, text: str, profiles=('full',)):
+        """Get the cached Doc of a text
+
+        Args:
+            text (str): Paragraph text
+            profiles (tuple, optional): Pipeline profiles to accept, in order of preference. Defaults to ('full',).
+
+        Returns:
+            Doc: Cached Doc. None if the text was never parsed with any of the profiles.
+        """
+        key = self.__find(text, profiles) or self.key(text, profiles[0])
+        doc = self.docs.get(key)
+        if doc is not None:
+            self.docs.move_to_end(key)
+            self.hits += 1
+            return doc
+        if self.spill_dir is not None and self.__spill_path(key).exists():
+            doc = next(DocBin().from_bytes(self.__spill_path(key).read_bytes()).get_docs(self.vocab))
+            self.__spill_path(key).unlink()
+            self.spill_hits += 1
+            self.__put(key, doc)
+            return doc
+        self.misses += 1
+        return None
+
+    def put(self, text: str, doc, profile: str = 'full'):
+        """Cache a parsed Doc. Least recently used Docs are evicted when the cache is full.
+
+        Args:
+            text (str): Paragraph text
+            doc (Doc): Parsed Doc of the text
+            profile (str, optional): Pipeline profile the Doc was parsed with. Defaults to 'full'.
+        """
+        self.__put(self.key(text, profile), doc)
+
+    def __put(self, key, doc):
+        if self.spill_dir is not None:
+            self.__spill_path(key).unlink(missing_ok=True)
+        self.docs[key] = doc
+        self.docs.move_to_end(key)
+        while len(self.docs) > self.max_size:
+            evicted_key, evicted_doc = self.docs.popitem(last=False)
+            self.evictions += 1
+            if self.spill_dir is not None:
+                self.__spill_path(evicted_key).write_bytes(DocBin(docs=[evicted_doc]).to_bytes())
+
+    def clear(self):
+        """Drop the cached Docs from memory and the spilled ones from disk
+        """
+        self.docs.clear()
+        if self.spill_dir is not None:
+            for path in self.spill_dir.glob('*.spacy'):
+                path.unlink()
+
+    def stats(self):
+        """Cache statistics
+
+        Returns:
+            dict: hits, misses, spill hits, evictions, size and hit rate
+        """
+        lookups = self.hits + self.spill_hits + self.misses
+        return {
+            'hits': self.hits,
+            'spill_hits': self.spill_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self.docs),
+            'hit_rate': (self.hits + self.spill_hits) / lookups if lookups else 0.0,
+        }
+
+
+def _remove_spill_dir(path, pid):
+    """Remove the spill directory of a cache in the process that created it, not in forked children"""
+    if os.getpid() == pid:
+        shutil.rmtree(path, ignore_errors=True)
@@ -22,7 +22,10 @@ import plotly.express as px
 from rich import print
 from tqdm import tqdm
 from api.gene_discovery.models import AssociationInformation, GeneEntry, PubmedEntry
+from api.gene_discovery.pubmed_cache import pubmed_cache
+from api.gene_discovery.pubmed_resolver import PubmedResolver
 from api.gene_discovery.settings import data_dir
+from api.gene_discovery.streaming import Stream
 
 from Bio import Entrez
 
@@ -41,10 +44,15 @@ class Validation:
         self.ehrhart_df = pd.read_csv(data_dir / 'Gene-RD-Provenance_V2.1.txt', sep='\t').dropna(subset=["ENSID"]).fillna(0) # Ehrhart et al (2021)
         self.ehrhart_df['Disease OMIM ID'] = [int(row['Disease OMIM ID']) for idx, row in self.ehrhart_df.iterrows()]
         self.ehrhart_df['PMID Gene-disease'] = [int(row['PMID Gene-disease']) for idx, row in self.ehrhart_df.iterrows()]
+        # Fetch the PMIDs missing in the database in batches before looking up the years
+        resolver = PubmedResolver()
+        resolver.add(self.ehrhart_df['PMID Gene-disease'])
+        resolver.resolve()
         self.ehrhart_df['year'] = self.ehrhart_df.apply(self.__add_year_from_pubmed, axis=1)
         
         self.chong_df = pd.read_csv(data_dir / '2022-11-11.combinedOMIM.mentionsNGS.year.inheritance.txt', sep='\t') # Chong et al (2015)
-        self.entries = AssociationInformation.objects   #(mapping_key=2)
+        self.entries = Stream(AssociationInformation, ['gene_prefix', 'gene_mimNumber', 'pheno_prefix', 'pheno_mimNumber',
+                                                       'mapping_key', 'phenotype', 'evidence'])   #(mapping_key=2)
         # logging.debug(self.ehrhart_df)
         self.result = pd.DataFrame()    # To store validated results
         print(f"Total {len(self.entries)} confirmed associations will now be evaluated")
@@ -59,38 +67,9 @@ class Validation:
             _type_: year
         """
         if row['PMID Gene-disease']:
-            pe = PubmedEntry.objects(pmid=row['PMID Gene-disease']).first()
+            pe = pubmed_cache.get(row['PMID Gene-disease'])
             if pe == None:
-                logging.info(f"Sending Entrez request for PMID: {row['PMID Gene-disease']}")
-                pe = PubmedEntry()
-                handle = Entrez.esummary(db="pubmed", id=row['PMID Gene-disease'])
-                record = Entrez.read(handle)
-                handle.close()
-                pe.pmid = row['PMID Gene-disease']                
-                
-                pe.raw_pub_date = record[0]["PubDate"]
-                dt_match = re.match(Curator.pubmed_date_regex, record[0]["PubDate"])
-                try:
-                    if dt_match and dt_match.group(3):
-                        pe.pub_date =  datetime.strptime(dt_match.group(), "%Y %b %d")
-                    elif dt_match:
-                        pe.pub_date =  datetime.strptime(dt_match.group(), "%Y %b")
-                except ValueError as e:
-                    logging.exception(repr(e))
-                if dt_match:
-                    pe.pub_year = dt_match.group(1)
-                
-                if 'EPubDate' in record[0]:
-                    pe.raw_epub_date = record[0]["EPubDate"]
-                    epub_dt_match = re.match(Curator.pubmed_date_regex, record[0]["EPubDate"])                
-                    if epub_dt_match and epub_dt_match.group(3):
-                        pe.epub_date =  datetime.strptime(epub_dt_match.group(), "%Y %b %d")
-                    elif epub_dt_match:
-                        pe.epub_date =  datetime.strptime(epub_dt_match.group(), "%Y %b")
-                
-                # yr_match = re.match(self.year_regex, record[0]["PubDate"])
-                # pe.pub_year = yr_match.group()
-                pe.save()
+                return None
             return pe.pub_year
         return None
     
@@ -137,8 +116,8 @@ class Validation:
             # logging.debug(ehrhart_rows)
             
             if 'evidence' in entry and 'publication_evidence' in entry['evidence']:
-                year = entry['evidence']['publication_evidence']['year']
-                source = entry.evidence.section_title
+                year = entry['evidence']['publication_evidence'].get('year')
+                source = entry['evidence'].get('section_title')
                 if  'pmid' in  entry['evidence']['publication_evidence']:
                     pmid =  entry['evidence']['publication_evidence']['pmid']
                 else:
@@ -217,8 +196,8 @@ class Validation:
                 # logging.debug(ehrhart_rows)
                 
                 if 'evidence' in entry and 'publication_evidence' in entry['evidence']:
-                    year = entry['evidence']['publication_evidence']['year']
-                    source = entry.evidence.section_title
+                    year = entry['evidence']['publication_evidence'].get('year')
+                    source = entry['evidence'].get('section_title')
                     if  'pmid' in  entry['evidence']['publication_evidence']:
                         pmid =  entry['evidence']['publication_evidence']['pmid']
                     else:
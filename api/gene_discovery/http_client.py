@@ -0,0 +1,128 @@
+'''
+Copyright (c) 2026 MTG-lab, University of Calgary
+
+You should have received a copy of the license along with this program.
+'''
+
+import logging
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class ApiClient:
+    """HTTP client of an external API over a pooled keep-alive session.
+    Connection errors, 429 and 5xx responses are retried with jittered exponential backoff,
+    a 429 waits at least as long as its Retry-After header asks. Other 4xx responses are not retried.
+    Latencies and errors are recorded per endpoint.
+    """
+    retry_statuses = {429, 500, 502, 503, 504}
+
+    def __init__(self, base_url: str, headers: dict = {}, max_retries: int = 4, backoff: float = 0.5,
+                 max_backoff: float = 60, timeout: float = 60, pool_size: int = 10, before_request=None) -> None:
+        """
+        Args:
+            base_url (str): API base URL without a trailing slash
+            headers (dict, optional): Headers of every request. Defaults to {}.
+            max_retries (int, optional): Retries of a request. Defaults to 4.
+            backoff (float, optional): Base backoff in seconds, doubled on every retry. Defaults to 0.5.
+            max_backoff (float, optional): Maximum backoff in seconds. Defaults to 60.
+            timeout (float, optional): Request timeout in seconds. Defaults to 60.
+            pool_size (int, optional): Connections kept alive, at least the number of threads using the client. Defaults to 10.
+            before_request (callable, optional): Called before every attempt, e.g. to reserve a quota. Defaults to None.
+        """
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.before_request = before_request
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.metrics = {}   # endpoint -> {'requests', 'seconds', 'max_seconds', 'retries', 'throttled', 'server_errors', 'failed'}
+        self.lock = threading.Lock()
+
+    def __record(self, endpoint, **counts):
+        with self.lock:
+            m = self.metrics.setdefault(endpoint, {'requests': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'retries': 0,
+                                                   'throttled': 0, 'server_errors': 0, 'failed': 0})
+            for key, value in counts.items():
+                if key == 'max_seconds':
+                    m[key] = max(m[key], value)
+                else:
+                    m[key] += value
+
+    def __wait(self, attempt, response=None):
+        """Seconds to wait before retrying: full jitter over the exponential backoff, at least Retry-After
+        """
+        wait = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        if response is not None and response.headers.get('Retry-After', '').isdigit():
+            wait = max(wait, int(response.headers['Retry-After']))
+        return wait
+
+    def request(self, method: str, endpoint: str, **kwargs):
+        """Send a request, retrying transient failures
+
+        Args:
+            method (str): HTTP method
+            endpoint (str): Path under the base URL, e.g. 'entry/search'
+            **kwargs: Passed to `requests.Session.request`
+
+        Raises:
+            requests.HTTPError: If the response is not successful after the retries
+            requests.RequestException: If the request cannot be sent after the retries
+
+        Returns:
+            Response: Successful response
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        for attempt in range(self.max_retries + 1):
+            if self.before_request:
+                self.before_request()
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, f"{self.base_url}/{endpoint}", **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self.__record(endpoint, requests=1, seconds=time.perf_counter() - start)
+                if attempt == self.max_retries:
+                    self.__record(endpoint, failed=1)
+                    raise
+                wait = self.__wait(attempt)
+                logging.warning(f"{method} {endpoint} failed: {e}. Retrying in {wait:.1f}s")
+            else:
+                elapsed = time.perf_counter() - start
+                self.__record(endpoint, requests=1, seconds=elapsed, max_seconds=elapsed,
+                              throttled=int(response.status_code == 429),
+                              server_errors=int(response.status_code >= 500))
+                if response.status_code not in self.retry_statuses or attempt == self.max_retries:
+                    if not response.ok:
+                        self.__record(endpoint, failed=1)
+                    response.raise_for_status()
+                    return response
+                wait = self.__wait(attempt, response)
+                logging.warning(f"{method} {endpoint} returned {response.status_code}. Retrying in {wait:.1f}s")
+            self.__record(endpoint, retries=1)
+            time.sleep(wait)
+
+    def get(self, endpoint: str, params: dict = None, **kwargs):
+        return self.request('GET', endpoint, params=params, **kwargs)
+
+    def post(self, endpoint: str, data=None, **kwargs):
+        return self.request('POST', endpoint, data=data, **kwargs)
+
+    def stats(self):
+        """Latency and error metrics per endpoint
+
+        Returns:
+            dict: endpoint -> requests, mean and max latency in seconds, retries, throttled (429),
+                  server errors (5xx) and failed requests
+        """
+        with self.lock:
+            return {endpoint: dict(m, mean_seconds=m['seconds'] / m['requests'] if m['requests'] else 0.0)
+                    for endpoint, m in self.metrics.items()}
@@ -0,0 +1,182 @@
+'''
+Copyright (c) 2026 MTG-lab, University of Calgary
+
+You should have received a copy of the license along with this program.
+'''
+
+import functools
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+from rich.table import Table
+
+
+class Instrumentation:
+    """Timers and counters of a curation run, aggregated per run and per association.
+    Timers nest: the total time of a stage includes its nested stages, the self time does not.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self):
+        self.stages = {}        # stage -> [calls, total seconds, self seconds]
+        self.counters = {}      # counter -> count
+        self.associations = {}  # (gene MIM, phenotype MIM) -> seconds
+        self.nested = []
+
+    @contextmanager
+    def timer(self, stage: str):
+        """Time a block as a stage
+
+        Args:
+            stage (str): Stage name
+        """
+        self.nested.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stats = self.stages.setdefault(stage, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] += elapsed - self.nested.pop()
+            if self.nested:
+                self.nested[-1] += elapsed
+
+    def count(self, counter: str, n: int = 1):
+        """Increment a counter
+
+        Args:
+            counter (str): Counter name
+            n (int, optional): Increment. Defaults to 1.
+        """
+        self.counters[counter] = self.counters.get(counter, 0) + n
+
+    @contextmanager
+    def association(self, key):
+        """Time the curation of an association
+
+        Args:
+            key (tuple): (gene MIM, phenotype MIM)
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.associations[key] = self.associations.get(key, 0.0) + time.perf_counter() - start
+            self.count('associations')
+
+    def snapshot(self):
+        """Plain copy of the collected metrics, e.g. to send from a worker process
+
+        Returns:
+            dict: stages, counters and associations
+        """
+        return {'stages': {stage: list(stats) for stage, stats in self.stages.items()},
+                'counters': dict(self.counters), 'associations': dict(self.associations)}
+
+    def merge(self, snapshot: dict):
+        """Add the metrics of a snapshot
+
+        Args:
+            snapshot (dict): See `snapshot`
+        """
+        for stage, stats in snapshot['stages'].items():
+            own = self.stages.setdefault(stage, [0, 0.0, 0.0])
+            for i, value in enumerate(stats):
+                own[i] += value
+        for counter, n in snapshot['counters'].items():
+            self.count(counter, n)
+        for key, seconds in snapshot['associations'].items():
+            self.associations[key] = self.associations.get(key, 0.0) + seconds
+
+    def summary_table(self, slowest: int = 5):
+        """Summary of the run
+
+        Args:
+            slowest (int, optional): Number of slowest associations to list. Defaults to 5.
+
+        Returns:
+            Table: rich table of the stages, counters and slowest associations
+        """
+        n_assocs = len(self.associations)
+        table = Table(title=f"Curation of {n_assocs} associations in {sum(self.associations.values()):.2f}s")
+        for column in ["Stage", "Calls", "Total (s)", "Self (s)", "Per association (ms)"]:
+            table.add_column(column)
+        for stage, (calls, total, own) in sorted(self.stages.items(), key=lambda s: -s[1][1]):
+            table.add_row(stage, str(calls), f"{total:.3f}", f"{own:.3f}",
+                          f"{1000 * total / n_assocs:.1f}" if n_assocs else "")
+        for counter, n in sorted(self.counters.items()):
+            table.add_row(counter, str(n), "", "", "")
+        for key, seconds in sorted(self.associations.items(), key=lambda a: -a[1])[:slowest]:
+            table.add_row(f"slowest {key[0]}-{key[1]}", "", f"{seconds:.3f}", "", "")
+        return table
+
+    def prometheus(self, prefix: str = 'gpad_curation'):
+        """Metrics in the Prometheus text exposition format
+
+        Args:
+            prefix (str, optional): Metric name prefix. Defaults to 'gpad_curation'.
+
+        Returns:
+            str: Metrics text
+        """
+        lines = [f"# HELP {prefix}_stage_calls_total Calls of a curation stage",
+                 f"# TYPE {prefix}_stage_calls_total counter"]
+        lines += [f'{prefix}_stage_calls_total{{stage="{stage}"}} {stats[0]}' for stage, stats in self.stages.items()]
+        lines += [f"# HELP {prefix}_stage_seconds_total Wall time of a curation stage including nested stages",
+                  f"# TYPE {prefix}_stage_seconds_total counter"]
+        lines += [f'{prefix}_stage_seconds_total{{stage="{stage}"}} {stats[1]:.6f}' for stage, stats in self.stages.items()]
+        lines += [f"# HELP {prefix}_stage_self_seconds_total Wall time of a curation stage excluding nested stages",
+                  f"# TYPE {prefix}_stage_self_seconds_total counter"]
+        lines += [f'{prefix}_stage_self_seconds_total{{stage="{stage}"}} {stats[2]:.6f}' for stage, stats in self.stages.items()]
+        lines += [f"# HELP {prefix}_events_total Events counted during curation",
+                  f"# TYPE {prefix}_events_total counter"]
+        lines += [f'{prefix}_events_total{{counter="{counter}"}} {n}' for counter, n in self.counters.items()]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path, prefix: str = 'gpad_curation'):
+        """Write the metrics to a Prometheus text file, e.g. for the node exporter textfile collector.
+        The file is replaced atomically.
+
+        Args:
+            path (str|Path): Metrics file
+            prefix (str, optional): Metric name prefix. Defaults to 'gpad_curation'.
+        """
+        path = Path(path)
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_text(self.prometheus(prefix))
+        os.replace(tmp, path)
+
+
+class NullInstrumentation(Instrumentation):
+    """Instrumentation that collects nothing
+    """
+
+    def timer(self, stage: str):
+        return nullcontext()
+
+    def count(self, counter: str, n: int = 1):
+        pass
+
+    def association(self, key):
+        return nullcontext()
+
+
+def timed(stage: str):
+    """Time a method of an object with an `instrumentation` attribute as a stage
+
+    Args:
+        stage (str): Stage name
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.instrumentation.timer(stage):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,84 @@
+'''
+Copyright (c) 2026 MTG-lab, University of Calgary
+
+You should have received a copy of the license along with this program.
+'''
+
+import re
+
+
+class LexicalGate:
+    """Compiled regex scan that tells whether a paragraph can match the NLP patterns at all.
+    The scan is a superset of the matchers: lemmas are expanded to their inflected forms and phrases
+    are matched case-insensitively as prefixes, so a paragraph that fails the gate cannot match.
+    """
+    irregular_forms = {
+        'child': ['children'], 'man': ['men'], 'woman': ['women'], 'person': ['people'],
+        'people': ['peoples'], 'mouse': ['mice'], 'foot': ['feet'],
+    }
+
+    def __init__(self, lemmas=[], phrases=[]) -> None:
+        """
+        Args:
+            lemmas (list, optional): Lemmas of single tokens. Defaults to [].
+            phrases (list, optional): Phrases matched on lower case tokens. Defaults to [].
+        """
+        terms = sorted({form for lemma in lemmas for form in self.inflections(lemma)}, key=len, reverse=True)
+        alternatives = [re.escape(t) + r"\b" for t in terms] + \
+            [r"\s+".join(re.escape(w) for w in p.split()) for p in sorted(set(phrases), key=len, reverse=True)]
+        self.pattern = re.compile(r"\b(?:" + "|".join(alternatives) + ")", re.IGNORECASE) if alternatives else None
+        self.checked = 0
+        self.skipped = 0
+
+    @classmethod
+    def inflections(cls, lemma: str):
+        """Word forms a lemma can appear as
+
+        Args:
+            lemma (str): Lemma
+
+        Returns:
+            set: Forms including the lemma itself
+        """
+        forms = {lemma, lemma + 's', lemma + 'es'}
+        if lemma.endswith('y'):
+            forms.add(lemma[:-1] + 'ies')
+        forms.update(cls.irregular_forms.get(lemma, []))
+        return forms
+
+    @staticmethod
+    def anchor_pattern(anchors):
+        """Compile anchors matched as plain substrings, as `str.find` does
+
+        Args:
+            anchors (iterable): Anchor texts or numbers
+
+        Returns:
+            Pattern: Compiled pattern. None if there are no anchors.
+        """
+        anchors = sorted({str(a) for a in anchors if a}, key=len, reverse=True)
+        return re.compile("|".join(re.escape(a) for a in anchors)) if anchors else None
+
+    def passes(self, text: str, anchors=None):
+        """Check if a text contains any term of the gate or any of the anchors
+
+        Args:
+            text (str): Paragraph text
+            anchors (Pattern, optional): Anchors to accept the text with. See `anchor_pattern`. Defaults to None.
+
+        Returns:
+            bool: False if the text can be skipped
+        """
+        self.checked += 1
+        if (self.pattern is not None and self.pattern.search(text)) or (anchors is not None and anchors.search(text)):
+            return True
+        self.skipped += 1
+        return False
+
+    def stats(self):
+        """Gate statistics
+
+        Returns:
+            dict: checked and skipped paragraphs
+        """
+        return {'checked': self.checked, 'skipped': self.skipped}
@@ -1,8 +1,9 @@
 import pandas as pd
 from mongoengine.base.fields import ObjectIdField
 from mongoengine.document import Document, EmbeddedDocument, DynamicDocument
-from mongoengine.fields import DateTimeField, DictField, EmbeddedDocumentField, EmbeddedDocumentListField, IntField, ListField, StringField, BooleanField
+from mongoengine.fields import BinaryField, DateTimeField, DictField, EmbeddedDocumentField, EmbeddedDocumentListField, IntField, ListField, StringField, BooleanField
 from .settings import *
+from .streaming import Stream
 
 
 
@@ -136,7 +137,12 @@ class AssociationInformation(DynamicDocument):
     pheno_entry_fetched = DateTimeField()
     gpad_created = DateTimeField()    # when the entry was added in GPAD database
     gpad_updated = DateTimeField()    # When the enrytry was last updated in GPAD database
-    meta = {'collection': 'association_information_test_2'} # 'assocaiton_information'
+    gene_map_fetched = DateTimeField()  # When the association was last read from OMIM geneMap
+    meta = {
+        'collection': 'association_information_test_2', # 'assocaiton_information'
+        'indexes': [{'fields': ('gene_mimNumber', 'pheno_mimNumber'), 'unique': True}],   # geneMap upserts are keyed on the pair
+        'auto_create_index': False  # Older collections have duplicate pairs, indexes are built by `dedupe_associations`
+    }
     
 
 class PubmedEntry(Document):
@@ -148,9 +154,72 @@ class PubmedEntry(Document):
     pub_date = DateTimeField()
     epub_date = DateTimeField()
     pub_year = StringField()
+    not_found = DateTimeField()     # When NCBI last returned no record for the PMID
     meta = {'collection': 'pubmed_entry'}
 
 
+class EntryChange(Document):
+    """
+    Change of an OMIM entry recorded while extracting. Drives incremental curation.
+    """
+    mimNumber = IntField()
+    epochUpdated = IntField()
+    previous_epochUpdated = IntField()
+    recorded = DateTimeField()
+    curated = DateTimeField()   # Unset until the associations of the entry are curated
+    meta = {
+        'collection': 'entry_change_log',
+        'indexes': ['mimNumber', 'curated']
+    }
+
+
+class OmimQuota(Document):
+    """
+    OMIM API requests sent per day, shared by every process that uses the database
+    """
+    day = StringField(unique=True)  # YYYY-MM-DD in UTC
+    requests = IntField()
+    updated = DateTimeField()
+    meta = {'collection': 'omim_quota'}
+
+
+class CurationRun(Document):
+    """
+    Progress of a curation run. The associations to curate are split into shards of consecutive ids
+    when the run starts, so the run can be resumed without curating its completed shards again.
+    """
+    run_id = StringField(unique=True)
+    mims = ListField(IntField())    # MIM numbers to curate. Empty for all associations.
+    detect = StringField()
+    force_update = BooleanField()
+    incremental = BooleanField()    # Uncurated associations are selected along with the ones of `mims`
+    changes = ListField(ObjectIdField())    # EntryChange ids to mark curated when the run finishes
+    shards = ListField(ListField(ObjectIdField()))  # [first id, last id] of each shard
+    completed_shards = ListField(IntField())
+    last_id = ObjectIdField()       # Last association id of the latest checkpointed shard
+    counters = DictField()
+    started = DateTimeField()
+    updated = DateTimeField()
+    finished = DateTimeField()
+    meta = {'collection': 'curation_run'}
+
+
+class ParsedSection(Document):
+    """
+    Serialized spaCy DocBin of the paragraphs of an OMIM entry's text section or allelic variant
+    """
+    mimNumber = IntField()
+    epochUpdated = IntField()   # GeneEntry.epochUpdated the section was parsed from
+    section = StringField()     # Text section name or allelicVariant/<number>
+    model = StringField()       # Name and version of the spaCy pipeline
+    docbin = BinaryField()
+    created = DateTimeField()
+    meta = {
+        'collection': 'parsed_section',
+        'indexes': [('mimNumber', 'epochUpdated', 'section', 'model')]
+    }
+
+
 
 
 
@@ -219,6 +288,6 @@ class AggregationQueryFactory:
 
     
     def export_associations(self, output_filename):    
-        d = [self.flatten_data(ob.to_mongo().to_dict()) for ob in AssociationInformation.objects]
+        d = [self.flatten_data(ob) for ob in Stream(AssociationInformation)]
         df = pd.DataFrame.from_dict(d)
         df.to_excel(output_filename, sheet_name="GPAD", index=False)
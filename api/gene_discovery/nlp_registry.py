@@ -0,0 +1,67 @@
+'''
+Copyright (c) 2026 MTG-lab, University of Calgary
+
+You should have received a copy of the license along with this program.
+'''
+
+import gc
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+import spacy
+
+from .settings import NLP_MODEL
+
+
+_pipelines = {}     # model name -> loaded pipeline
+_lock = threading.Lock()
+
+
+def get_nlp(name: str = NLP_MODEL):
+    """Pipeline of a spaCy model. The model is loaded on first use and shared by everything in the process.
+
+    Args:
+        name (str, optional): Model name or path. Defaults to NLP_MODEL.
+
+    Returns:
+        Language: Pipeline
+    """
+    if name not in _pipelines:
+        with _lock:
+            if name not in _pipelines:
+                start = time.perf_counter()
+                _pipelines[name] = spacy.load(name)
+                logging.info(f"Loaded spaCy model {name} in {time.perf_counter() - start:.2f}s")
+    return _pipelines[name]
+
+
+def is_loaded(name: str = NLP_MODEL):
+    """Check if a model is loaded in this process without loading it
+    """
+    return name in _pipelines
+
+
+def preload(names: list = [NLP_MODEL]):
+    """Load models in a parent process before forking workers, so the workers share the pipelines
+    copy-on-write instead of loading their own. See `frozen` to keep the pages shared.
+
+    Args:
+        names (list, optional): Model names. Defaults to [NLP_MODEL].
+    """
+    for name in names:
+        get_nlp(name)
+
+
+@contextmanager
+def frozen():
+    """Freeze the objects of the process out of the garbage collector while forking workers.
+    The collector's bookkeeping would otherwise write to and copy the pages of the preloaded
+    pipelines in the workers. The parent collects them again when the block exits.
+    """
+    gc.freeze()
+    try:
+        yield
+    finally:
+        gc.unfreeze()
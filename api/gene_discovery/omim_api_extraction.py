@@ -11,20 +11,31 @@ You should have received a copy of the license along with this program.
 import datetime
 import logging
 import math
+import threading
 
 import pendulum
 import requests
 from rich import print
 from tqdm import tqdm, trange
 from mongoengine.queryset.visitor import Q
+from pymongo import UpdateOne
 
+from .change_log import record_change
 from .models import *
+from .http_client import ApiClient
+from .omim_cache import OmimResponseCache, ResponseNotCached, entry_epoch
+from .omim_quota import OmimQuotaExceeded, quota_ledger
+from .page_fetcher import PipelinedFetcher
 from .settings import *
+from .streaming import Stream
 
 
 
 
 class OmimApiAdapter:
+    """Client of OMIM API. Every request, including retries, reserves a request of the daily quota.
+    Responses are cached on disk, see `OmimResponseCache`, so reruns do not download them again.
+    """
     
     limit = 100
     # params = {
@@ -38,93 +49,170 @@ class OmimApiAdapter:
     #     }
     # }
 
+    def __init__(self, base_url: str = OMIM_API_URL, api_key: str = OMIM_API_KEY, ledger=quota_ledger,
+                 cache_mode: str = OMIM_CACHE, cache: OmimResponseCache = None) -> None:
+        """
+        Args:
+            base_url (str, optional): OMIM API base URL. Defaults to OMIM_API_URL.
+            api_key (str, optional): OMIM API key. Defaults to OMIM_API_KEY.
+            ledger (QuotaLedger, optional): Daily quota. Defaults to quota_ledger.
+            cache_mode (str, optional): 'on' to cache responses, 'off' or 'replay' to serve only cached responses
+                                        without sending requests. Defaults to OMIM_CACHE.
+            cache (OmimResponseCache, optional): Response cache. Defaults to the cache at OMIM_CACHE_PATH.
+        """
+        self.client = ApiClient(base_url, headers={'ApiKey': api_key} if api_key else {}, pool_size=max(OMIM_CONCURRENCY, 1),
+                                before_request=ledger.reserve)
+        self.cache_mode = cache_mode
+        self.cache = None
+        if cache_mode != 'off':
+            self.cache = cache if cache != None else OmimResponseCache()
+
+    def request(self, handle: str, params: dict):
+        """Send OMIM API request, or serve its response from the cache without using the quota
+
+        Args:
+            handle (str): API handle, e.g. 'entry/search'
+            params (dict): Query parameters
+
+        Raises:
+            OmimQuotaExceeded: If the daily OMIM API requests are used up
+            ResponseNotCached: If the response is not cached in replay mode
+            requests.RequestException: If the request failed after retries
+
+        Returns:
+            Response: Successful response
+        """
+        if self.cache != None:
+            content = self.cache.get(handle, params, revalidate=self.cache_mode != 'replay')
+            if content != None:
+                response = requests.Response()
+                response.status_code = 200
+                response.url = f"{self.client.base_url}/{self.cache.key(handle, params)}"
+                response.headers['Content-Type'] = 'application/json'
+                response._content = content
+                return response
+            if self.cache_mode == 'replay':
+                raise ResponseNotCached(f"OMIM API response of {handle} is not cached")
+        response = self.client.get(handle, params)
+        if self.cache != None:
+            self.cache.put(handle, params, response.content)
+        return response
+
+    def stats(self):
+        """Latency and error metrics per handle, see `ApiClient.stats`, and cache hits
+        """
+        stats = self.client.stats()
+        if self.cache != None:
+            stats['cache'] = self.cache.stats()
+        return stats
+
+
+_omim_api = None    # Adapter of the process, see `get_omim_api`
+_omim_api_lock = threading.Lock()
+
+
+def get_omim_api():
+    """OMIM API adapter of the process. It is created on first use, so importing the module neither
+    opens an HTTP session nor the response cache.
 
+    Returns:
+        OmimApiAdapter: Adapter
+    """
+    global _omim_api
+    if _omim_api is None:
+        with _omim_api_lock:
+            if _omim_api is None:
+                _omim_api = OmimApiAdapter()
+    return _omim_api
 
 
 def omim_request(handle: str, params: dict):
     """Send OMIM API request
 
     Args:
-        handle (str): _description_
-        params (dict): _description_
+        handle (str): API handle, e.g. 'entry/search'
+        params (dict): Query parameters
+
+    Returns:
+        Response: Successful response. False if the daily limit is exceeded or the request failed.
     """
     try: 
-        return requests.get(
-            'https://api.omim.org/api/'+handle,
-            params=params,
-            headers={'ApiKey': OMIM_API_KEY},
-        )
-    except:
+        return get_omim_api().request(handle, params)
+    except OmimQuotaExceeded:
         print(f"[red]Daily OMIM request limit exceed. Please  rerun the command tommorrow and it will safely resume.[/red]")
+    except requests.RequestException as e:
+        logging.error(f"OMIM API request {handle} failed: {repr(e)}")
+        print(f"[red]OMIM API request {handle} failed: {e}[/red]")
     
     return False
 
 
 def has_update(mims_to_check):
-    """Check OMIM database if there is a update for an entry
+    """Check OMIM database if there is a update for entries.
+    Entries are searched with their dates in batches of at most 100 MIM numbers and
+    the dateUpdated of OMIM is compared with the epochUpdated of the stored GeneEntry.
 
     Args:
-        mims_to_check (list[GeneEntry]): List of GeneEntry objects
+        mims_to_check (list[int]): MIM numbers of stored entries
 
     Returns:
-        list: mim ids that have updates
+        list[int]: MIM numbers of the entries updated in OMIM since they were fetched.
+                   Entries are not checked after a failed request, e.g. when the daily limit is exceeded.
     """
-    limit = 100
-    # mims = [str(mim) for mim in mims_to_check.keys()]
-    params={
-        'search': 'number:'+','.join(mims_to_check.keys()),
-        'sort': 'score+desc',
-        'start': 0,
-        'limit': limit,
-        'include': 'dates',
-        'format': 'json'
-    }
-    # Search through OMIM API
-    response = omim_request('entry/search', params)
-    if response:
-        checked = []
-        logging.debug(response.json())
+    limit = OmimApiAdapter.limit
+    mims_to_check = sorted({int(mim) for mim in mims_to_check})
+    updated = []
+    for start in trange(0, len(mims_to_check), limit, colour='#999999', desc="Checking Updates"):
+        batch = mims_to_check[start:start+limit]
+        params={
+            'search': 'number:'+','.join(str(mim) for mim in batch),
+            'sort': 'score+desc',
+            'start': 0,
+            'limit': limit,
+            'include': 'dates',
+            'format': 'json'
+        }
+        # Search through OMIM API
+        response = omim_request('entry/search', params)
+        if not response:
+            logging.warning(f"Updates of {len(mims_to_check) - start} entries are not checked")
+            break
+        local = {}
+        for entry in Stream(GeneEntry, ['mimNumber', 'epochUpdated'], query={'mimNumber': {'$in': batch}}):
+            local[entry.mimNumber] = max(local.get(entry.mimNumber) or 0, entry.epochUpdated or 0)
+        checked = 0
         for entry in response.json()['omim']['searchResponse']['entryList']:
-            mim = str(entry['entry']['mimNumber'])
-            if mim in mims_to_check.keys():
-                origin = pendulum.instance(
-                    datetime.datetime.strptime(
-                        entry['entry']['dateUpdated'], '%a, %d %b %Y %H:%M:%S %Z'))
-                if mims_to_check[mim][0].omim_entry_fetched:
-                    local = pendulum.instance(mims_to_check[mim][0].omim_entry_fetched)
-                    mims_to_check[mim][1] = origin > local
-                else:
-                    mims_to_check[mim][1] = False
-            checked.append(mim)
-        logging.debug(f"Checked {len(checked)} of {len(mims_to_check.keys())}")
-    return mims_to_check
+            mim = int(entry['entry']['mimNumber'])
+            origin = entry_epoch(entry['entry'])
+            if mim in local and origin != None:
+                checked += 1
+                if origin > local[mim]:
+                    updated.append(mim)
+        logging.debug(f"Checked {checked} of {len(batch)}")
+    return updated
 
 
 def what_to_update():
-    limit = 5
-    mims_to_check = {}
-    mims_to_fetch = []
-    for assoc in tqdm(AssociationInformation.objects, colour='#999999', desc="Checking Updates"):
-        if assoc.gene_entry_fetched:
-            mims_to_check[str(assoc.gene_mimNumber)] = [assoc, False]
-        if assoc.pheno_entry_fetched:
-            mims_to_check[str(assoc.pheno_mimNumber)] = [assoc, False]
-            # WIP change to assoc dict
-            # if len(mims_to_check.keys()+1) > limit:
-            #     checked_mims = has_update(mims_to_check)
-            #     for k, cm in checked_mims.items():
-            #         logging.info(f"{cm[0].mimNumber}: {cm[1]}")
-            #         if cm[1]:
-            #             mims_to_fetch.append(cm[0].mimNumber)
-            #             for p in cm[0].phenotypes:
-            #                 mims_to_fetch.append(p.mim_number)
-            #     mims_to_check = {}
-        else:
-            mims_to_fetch.append(assoc.pheno_mimNumber)
-            if 'phenotypes' in assoc:
-                for p in assoc.phenotypes:
-                    mims_to_fetch.append(p.mim_number)
-    return mims_to_fetch
+    """Identify the entries of the associations to extract from OMIM API:
+    entries never fetched and fetched entries that are updated in OMIM since
+
+    Returns:
+        list[int]: MIM numbers of the entries to extract
+    """
+    mims = set()
+    assocs = Stream(AssociationInformation, ['gene_mimNumber', 'pheno_mimNumber', 'phenotypes'])
+    for assoc in tqdm(assocs, total=len(assocs), colour='#999999', desc="Collecting Entries"):
+        mims.add(assoc.gene_mimNumber)
+        mims.add(assoc.pheno_mimNumber)
+        if 'phenotypes' in assoc:
+            for p in assoc.phenotypes:
+                mims.add(p['mim_number'])
+    mims.discard(None)
+    stored = {entry.mimNumber for entry in Stream(GeneEntry, ['mimNumber'])}
+    mims_to_fetch = sorted(mims - stored)
+    updated = has_update(mims & stored)
+    print(f"{len(mims_to_fetch)} entries are not fetched yet, {len(updated)} fetched entries are updated in OMIM.")
+    return mims_to_fetch + updated
 
 
 
@@ -136,6 +224,8 @@ def get_geneMaps():
         date_to ([type]): End date. See doc: 
     """
     limit = 100
+    # Upserts need the unique index of the association pairs
+    ensure_association_index()
     params={
         'search': 'phenotype_exists:true',
         'start': 0,
@@ -153,38 +243,7 @@ def get_geneMaps():
         total_result = response.json()['omim']['searchResponse']['totalResults']
         pbar = tqdm(total=total_result, colour="green", desc="Getting Associations")
         while more_page:
-            _entries = response.json()['omim']['searchResponse']['geneMapList']
-            # Persist in DB
-            for gene in _entries:
-                if 'phenotypeMapList' in gene['geneMap'] and len(gene['geneMap']['phenotypeMapList']):
-                    all_mims.append(int(gene['geneMap']['mimNumber']))
-                    for pheno in gene['geneMap']['phenotypeMapList']:
-                        if 'phenotypeMimNumber' in pheno['phenotypeMap']:
-                            # logging.debug(f"{gene['geneMap']['mimNumber']} - {pheno['phenotypeMap']['phenotypeMimNumber']}")
-                            assoc = AssociationInformation.objects.filter(
-                                (Q(gene_mimNumber=gene['geneMap']['mimNumber']) and Q(pheno_mimNumber=pheno['phenotypeMap']['phenotypeMimNumber']))).first()
-                            if assoc  == None:
-                                assoc = AssociationInformation()
-                                assoc["gene_mimNumber"] = gene['geneMap']['mimNumber']
-                                assoc['pheno_mimNumber'] = pheno['phenotypeMap']['phenotypeMimNumber']
-                                assoc.gpad_created = pendulum.now()                            
-                            # ai['gene_prefix'] = gene_entry.prefix
-                            if 'geneSymbols' in gene['geneMap']:
-                                assoc["gene_symbols"] = gene['geneMap']['geneSymbols']
-                            if 'geneName' in gene['geneMap']:
-                                assoc["gene_name"] = gene['geneMap']['geneName']
-                            
-                            if 'phenotype' in pheno['phenotypeMap']:
-                                assoc["phenotype"] = pheno['phenotypeMap']['phenotype']
-                            if 'phenotypeMappingKey' in pheno['phenotypeMap']:
-                                assoc["mapping_key"] = pheno['phenotypeMap']['phenotypeMappingKey']
-                            if 'phenotypeInheritance' in pheno['phenotypeMap']:
-                                assoc["inheritance"] = pheno['phenotypeMap']['phenotypeInheritance']
-                            assoc.gpad_updated = pendulum.now()
-                            # logging.debug(assoc)
-                            assoc.save()
-                            all_mims.append(int(pheno['phenotypeMap']['phenotypeMimNumber']))
-                            # phenos.append(pheno)
+            all_mims += save_gene_maps(response.json()['omim']['searchResponse']['geneMapList'])
             # Next page
             end_idx = response.json()['omim']['searchResponse']['endIndex']
             start_idx = end_idx + 1
@@ -202,6 +261,96 @@ def get_geneMaps():
     return all_mims
 
 
+def save_gene_maps(gene_maps):
+    """Save the associations of a geneMap/search page with a single bulk write.
+    Associations are upserted by their (gene_mimNumber, pheno_mimNumber) pair.
+
+    Args:
+        gene_maps (list): geneMapList of an OMIM API response
+
+    Returns:
+        List[int]: MIM IDs of the genes and phenotypes of the associations
+    """
+    all_mims = []
+    operations = []
+    now = pendulum.now()
+    for gene in gene_maps:
+        gene_map = gene['geneMap']
+        if 'phenotypeMapList' in gene_map and len(gene_map['phenotypeMapList']):
+            all_mims.append(int(gene_map['mimNumber']))
+            for pheno in gene_map['phenotypeMapList']:
+                phenotype_map = pheno['phenotypeMap']
+                if 'phenotypeMimNumber' in phenotype_map:
+                    # gpad_updated is left to curation, it tells when the association was curated last
+                    assoc = {'gene_map_fetched': now}
+                    if 'geneSymbols' in gene_map:
+                        assoc["gene_symbols"] = gene_map['geneSymbols']
+                    if 'geneName' in gene_map:
+                        assoc["gene_name"] = gene_map['geneName']
+                    if 'phenotype' in phenotype_map:
+                        assoc["phenotype"] = phenotype_map['phenotype']
+                    if 'phenotypeMappingKey' in phenotype_map:
+                        assoc["mapping_key"] = phenotype_map['phenotypeMappingKey']
+                    if 'phenotypeInheritance' in phenotype_map:
+                        assoc["inheritance"] = phenotype_map['phenotypeInheritance']
+                    operations.append(UpdateOne(
+                        {'gene_mimNumber': int(gene_map['mimNumber']), 'pheno_mimNumber': int(phenotype_map['phenotypeMimNumber'])},
+                        {'$set': assoc, '$setOnInsert': {'gpad_created': now}}, upsert=True))
+                    all_mims.append(int(phenotype_map['phenotypeMimNumber']))
+    if operations:
+        AssociationInformation._get_collection().bulk_write(operations, ordered=False)
+    return all_mims
+
+
+def dedupe_associations():
+    """Merge the associations of the same (gene_mimNumber, pheno_mimNumber) pair and build the indexes of AssociationInformation.
+    Associations were inserted without a unique pair before, the unique index cannot be built on such a collection.
+    The most recently curated association of a pair is kept, fields it lacks are taken from its duplicates.
+
+    Returns:
+        int: Number of removed duplicates
+    """
+    collection = AssociationInformation._get_collection()
+    duplicates = collection.aggregate([
+        {'$group': {'_id': {'gene': '$gene_mimNumber', 'pheno': '$pheno_mimNumber'}, 'ids': {'$push': '$_id'}, 'count': {'$sum': 1}}},
+        {'$match': {'count': {'$gt': 1}}}
+    ], allowDiskUse=True)
+    removed = 0
+    for duplicate in duplicates:
+        assocs = sorted(collection.find({'_id': {'$in': duplicate['ids']}}),
+                        key=lambda a: (a.get('gpad_updated') or datetime.datetime.min, a['_id']), reverse=True)
+        keep = assocs[0]
+        merged = {}
+        for assoc in assocs[1:]:
+            for field, value in assoc.items():
+                if keep.get(field) == None and field not in merged and value != None:
+                    merged[field] = value
+        created = [a['gpad_created'] for a in assocs if a.get('gpad_created') != None]
+        if created:
+            merged['gpad_created'] = min(created)
+        if merged:
+            collection.update_one({'_id': keep['_id']}, {'$set': merged})
+        collection.delete_many({'_id': {'$in': [a['_id'] for a in assocs[1:]]}})
+        removed += len(assocs) - 1
+    if removed:
+        logging.info(f"Merged {removed} duplicate associations")
+    AssociationInformation.ensure_indexes()
+    return removed
+
+
+def ensure_association_index():
+    """Migrate the associations with `dedupe_associations` unless their unique pair index is already built
+
+    Returns:
+        int: Number of removed duplicates
+    """
+    pair = [('gene_mimNumber', 1), ('pheno_mimNumber', 1)]
+    for index in AssociationInformation._get_collection().index_information().values():
+        if index.get('unique') and list(index['key']) == pair:
+            return 0
+    return dedupe_associations()
+
+
 def get_gene_ids(date_from, date_to):
     """ Getting the gene mim ids from OMIM api using date range
 
@@ -214,17 +363,13 @@ def get_gene_ids(date_from, date_to):
     total_result = 1
     all_gene_ids = []
     while more_page and total_result:
-        response = requests.get(
-            'https://api.omim.org/api/entry/search',
-            params={
+        response = get_omim_api().request('entry/search', {
                 'search': f'date_created:{date_from}-{date_to} OR date_updated:{date_from}-{date_to}',
                 'start': start_idx,
                 'sort': 'date_updated+asc',
                 'limit': OMIM_RESPONSE_LIMIT,
                 'format': 'json'
-            },
-            headers={'ApiKey': OMIM_API_KEY},
-        )
+            })
         _entries = response.json()['omim']['searchResponse']['entryList']
         _gene_ids = [int(_e['entry']['mimNumber']) for _e in _entries]
         all_gene_ids += _gene_ids
@@ -244,76 +389,138 @@ def ignore_existing_genes(all_gene_ids):
     print(f"Total {len(all_gene_ids)} entries to extract. {len(mim_ids_already_exists)} are already exist in the DB.")
     return genes_to_extract
 
-def extract_gene_info(genes_to_extract):
-    """Extract text and related information from OMIM API
+def extract_gene_info(genes_to_extract, concurrency: int = OMIM_CONCURRENCY):
+    """Extract text and related information from OMIM API.
+    Pages are fetched concurrently and saved as they arrive, see `PipelinedFetcher`.
 
     Args:
         genes_to_extract (List[int]): List of OMIM MIM IDs to extract
+        concurrency (int, optional): OMIM API requests in flight. Defaults to OMIM_CONCURRENCY.
     """
     gene_count = len(genes_to_extract)
-    extracted = []
     total_page = int(math.ceil(gene_count/OMIM_RESPONSE_LIMIT))
-    if total_page > OMIM_DAILY_LIMIT:
+    if total_page > quota_ledger.remaining():
         print(f"[orange]WARNING: Daily OMIM API request limit may exceed. Please  rerun the command tommorrow and it will safely resume.[/orange]")
 
-    for i in trange(total_page, desc='Getting Text from OMIM API'):
-        # logging.info(f"Page {i}")
-        omim_genes = genes_to_extract[i*OMIM_RESPONSE_LIMIT:(i+1)*OMIM_RESPONSE_LIMIT] 
-        response = requests.get(
-            'https://api.omim.org/api/entry',
-            params={
-                'mimNumber': ','.join(str(m) for m in omim_genes),
-                'include': 'text,allelicVariantList,geneMap,phenotypeMap,referenceList,externalLinks,dates,editHistory,creationDate',
-                'format': 'json'
-            },
-            headers={'ApiKey': OMIM_API_KEY},
-        )
-        if response:
-            response_entries = response.json()['omim']['entryList']
-            for r in response_entries:
-                entry = GeneEntry.objects(
-                    mimNumber=r['entry']['mimNumber']).first()
-                if entry == None:
-                    entry = GeneEntry()
-                    entry.mtgCreated = datetime.datetime.now()                
-                    entry.mimNumber = r['entry']['mimNumber']
-                entry.status = r['entry']['status']
-                entry.titles = r['entry']['titles']
-                entry.creationDate = r['entry']['creationDate']
-                entry.editHistory = r['entry']['editHistory']
-                entry.epochCreated = r['entry']['epochCreated']
-                entry.dateCreated = r['entry']['dateCreated']
-                entry.epochUpdated = r['entry']['epochUpdated']
-                entry.dateUpdated = r['entry']['dateUpdated']
-                entry.mtgUpdated = datetime.datetime.now()
-                if 'prefix' in r['entry']:
-                    entry.prefix = r['entry']['prefix']
-                if 'geneMap' in r['entry']:
-                    entry.geneMap = r['entry']['geneMap']
-                if 'textSectionList' in r['entry']:
-                    entry.textSectionList = r['entry']['textSectionList']
-                if 'allelicVariantList' in r['entry']:
-                    entry.allelicVariantList = r['entry']['allelicVariantList']
-                if 'referenceList' in r['entry']:
-                    entry.referenceList = r['entry']['referenceList']
-                if 'externalLinks' in r['entry']:
-                    entry.externalLinks = r['entry']['externalLinks']
-                logging.debug(f"Saving {entry.mimNumber}")
-                entry.save()
-                
-                assoc = AssociationInformation.objects.filter(
-                    (Q(gene_mimNumber=r['entry']['mimNumber']) or Q(pheno_mimNumber=r['entry']['mimNumber']))).first()
-                if assoc:
-                    if assoc.gene_mimNumber == r['entry']['mimNumber']:
-                        assoc.gene_entry_fetched = pendulum.now()
-                    elif assoc.pheno_mimNumber == r['entry']['mimNumber']:
-                        assoc.pheno_entry_fetched = pendulum.now()                        
-                    assoc.gpad_updated = pendulum.now()
-                    assoc.save()
-                
-                extracted.append(int(r['entry']['mimNumber']))
-        else:
-            if total_page > OMIM_DAILY_LIMIT:
-                print(f"[red]WARNING: Daily OMIM API request limit exceeded. Please  rerun the command tommorrow and it will safely resume.[/red]")
-            return extracted
+    pages = [genes_to_extract[i*OMIM_RESPONSE_LIMIT:(i+1)*OMIM_RESPONSE_LIMIT] for i in range(total_page)]
+    fetcher = PipelinedFetcher(fetch_page, save_entries, concurrency)
+    extracted = fetcher.run(pages, desc='Getting Text from OMIM API')
+    logging.info(f"OMIM API requests: {get_omim_api().stats()}")
+    if fetcher.quota_exceeded:
+        print(f"[red]WARNING: Daily OMIM API request limit exceeded. Please  rerun the command tommorrow and it will safely resume.[/red]")
+    return extracted
+
 
+def extract_page(omim_genes):
+    """Extract one page of entries from OMIM API and save them.
+    Saving is idempotent, so a page can be extracted again, e.g. when a task is retried.
+
+    Args:
+        omim_genes (List[int]): At most OMIM_RESPONSE_LIMIT MIM IDs
+
+    Returns:
+        List[int]: MIM IDs of the extracted entries. None if OMIM API did not respond successfully.
+    """
+    response_entries = fetch_page(omim_genes)
+    if response_entries == None:
+        return None
+    return save_entries(response_entries)
+
+
+def fetch_page(omim_genes):
+    """Request one page of entries from OMIM API
+
+    Args:
+        omim_genes (List[int]): At most OMIM_RESPONSE_LIMIT MIM IDs
+
+    Raises:
+        OmimQuotaExceeded: If the daily OMIM API requests are used up
+
+    Returns:
+        list: entryList of the response. None if OMIM API did not respond successfully.
+    """
+    try:
+        response = get_omim_api().request('entry', {
+            'mimNumber': ','.join(str(m) for m in omim_genes),
+            'include': 'text,allelicVariantList,geneMap,phenotypeMap,referenceList,externalLinks,dates,editHistory,creationDate',
+            'format': 'json'
+        })
+    except requests.RequestException as e:
+        logging.error(f"OMIM API entry request of {len(omim_genes)} entries failed: {repr(e)}")
+        return None
+    return response.json()['omim']['entryList']
+
+
+def save_entries(response_entries):
+    """Save the entries of an OMIM API response and mark the associations of the entries as fetched
+
+    Args:
+        response_entries (list): entryList of an OMIM API response
+
+    Returns:
+        List[int]: MIM IDs of the saved entries
+    """
+    extracted = []
+    for r in response_entries:
+        entry = GeneEntry.objects(
+            mimNumber=r['entry']['mimNumber']).first()
+        if entry == None:
+            entry = GeneEntry()
+            entry.mtgCreated = datetime.datetime.now()                
+            entry.mimNumber = r['entry']['mimNumber']
+        if entry.epochUpdated != r['entry']['epochUpdated']:
+            record_change(entry.mimNumber, r['entry']['epochUpdated'], entry.epochUpdated)
+        entry.status = r['entry']['status']
+        entry.titles = r['entry']['titles']
+        entry.creationDate = r['entry']['creationDate']
+        entry.editHistory = r['entry']['editHistory']
+        entry.epochCreated = r['entry']['epochCreated']
+        entry.dateCreated = r['entry']['dateCreated']
+        entry.epochUpdated = r['entry']['epochUpdated']
+        entry.dateUpdated = r['entry']['dateUpdated']
+        entry.mtgUpdated = datetime.datetime.now()
+        if 'prefix' in r['entry']:
+            entry.prefix = r['entry']['prefix']
+        if 'geneMap' in r['entry']:
+            entry.geneMap = r['entry']['geneMap']
+        if 'textSectionList' in r['entry']:
+            entry.textSectionList = r['entry']['textSectionList']
+        if 'allelicVariantList' in r['entry']:
+            entry.allelicVariantList = r['entry']['allelicVariantList']
+        if 'referenceList' in r['entry']:
+            entry.referenceList = r['entry']['referenceList']
+        if 'externalLinks' in r['entry']:
+            entry.externalLinks = r['entry']['externalLinks']
+        logging.debug(f"Saving {entry.mimNumber}")
+        entry.save()
+        
+        # Entry can be the gene of some associations and the phenotype of others
+        fetched = pendulum.now()
+        AssociationInformation.objects(gene_mimNumber=r['entry']['mimNumber']).update(set__gene_entry_fetched=fetched)
+        AssociationInformation.objects(pheno_mimNumber=r['entry']['mimNumber']).update(set__pheno_entry_fetched=fetched)
+        
+        extracted.append(int(r['entry']['mimNumber']))
+    return extracted
+
+
+
+def replay_cache(cache: OmimResponseCache = None):
+    """Rebuild the database from the cached OMIM API responses without sending any request.
+    Associations are saved from the geneMap/search pages, then entries from the entry pages in the order they were fetched,
+    so the latest cached version of an entry is saved last.
+
+    Args:
+        cache (OmimResponseCache, optional): Response cache. Defaults to the cache of `get_omim_api`.
+
+    Returns:
+        tuple: MIM IDs of the saved associations and of the saved entries
+    """
+    cache = cache or get_omim_api().cache or OmimResponseCache()
+    ensure_association_index()
+    all_mims = []
+    for body in tqdm(cache.responses('geneMap/search'), colour="green", desc="Replaying Associations"):
+        all_mims += save_gene_maps(body['omim']['searchResponse']['geneMapList'])
+    extracted = []
+    for body in tqdm(cache.responses('entry'), desc="Replaying Entries"):
+        extracted += save_entries(body['omim']['entryList'])
+    return all_mims, extracted
@@ -0,0 +1,163 @@
+'''
+Copyright (c) 2026 MTG-lab, University of Calgary
+
+You should have received a copy of the license along with this program.
+'''
+
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from urllib.parse import urlencode
+
+import requests
+
+from .settings import OMIM_CACHE_PATH, OMIM_CACHE_TTL
+
+
+class ResponseNotCached(requests.RequestException):
+    """The response of a request is not cached in replay mode"""
+
+
+def entry_epoch(entry: dict):
+    """Epoch of the last update of an OMIM entry
+
+    Args:
+        entry (dict): `entry` of an OMIM API response, requested with dates
+
+    Returns:
+        int: epochUpdated, parsed from dateUpdated if missing. None if the response has no dates.
+    """
+    if entry.get('epochUpdated') != None:
+        return int(entry['epochUpdated'])
+    if entry.get('dateUpdated'):
+        return int(datetime.datetime.strptime(entry['dateUpdated'], '%a, %d %b %Y %H:%M:%S %Z')
+                   .replace(tzinfo=datetime.timezone.utc).timestamp())
+    return None
+
+
+def response_entries(body: dict):
+    """Entries of an OMIM API response body, of both `entry` and `entry/search`
+    """
+    omim = body.get('omim', {})
+    return omim.get('entryList') or omim.get('searchResponse', {}).get('entryList') or []
+
+
+class OmimResponseCache:
+    """On-disk cache of OMIM API responses in SQLite, bodies are stored as compressed JSON.
+    Responses are keyed by the handle and the normalized query parameters.
+
+    `entry` responses do not expire. The epochUpdated of every entry in a cached response is kept, and
+    the latest epochUpdated seen for an entry in any response, e.g. the `entry/search` with dates of
+    `has_update`, makes the cached responses holding an older version of the entry stale.
+    Responses of the other handles, searches whose results change as OMIM grows, expire after `ttl` seconds.
+    """
+    revalidated_handles = {'entry'}     # Handles revalidated by entry epochs instead of expiring
+
+    def __init__(self, path: Path = OMIM_CACHE_PATH, ttl: int = OMIM_CACHE_TTL) -> None:
+        """
+        Args:
+            path (Path, optional): SQLite database file. Defaults to OMIM_CACHE_PATH.
+            ttl (int, optional): Seconds to keep search responses. Defaults to OMIM_CACHE_TTL.
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    @property
+    def connection(self):
+        """SQLite connection of the current thread. Connections are not shared across threads or forked processes.
+        """
+        if getattr(self.local, 'pid', None) != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=60)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.executescript('''
+                CREATE TABLE IF NOT EXISTS response (key TEXT PRIMARY KEY, handle TEXT, body BLOB, fetched REAL);
+                CREATE TABLE IF NOT EXISTS response_entry (key TEXT, mim INTEGER, epoch INTEGER, PRIMARY KEY (key, mim));
+                CREATE TABLE IF NOT EXISTS entry_epoch (mim INTEGER PRIMARY KEY, epoch INTEGER);
+            ''')
+            self.local.connection = connection
+            self.local.pid = os.getpid()
+        return self.local.connection
+
+    @staticmethod
+    def key(handle: str, params: dict):
+        """Cache key of a request. Parameter order and value types do not matter.
+        """
+        return f"{handle}?{urlencode(sorted((k, str(v)) for k, v in params.items()))}"
+
+    def get(self, handle: str, params: dict, revalidate: bool = True):
+        """Get the cached response content of a request
+
+        Args:
+            handle (str): API handle, e.g. 'entry/search'
+            params (dict): Query parameters
+            revalidate (bool, optional): Skip stale and expired responses. Defaults to True.
+
+        Returns:
+            bytes: Response content. None if not cached, stale or expired.
+        """
+        key = self.key(handle, params)
+        row = self.connection.execute('SELECT body, fetched FROM response WHERE key = ?', (key,)).fetchone()
+        if row == None:
+            self.misses += 1
+            return None
+        if revalidate and not self.is_fresh(key, handle, row[1]):
+            self.stale += 1
+            return None
+        self.hits += 1
+        return zlib.decompress(row[0])
+
+    def is_fresh(self, key: str, handle: str, fetched: float):
+        if handle not in self.revalidated_handles:
+            return time.time() - fetched < self.ttl
+        outdated = self.connection.execute('''
+            SELECT 1 FROM response_entry r JOIN entry_epoch e ON r.mim = e.mim
+            WHERE r.key = ? AND e.epoch > r.epoch LIMIT 1''', (key,)).fetchone()
+        return outdated == None
+
+    def put(self, handle: str, params: dict, content: bytes):
+        """Cache the response content of a request and record the epochs of its entries
+
+        Args:
+            handle (str): API handle
+            params (dict): Query parameters
+            content (bytes): JSON response content
+        """
+        key = self.key(handle, params)
+        epochs = [(int(e['entry']['mimNumber']), entry_epoch(e['entry'])) for e in response_entries(json.loads(content))]
+        epochs = [(mim, epoch) for mim, epoch in epochs if epoch != None]
+        with self.connection as connection:
+            connection.execute('INSERT OR REPLACE INTO response VALUES (?, ?, ?, ?)',
+                               (key, handle, zlib.compress(content), time.time()))
+            connection.execute('DELETE FROM response_entry WHERE key = ?', (key,))
+            connection.executemany('INSERT INTO response_entry VALUES (?, ?, ?)', [(key, mim, epoch) for mim, epoch in epochs])
+        self.observe(epochs)
+
+    def observe(self, epochs: list):
+        """Record the latest known epochs of entries, making older cached versions stale
+
+        Args:
+            epochs (list): (MIM number, epochUpdated) of entries
+        """
+        with self.connection as connection:
+            connection.executemany('''
+                INSERT INTO entry_epoch VALUES (?, ?)
+                ON CONFLICT (mim) DO UPDATE SET epoch = MAX(epoch, excluded.epoch)''', epochs)
+
+    def responses(self, handle: str):
+        """Iterate the cached response bodies of a handle in the order they were fetched
+        """
+        for (body,) in self.connection.execute('SELECT body FROM response WHERE handle = ? ORDER BY fetched', (handle,)):
+            yield json.loads(zlib.decompress(body))
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'stale': self.stale}
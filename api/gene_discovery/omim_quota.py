@@ -0,0 +1,64 @@
+'''
+Copyright (c) 2026 MTG-lab, University of Calgary
+
+You should have received a copy of the license along with this program.
+'''
+
+import logging
+
+import pendulum
+from pymongo import ReturnDocument
+
+from .models import OmimQuota
+from .settings import OMIM_DAILY_LIMIT
+
+
+class OmimQuotaExceeded(Exception):
+    """The OMIM API requests of the day are used up"""
+
+
+class QuotaLedger:
+    """Persistent count of the OMIM API requests of each day. Requests are reserved atomically in the database,
+    so concurrent threads, processes and reruns on the same day share the daily limit.
+    """
+
+    def __init__(self, daily_limit: int = OMIM_DAILY_LIMIT) -> None:
+        """
+        Args:
+            daily_limit (int, optional): Requests allowed per day. Defaults to OMIM_DAILY_LIMIT.
+        """
+        self.daily_limit = daily_limit
+
+    @staticmethod
+    def today():
+        return pendulum.now('UTC').to_date_string()
+
+    def reserve(self):
+        """Reserve a request of today's quota
+
+        Raises:
+            OmimQuotaExceeded: If the quota is used up
+        """
+        collection = OmimQuota._get_collection()
+        day = self.today()
+        collection.update_one({'day': day}, {'$setOnInsert': {'requests': 0}}, upsert=True)
+        quota = collection.find_one_and_update({'day': day, 'requests': {'$lt': self.daily_limit}},
+                                               {'$inc': {'requests': 1}, '$set': {'updated': pendulum.now()}},
+                                               return_document=ReturnDocument.AFTER)
+        if quota == None:
+            raise OmimQuotaExceeded(f"{self.daily_limit} OMIM API requests of {day} are used up")
+        logging.debug(f"OMIM API request {quota['requests']} of {self.daily_limit} on {day}")
+
+    def used(self):
+        """Requests sent today
+        """
+        quota = OmimQuota._get_collection().find_one({'day': self.today()})
+        return quota['requests'] if quota else 0
+
+    def remaining(self):
+        """Requests left today
+        """
+        return max(self.daily_limit - self.used(), 0)
+
+
+quota_ledger = QuotaLedger()
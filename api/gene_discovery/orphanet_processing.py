@@ -13,9 +13,11 @@ import math
 from tqdm import tqdm
 import xml.etree.ElementTree as ET
 import pandas as pd
-import requests
+from .http_client import ApiClient
 from .settings import *
 
+eutils = ApiClient(NCBI_EUTILS_URL)
+
 # df = pd.read_csv(data_dir/'orphanet_processed.csv', converters={"assoc_source": lambda x: x.strip("[]").split(", ")})
 # # pmid_df = pd.read_csv(data_dir/'PMC-ids.csv.gz')
 # # print(pmid_df.columns)
@@ -64,8 +66,8 @@ from .settings import *
 
 def get_pmid_years(pmids_to_extract):
     years = []
-    response = requests.get(
-        'https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi',
+    response = eutils.get(
+        'efetch.fcgi',
         params={
             'id': ','.join(pmid for pmid in pmids_to_extract),
             'db': 'pubmed',
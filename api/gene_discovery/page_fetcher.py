@@ -0,0 +1,86 @@
+'''
+Copyright (c) 2026 MTG-lab, University of Calgary
+
+You should have received a copy of the license along with this program.
+'''
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from tqdm import tqdm
+
+from .omim_quota import OmimQuotaExceeded
+
+
+class PipelinedFetcher:
+    """Fetch pages in a thread pool and save them in the calling thread, so network and database time overlap.
+    At most `concurrency` requests are in flight. Pages are saved in their order, fetched pages wait until
+    the pages before them are saved and fetching pauses while `queue_size` pages wait. Fetching stops at
+    the first failed page or when the quota is used up, the pages before it are still saved.
+    """
+
+    def __init__(self, fetch, save, concurrency: int = 4, queue_size: int = None) -> None:
+        """
+        Args:
+            fetch (callable): Fetch a page. Returns the response data, None if the request failed.
+                              Raises OmimQuotaExceeded if the quota is used up.
+            save (callable): Save the response data of a page. Returns a list of the saved items.
+            concurrency (int, optional): Requests in flight. Defaults to 4.
+            queue_size (int, optional): Fetched pages waiting to be saved. Defaults to 2 * concurrency.
+        """
+        self.fetch = fetch
+        self.save = save
+        self.concurrency = concurrency
+        self.queue_size = queue_size or 2 * concurrency
+        self.unfetched = 0     # Pages not fetched in the last run
+        self.quota_exceeded = False
+
+    def __fetch(self, page, stop):
+        if stop.is_set():
+            return None
+        data = None
+        try:
+            data = self.fetch(page)
+        except OmimQuotaExceeded as e:
+            logging.warning(e)
+            self.quota_exceeded = True
+        except Exception as e:
+            logging.exception(f"Fetching a page of {len(page)} failed: {e}")
+        if data == None:
+            stop.set()
+        return data
+
+    def run(self, pages: list, desc: str = 'Fetching'):
+        """Fetch and save pages
+
+        Args:
+            pages (list): Pages, passed to `fetch`
+            desc (str, optional): Progress bar description. Defaults to 'Fetching'.
+
+        Returns:
+            list: Saved items of the fetched pages, in the order of the pages
+        """
+        saved = []
+        self.unfetched = 0
+        self.quota_exceeded = False
+        stop = threading.Event()    # No more requests
+        pending = deque()   # Futures of the submitted pages, in the order of the pages
+        submitted = 0
+        pool = ThreadPoolExecutor(max_workers=self.concurrency)
+        try:
+            for index in tqdm(range(len(pages)), desc=desc):
+                while submitted < len(pages) and len(pending) < self.concurrency + self.queue_size:
+                    pending.append(pool.submit(self.__fetch, pages[submitted], stop))
+                    submitted += 1
+                data = pending.popleft().result()
+                if data == None:
+                    # Pages after a failed one are not saved, even if they were fetched, as in a serial run
+                    self.unfetched = len(pages) - index
+                    break
+                saved += self.save(data)
+        finally:
+            stop.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+        return saved
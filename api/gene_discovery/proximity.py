@@ -0,0 +1,92 @@
+'''
+Copyright (c) 2026 MTG-lab, University of Calgary
+
+You should have received a copy of the license along with this program.
+'''
+
+import numpy as np
+
+
+NONE = -1   # Index returned for anchors without a neighbour
+
+
+def offsets_array(offsets):
+    """Character offsets as an array for the searches below. Offsets must be in ascending order.
+    """
+    return np.asarray(offsets, dtype=np.int64)
+
+
+def nearest_before(offsets, anchors):
+    """Nearest offset strictly before each anchor. Of equal offsets the first one is taken.
+
+    Args:
+        offsets (ndarray): Ascending offsets
+        anchors (array_like): Anchor offsets
+
+    Returns:
+        ndarray: Index into `offsets` for each anchor. NONE if there is no offset before the anchor.
+    """
+    anchors = offsets_array(anchors)
+    before = np.searchsorted(offsets, anchors, side='left') - 1
+    found = before >= 0
+    # step back to the first of equal offsets
+    before[found] = np.searchsorted(offsets, offsets[before[found]], side='left')
+    return np.where(found, before, NONE)
+
+
+def nearest_after(offsets, anchors):
+    """Nearest offset strictly after each anchor. Of equal offsets the first one is taken.
+
+    Args:
+        offsets (ndarray): Ascending offsets
+        anchors (array_like): Anchor offsets
+
+    Returns:
+        ndarray: Index into `offsets` for each anchor. NONE if there is no offset after the anchor.
+    """
+    anchors = offsets_array(anchors)
+    after = np.searchsorted(offsets, anchors, side='right')
+    return np.where(after < len(offsets), after, NONE)
+
+
+def nearest(offsets, anchors):
+    """Nearest offset preceding each anchor, or the nearest following one when nothing precedes it.
+    Offsets equal to the anchor are neither.
+
+    Args:
+        offsets (ndarray): Ascending offsets
+        anchors (array_like): Anchor offsets
+
+    Returns:
+        ndarray: Index into `offsets` for each anchor. NONE if there is no other offset.
+    """
+    before = nearest_before(offsets, anchors)
+    return np.where(before != NONE, before, nearest_after(offsets, anchors))
+
+
+def enclosing(bounds, positions):
+    """Span containing each position
+
+    Args:
+        bounds (ndarray): Ascending start offsets of consecutive spans (e.g. sentences)
+        positions (array_like): Offsets to look up
+
+    Returns:
+        ndarray: Index into `bounds` for each position. NONE if the position is before the first span.
+    """
+    return np.searchsorted(bounds, offsets_array(positions), side='right') - 1
+
+
+def within(offsets, start, end):
+    """Index range of the offsets in [start, end)
+
+    Args:
+        offsets (ndarray): Ascending offsets
+        start (int): Start offset
+        end (int): End offset (exclusive)
+
+    Returns:
+        tuple: (first, last) indices. Slice `offsets[first:last]`.
+    """
+    first, last = np.searchsorted(offsets, [start, end], side='left')
+    return int(first), int(last)
@@ -22,7 +22,6 @@ from pathlib import Path
 
 import random
 import pandas as pd
-import requests
 import spacy
 from dateutil import parser
 from spacy import displacy
@@ -30,9 +29,12 @@ from datetime import date, timedelta
 from spacy.matcher import PhraseMatcher
 import xml.etree.ElementTree as ET
 
+from .http_client import ApiClient
 from .models import *
 from .settings import *
 
+eutils = ApiClient(NCBI_EUTILS_URL)
+
 
 for entry in tqdm(GeneEntry.objects):
     if entry.referenceList:
@@ -41,8 +43,8 @@ for entry in tqdm(GeneEntry.objects):
         pmids_already_exists = [article.pmid for article in already_exists]
         pmids_to_extract = list(set(pmids) - set(pmids_already_exists))
         if pmids_to_extract:
-            response = requests.get(
-                'https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi',
+            response = eutils.get(
+                'efetch.fcgi',
                 params={
                     'id': ','.join(str(pmid) for pmid in pmids_to_extract),
                     'db': 'pubmed',
@@ -0,0 +1,140 @@
+'''
+Copyright (c) 2026 MTG-lab, University of Calgary
+
+You should have received a copy of the license along with this program.
+'''
+
+import logging
+import time
+from collections import namedtuple
+
+import pendulum
+
+from .models import PubmedEntry
+
+
+PubmedRecord = namedtuple('PubmedRecord', ['pmid', 'pub_date', 'epub_date', 'journal_name', 'pub_year'])
+
+
+class PubmedCache:
+    """In-process cache of `pubmed_entry`, warm loaded with a single collection scan.
+    PMIDs known to have no PubMed record are cached as missing, so they are not looked up again until the TTL expires.
+    """
+    fields = ['pmid', 'pub_date', 'epub_date', 'journal_name', 'pub_year', 'not_found']
+
+    def __init__(self, ttl: int = 24*60*60, missing_ttl: int = 7*24*60*60) -> None:
+        """
+        Args:
+            ttl (int, optional): Seconds to keep a record before reading it again from the database. Defaults to a day.
+            missing_ttl (int, optional): Seconds to keep a PMID as missing before looking it up again. Defaults to a week.
+        """
+        self.ttl = ttl
+        self.missing_ttl = missing_ttl
+        self.records = {}   # pmid -> (PubmedRecord, expires)
+        self.missing = {}   # pmid -> expires
+        self.warmed = False
+        self.hits = 0
+        self.misses = 0
+
+    def __record(self, son):
+        return PubmedRecord(son['pmid'], son.get('pub_date'), son.get('epub_date'), son.get('journal_name'), son.get('pub_year'))
+
+    def __add_son(self, son, now):
+        if son.get('not_found') is not None:
+            expires = pendulum.instance(son['not_found']).timestamp() + self.missing_ttl
+            if expires > now:
+                self.missing[son['pmid']] = expires
+        else:
+            self.records[son['pmid']] = (self.__record(son), now + self.ttl)
+
+    def warm_up(self):
+        """Load all PubMed entries of the database
+        """
+        now = time.time()
+        for son in PubmedEntry._get_collection().find({}, {field: 1 for field in self.fields}):
+            if son.get('pmid') is not None:
+                self.__add_son(son, now)
+        self.warmed = True
+        logging.info(f"PubMed cache warmed with {len(self.records)} records and {len(self.missing)} missing PMIDs")
+
+    def clear(self):
+        """Drop every cached record, e.g. after switching databases
+        """
+        self.records = {}
+        self.missing = {}
+        self.warmed = False
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, pmids: list):
+        """Read PMIDs from the database with a single query
+
+        Args:
+            pmids (list[int]): Pubmed PMIDs
+        """
+        now = time.time()
+        for son in PubmedEntry._get_collection().find({'pmid': {'$in': list(pmids)}}, {field: 1 for field in self.fields}):
+            self.__add_son(son, now)
+
+    def put(self, entry: PubmedEntry):
+        """Cache a PubMed entry
+
+        Args:
+            entry (PubmedEntry): Entry with publication dates
+        """
+        self.__add_son(entry.to_mongo().to_dict(), time.time())
+
+    def put_missing(self, pmid: int):
+        """Cache a PMID as having no PubMed record
+
+        Args:
+            pmid (int): Pubmed PMID
+        """
+        self.missing[int(pmid)] = time.time() + self.missing_ttl
+
+    def is_missing(self, pmid: int):
+        expires = self.missing.get(int(pmid))
+        return expires is not None and expires > time.time()
+
+    def is_known(self, pmid: int):
+        """Check if the PMID is cached either with its record or as missing
+        """
+        return self.get(pmid, load=False) is not None or self.is_missing(pmid)
+
+    def get(self, pmid: int, load: bool = True):
+        """Get the cached record of a PMID
+
+        Args:
+            pmid (int): Pubmed PMID
+            load (bool, optional): Read the database if the PMID is not cached. Defaults to True.
+
+        Returns:
+            PubmedRecord: Record of the PMID. None if unknown or missing.
+        """
+        if not self.warmed:
+            self.warm_up()
+        pmid = int(pmid)
+        cached = self.records.get(pmid)
+        now = time.time()
+        if cached is not None and cached[1] > now:
+            self.hits += 1
+            return cached[0]
+        if self.is_missing(pmid):
+            self.hits += 1
+            return None
+        if not load:
+            return None
+        self.misses += 1
+        son = PubmedEntry._get_collection().find_one({'pmid': pmid}, {field: 1 for field in self.fields})
+        if son is None:
+            self.records.pop(pmid, None)
+            return None
+        self.__add_son(son, now)
+        return self.get(pmid, load=False)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'records': len(self.records), 'missing': len(self.missing)}
+
+
+# Shared by every curator and validation of the process
+pubmed_cache = PubmedCache()
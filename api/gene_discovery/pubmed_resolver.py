@@ -0,0 +1,203 @@
+'''
+Copyright (c) 2026 MTG-lab, University of Calgary
+
+You should have received a copy of the license along with this program.
+'''
+
+import io
+import json
+import logging
+import re
+import threading
+import time
+from datetime import datetime
+
+import pendulum
+from Bio import Entrez
+from pymongo import UpdateOne
+
+from .http_client import ApiClient
+from .models import PubmedEntry
+from .pubmed_cache import pubmed_cache
+from .settings import *
+
+
+pubmed_date_regex = r"(\d{4})\ ?(\S{3})?( \d{2})?"
+
+
+def _parse_date(raw_date):
+    dt_match = re.match(pubmed_date_regex, raw_date)
+    parsed = None
+    try:
+        if dt_match and dt_match.group(3):
+            parsed = datetime.strptime(dt_match.group(), "%Y %b %d")
+        elif dt_match:
+            parsed = datetime.strptime(dt_match.group(), "%Y %b")
+    except ValueError as e:
+        logging.exception(repr(e))
+    return dt_match, parsed
+
+
+def pubmed_entry_from_summary(pmid, record):
+    """Create PubmedEntry from an esummary record
+
+    Args:
+        pmid (int): Pubmed PMID
+        record (dict): esummary DocSum as parsed by `Entrez.read`
+
+    Returns:
+        PubmedEntry: Unsaved entry
+    """
+    pe = PubmedEntry()
+    pe.pmid = pmid
+    pe.raw_pub_date = record["PubDate"]
+    dt_match, pe.pub_date = _parse_date(record["PubDate"])
+    if dt_match:
+        pe.pub_year = dt_match.group(1)
+    if 'EPubDate' in record:
+        pe.raw_epub_date = record["EPubDate"]
+        epub_dt_match, pe.epub_date = _parse_date(record["EPubDate"])
+        if epub_dt_match and epub_dt_match.group(1):
+            pe.pub_year = epub_dt_match.group(1)
+    # Journal name
+    if 'FullJournalName' in record:
+        pe.journal_name = record["FullJournalName"]
+    return pe
+
+
+def has_summary(record):
+    """Check if an esummary record is a DocSum with a publication date, not an error
+    """
+    return isinstance(record, dict) and 'error' not in record and 'PubDate' in record
+
+
+class TokenBucket:
+    """Token bucket rate limiter
+    """
+
+    def __init__(self, rate: float, capacity: int = 1) -> None:
+        """
+        Args:
+            rate (float): Tokens added per second
+            capacity (int, optional): Maximum tokens that can be spent at once. Defaults to 1.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Wait until a token is available and spend it
+        """
+        with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                time.sleep((1 - self.tokens) / self.rate)
+
+
+class PubmedResolver:
+    """Resolve publication dates of PMIDs missing in the `pubmed_entry` collection.
+    PMIDs are collected across a batch and fetched with multi-ID esummary requests
+    under the NCBI rate limit (3 requests/s, 10 requests/s with NCBI_API_KEY).
+    """
+    batch_size = 200    # PMIDs per esummary request
+
+    def __init__(self, fixture=None, eutils_url: str = NCBI_EUTILS_URL, rate: float = None) -> None:
+        """
+        Args:
+            fixture (str|Path, optional): JSON file of esummary records keyed by PMID to resolve from
+                                    instead of NCBI. Defaults to None.
+            eutils_url (str, optional): E-utilities base URL. Defaults to NCBI_EUTILS_URL.
+            rate (float, optional): Requests per second. Defaults to NCBI's limit.
+        """
+        self.fixture = None
+        if fixture:
+            with open(fixture) as f:
+                self.fixture = {int(pmid): record for pmid, record in json.load(f).items()}
+        self.eutils_url = eutils_url
+        self.bucket = TokenBucket(rate or (10 if NCBI_API_KEY else 3))
+        self.client = ApiClient(eutils_url, before_request=self.bucket.acquire)
+        self.pending = set()
+
+    def add(self, pmids):
+        """Collect PMIDs to resolve
+
+        Args:
+            pmids (iterable[int]): Pubmed PMIDs
+        """
+        self.pending.update(int(pmid) for pmid in pmids if pmid)
+
+    def fetch_summaries(self, pmids: list):
+        """Fetch esummary records of PMIDs
+
+        Args:
+            pmids (list[int]): Pubmed PMIDs
+
+        Returns:
+            dict: PMID to esummary record. PMIDs NCBI reports as invalid or without a document summary are left out.
+        """
+        if self.fixture is not None:
+            return {pmid: self.fixture[pmid] for pmid in pmids if pmid in self.fixture and has_summary(self.fixture[pmid])}
+        params = {'db': 'pubmed', 'id': ','.join(str(pmid) for pmid in pmids), 'tool': 'gpad', 'email': Entrez.email}
+        if NCBI_API_KEY:
+            params['api_key'] = NCBI_API_KEY
+        response = self.client.post('esummary.fcgi', data=params)
+        # Invalid UIDs are reported as ERROR elements next to the DocSums of the valid ones
+        records = Entrez.read(io.BytesIO(response.content), ignore_errors=True)
+        summaries = {}
+        for record in records:
+            if has_summary(record):
+                summaries[int(record['Id'])] = record
+            else:
+                logging.debug(f"esummary has no document summary: {record}")
+        return summaries
+
+    def resolve(self):
+        """Fetch the collected PMIDs that are neither cached nor in the database and store them in bulk.
+        PMIDs without a PubMed record are stored as not found, so they are not requested again until
+        the missing TTL of the cache expires. Records resolved from a fixture are only cached in the process.
+
+        Returns:
+            dict: PMID to PubmedEntry of the newly stored entries
+        """
+        pmids = sorted(self.pending)
+        self.pending = set()
+        unknown = [pmid for pmid in pmids if not pubmed_cache.is_known(pmid)]
+        if not unknown:
+            return {}
+        pubmed_cache.load(unknown)
+        missing = [pmid for pmid in unknown if not pubmed_cache.is_known(pmid)]
+        resolved = {}
+        not_found = []
+        for i in range(0, len(missing), self.batch_size):
+            batch = missing[i:i+self.batch_size]
+            logging.info(f"Sending Entrez request for {len(batch)} PMIDs")
+            try:
+                records = self.fetch_summaries(batch)
+            except Exception as e:
+                logging.exception(f"esummary failed for PMIDs {batch[0]}..{batch[-1]}: {repr(e)}")
+                continue
+            for pmid in batch:
+                if pmid in records:
+                    resolved[pmid] = pubmed_entry_from_summary(pmid, records[pmid])
+                else:
+                    not_found.append(pmid)
+        operations = []
+        for pmid, pe in resolved.items():
+            pubmed_cache.put(pe)
+            son = pe.to_mongo().to_dict()
+            son.pop('_id', None)
+            operations.append(UpdateOne({'pmid': pmid}, {'$set': son, '$unset': {'not_found': ''}}, upsert=True))
+        for pmid in not_found:
+            pubmed_cache.put_missing(pmid)
+            operations.append(UpdateOne({'pmid': pmid}, {'$set': {'pmid': pmid, 'not_found': pendulum.now()}}, upsert=True))
+        if operations and self.fixture is None:
+            PubmedEntry._get_collection().bulk_write(operations, ordered=False)
+        logging.debug(f"Resolved {len(resolved)} of {len(missing)} missing PMIDs, {len(not_found)} not found")
+        return resolved
@@ -26,7 +26,14 @@ dotenv.load_dotenv(dotenv_path)
 OMIM_API_KEY = os.getenv("OMIM_API_KEY")
 OMIM_RESPONSE_LIMIT = int(os.getenv("OMIM_RESPONSE_LIMIT", 20))    # OMIM limit 20 entries per request
 OMIM_DAILY_LIMIT = int(os.getenv("OMIM_DAILY_LIMIT", 250))
+OMIM_API_URL = os.getenv("OMIM_API_URL", "https://api.omim.org/api")    # Point to a stand-in server in tests
+OMIM_CONCURRENCY = int(os.getenv("OMIM_CONCURRENCY", 4))    # OMIM API requests in flight
+OMIM_CACHE = os.getenv("OMIM_CACHE", "on")     # OMIM API response cache: on, off or replay (cached responses only, no requests)
+OMIM_CACHE_PATH = Path(os.getenv("OMIM_CACHE_PATH", data_dir / 'omim_cache.sqlite'))
+OMIM_CACHE_TTL = int(os.getenv("OMIM_CACHE_TTL", 24*60*60))    # Seconds to keep search responses
 NCBI_API_KEY = os.getenv("NCBI_API_KEY")
+NCBI_EUTILS_URL = os.getenv("NCBI_EUTILS_URL", "https://eutils.ncbi.nlm.nih.gov/entrez/eutils")
+NLP_MODEL = os.getenv("NLP_MODEL", "en_core_web_sm")   # spaCy model of the curation pipeline
 
 log_fmt = "[%(asctime)s - %(levelname)s - %(filename)s:%(lineno)s - %(funcName)s() ] %(message)s"
 logging.basicConfig(filename=project_dir/'logs'/f"app{pendulum.now()}.log", filemode='w', level=logging.DEBUG, format=log_fmt)
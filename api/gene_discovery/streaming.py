@@ -0,0 +1,92 @@
+'''
+Copyright (c) 2026 MTG-lab, University of Calgary
+
+You should have received a copy of the license along with this program.
+'''
+
+
+class Record:
+    """Read-only view of the projected fields of a raw document.
+    Supports `record.field`, `record['field']` and `'field' in record` like a mongoengine document,
+    embedded documents stay raw dicts.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, field):
+        return getattr(self, field)
+
+    def __contains__(self, field):
+        return getattr(self, field, None) is not None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{f}={getattr(self, f)!r}' for f in self.__slots__)})"
+
+
+_record_types = {}
+
+
+def record_type(document_class, fields: tuple):
+    """Record class with slots for the fields of a document class
+
+    Args:
+        document_class (Document): mongoengine Document class
+        fields (tuple): Field names
+
+    Returns:
+        type: Subclass of Record
+    """
+    key = (document_class.__name__, fields)
+    if key not in _record_types:
+        _record_types[key] = type(f"{document_class.__name__}Record", (Record,), {'__slots__': fields})
+    return _record_types[key]
+
+
+class Stream:
+    """Iterate a collection with a raw pymongo cursor instead of hydrating mongoengine documents.
+    Only the projected fields are read and the cursor fetches `batch_size` documents at a time,
+    so memory stays flat as the collection grows. Every iteration opens a new cursor.
+    """
+
+    def __init__(self, document_class, fields: list = None, query: dict = None, batch_size: int = 1000, sort=None) -> None:
+        """
+        Args:
+            document_class (Document): mongoengine Document class of the collection
+            fields (list, optional): Top level fields to read. Documents are yielded as `Record`s with these fields.
+                                    Defaults to None (yield complete raw dicts).
+            query (dict, optional): Raw pymongo filter. Defaults to None (all documents).
+            batch_size (int, optional): Documents per cursor batch. Defaults to 1000.
+            sort (list, optional): pymongo sort specification. Defaults to None (natural order).
+        """
+        self.document_class = document_class
+        self.fields = tuple(fields) if fields else None
+        self.query = query or {}
+        self.batch_size = batch_size
+        self.sort = sort
+        self.db_fields = None
+        if self.fields:
+            self.db_fields = tuple(self.__db_field(f) for f in self.fields)
+            self.record_type = record_type(document_class, self.fields)
+
+    def __db_field(self, field):
+        if field == 'id':
+            return '_id'
+        if field in self.document_class._fields:
+            return self.document_class._fields[field].db_field
+        return field    # dynamic field
+
+    def __len__(self):
+        return self.document_class._get_collection().count_documents(self.query)
+
+    def __iter__(self):
+        projection = {f: 1 for f in self.db_fields} if self.fields else None
+        cursor = self.document_class._get_collection().find(self.query, projection, batch_size=self.batch_size)
+        if self.sort:
+            cursor = cursor.sort(self.sort)
+        if not self.fields:
+            yield from cursor
+            return
+        for son in cursor:
+            record = self.record_type.__new__(self.record_type)
+            for field, db_field in zip(self.fields, self.db_fields):
+                setattr(record, field, son.get(db_field))
+            yield record
@@ -0,0 +1,91 @@
+'''
+Copyright (c) 2026 MTG-lab, University of Calgary
+
+You should have received a copy of the license along with this program.
+'''
+
+import logging
+import time
+
+from pymongo import UpdateOne
+
+
+class WriteBuffer:
+    """Buffer of document field updates that are written as bulk UpdateOne($set) operations
+    """
+
+    def __init__(self, document_class, batch_size: int = 500) -> None:
+        """
+        Args:
+            document_class (Document): mongoengine Document class of the collection to write
+            batch_size (int, optional): Number of updates per bulk write. Defaults to 500.
+        """
+        self.document_class = document_class
+        self.batch_size = batch_size
+        self.operations = []
+        self.written = 0
+        self.batch_latencies = []
+
+    @staticmethod
+    def changed_values(doc, fields: list):
+        """Get the changed fields of a document in their database representation
+
+        Args:
+            doc (Document): Document with changes
+            fields (list): Top level fields to consider
+
+        Returns:
+            dict: field name to mongo value of the changed fields
+        """
+        changed = {path.split('.')[0] for path in doc._get_changed_fields()}
+        son = doc.to_mongo()
+        return {field: son[field] for field in fields if field in changed and field in son}
+
+    def add(self, _id, values: dict):
+        """Buffer an update of a document. Flushes when the batch is full.
+
+        Args:
+            _id (ObjectId): Id of the document
+            values (dict): Field name to mongo value to set
+        """
+        if values:
+            self.operations.append(UpdateOne({'_id': _id}, {'$set': values}))
+        if len(self.operations) >= self.batch_size:
+            self.flush()
+
+    def add_document(self, doc, fields: list):
+        """Buffer the changed fields of a document, as `doc.save()` would write them
+
+        Args:
+            doc (Document): Document with changes
+            fields (list): Top level fields to write
+        """
+        self.add(doc.pk, self.changed_values(doc, fields))
+        doc._clear_changed_fields()
+
+    def flush(self):
+        """Write the buffered updates
+        """
+        if not self.operations:
+            return
+        start = time.perf_counter()
+        result = self.document_class._get_collection().bulk_write(self.operations, ordered=False)
+        latency = time.perf_counter() - start
+        self.batch_latencies.append(latency)
+        self.written += len(self.operations)
+        logging.info(f"Bulk wrote {len(self.operations)} updates ({result.modified_count} modified) in {latency:.3f}s")
+        self.operations = []
+
+    def stats(self):
+        """Write statistics
+
+        Returns:
+            dict: written updates, batches and batch latencies in seconds
+        """
+        batches = len(self.batch_latencies)
+        return {
+            'written': self.written,
+            'batches': batches,
+            'mean_batch_latency': sum(self.batch_latencies) / batches if batches else 0.0,
+            'max_batch_latency': max(self.batch_latencies, default=0.0),
+        }
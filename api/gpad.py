@@ -22,9 +22,10 @@ from rich import print
 from api.gene_discovery.data_curation import Curator
 from api.gene_discovery.gpad_validation import Validation
 from api.gene_discovery.models import AggregationQueryFactory, AssociationInformation, GeneMap, GeneEntry
+from api.gene_discovery.streaming import Stream
 
 from .gene_discovery.settings import *
-from .gene_discovery.omim_api_extraction import extract_gene_info, get_gene_ids, has_update, ignore_existing_genes, get_geneMaps, what_to_update
+from .gene_discovery.omim_api_extraction import extract_gene_info, get_gene_ids, has_update, ignore_existing_genes, get_geneMaps, what_to_update, replay_cache
 
 
 tpr = typer.Typer(pretty_exceptions_show_locals=False)
@@ -70,31 +71,116 @@ def export():
     aqf.export_associations(data_dir / f"export_AssociationInformation_May2023_v5.xlsx")
 
 @tpr.command()
-def omim(dry_run: bool = typer.Option(False, help="If TRUE, run analysis without updating database")):
+def omim(dry_run: bool = typer.Option(False, help="If TRUE, run analysis without updating database"),
+         workers: int = typer.Option(1, help="Number of worker processes to apply NLP with"),
+         metrics_file: Path = typer.Option(None, help="Write curation metrics to this Prometheus text file"),
+         resume: str = typer.Option(None, help="Skip extraction and continue the curation run with this run id"),
+         shard_limit: int = typer.Option(None, help="Curate at most this many shards, resume the run later for the rest")):
     print(f"\n:robot:..GPAD Started..:robot:\n")
     
-    # Get GeneMap entries
-    all_mims = get_geneMaps()
-    print(f"Identify Associations [green]:heavy_check_mark:[/green]\n")
-    # logging.info(all_mims)
-    
-    # Identify Entries to fetch
-    mims_to_fetch = what_to_update()
-    print(f"[bold red]{len(mims_to_fetch)}[/bold red] entries to be extracted from OMIM API.\n")
-    
-    # Extract from OMIM API
-    extracted = extract_gene_info(mims_to_fetch)
-    print(f"[bold blue]{len(extracted)}[/bold blue] genes successfully extracted.\n")
+    if resume == None:
+        # Get GeneMap entries
+        all_mims = get_geneMaps()
+        print(f"Identify Associations [green]:heavy_check_mark:[/green]\n")
+        # logging.info(all_mims)
+        
+        # Identify Entries to fetch
+        mims_to_fetch = what_to_update()
+        print(f"[bold red]{len(mims_to_fetch)}[/bold red] entries to be extracted from OMIM API.\n")
+        
+        # Extract from OMIM API
+        extracted = extract_gene_info(mims_to_fetch)
+        print(f"[bold blue]{len(extracted)}[/bold blue] genes successfully extracted.\n")
     
     # Apply NLP
     curation = Curator()
     # curation.curate([], detect='all', force_update=True, dry_run=dry_run)
     # curation.curate([603136], force_update=True, dry_run=True)
-    curation.curate(extracted)
+    run = curation.curate([], workers=workers, incremental=True, resume=resume, shard_limit=shard_limit)
+    if run != None:
+        print(f"Curation run [bold]{run.run_id}[/bold]: {len(run.completed_shards)} of {len(run.shards)} shards completed")
+    print(curation.instrumentation.summary_table())
+    if metrics_file:
+        curation.instrumentation.write_prometheus(metrics_file)
     
     print(f":white_heavy_check_mark: DONE!")
 
 
+@tpr.command()
+def replay():
+    """Rebuild the database from cached OMIM API responses, without sending any request"""
+    all_mims, extracted = replay_cache()
+    print(f"[bold blue]{len(all_mims)}[/bold blue] association MIMs and [bold blue]{len(extracted)}[/bold blue] entries replayed from the cache.\n")
+    print(f":white_heavy_check_mark: DONE!")
+
+
+@tpr.command()
+def distribute(resume: str = typer.Option(None, help="Skip extraction and continue the curation run with this run id")):
+    """Run `omim` on Celery workers: one task per OMIM page and per curation shard"""
+    from api.tasks.curation import curate_associations, extract_entries
+    print(f"\n:robot:..GPAD Started on Celery workers..:robot:\n")
+
+    if resume == None:
+        get_geneMaps()
+        mims_to_fetch = what_to_update()
+        print(f"[bold red]{len(mims_to_fetch)}[/bold red] entries to be extracted from OMIM API.\n")
+        pages = extract_entries(mims_to_fetch).get()
+        extracted = [mim for page in pages for mim in page['extracted']]
+        print(f"[bold blue]{len(extracted)}[/bold blue] genes successfully extracted.\n")
+        failed = sum(page['mims'] for page in pages if page['status'] == 'failed')
+        if failed:
+            print(f"[red]{failed} entries could not be extracted, they will be extracted by the next run.[/red]")
+        if any(page['status'] == 'quota_exceeded' for page in pages):
+            print(f"[red]WARNING: Daily OMIM API request limit exceeded. Please  rerun the command tommorrow and it will safely resume.[/red]")
+
+    run, result = curate_associations(incremental=True, resume=resume)
+    if run != None:
+        print(f"Curation run [bold]{run.run_id}[/bold]: {len(run.shards)} shards")
+        print(result.get())
+    print(f":white_heavy_check_mark: DONE!")
+
+
+@tpr.command()
+def benchmark(output: Path = typer.Option(None, help="Write the results as JSON to this file"),
+              mongo_uri: str = typer.Option(None, help="URI of a mongod to run against. Defaults to mongomock"),
+              fixture: Path = typer.Option(None, help="Benchmark corpus. Defaults to the checked-in fixture"),
+              regenerate: bool = typer.Option(False, help="Generate the benchmark corpus and write it to the fixture")):
+    import json
+    from rich.table import Table
+    from api.gene_discovery import benchmark as bm
+
+    fixture = fixture or bm.FIXTURE_PATH
+    if regenerate:
+        bm.save_corpus(bm.generate_corpus(), fixture)
+    bm.connect_benchmark_db(mongo_uri)
+    bm.install_corpus(bm.load_corpus(fixture))
+    curation = Curator()
+    curation.use_corpus_store = False
+    curation.corpus_store = None
+    # Writes are not measured on mongomock
+    results = bm.curation_benchmark(curation, dry_run=mongo_uri is None)
+    results['profiles'] = bm.profile_benchmark(Curator(), bm.sample_paragraphs(curation.curated_sections, limit=0))
+
+    table = Table(title=f"Curated {results['associations']} associations in {results['seconds']:.2f}s "
+                        f"({results['associations_per_second']:.1f}/s)")
+    for column in ["Stage", "Calls", "Seconds"]:
+        table.add_column(column)
+    for stage, seconds in results['detector_seconds'].items():
+        table.add_row(stage, str(results['detector_calls'][stage]), f"{seconds:.3f}")
+    table.add_row("spaCy", "", f"{results['spacy_seconds']:.3f} ({results['spacy_share']:.0%})")
+    print(table)
+    print(f"Peak RSS: {results['peak_rss_mb']:.0f} MB")
+    table = Table(title="Parse time per detection module")
+    for column in ["Module", "Profile", "Profile (s)", "Full (s)", "Saved (s)"]:
+        table.add_column(column)
+    for module, r in results['profiles'].items():
+        table.add_row(module, r['profile'], f"{r['seconds']:.3f}", f"{r['full_seconds']:.3f}", f"{r['saved']:.3f}")
+    print(table)
+    if output:
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
 @tpr.command()
 def stat():
     # print("Analyzing OMIM's Gene Map")
@@ -113,7 +199,7 @@ def stat():
     # print("[hr]")
     
     print("Analyzing GPAD's Associations")
-    ai = AssociationInformation.objects
+    ai = Stream(AssociationInformation, ['gene_mimNumber', 'pheno_mimNumber', 'mapping_key'])
     assocs = []
     for assoc in ai:
         assocs.append((assoc.gene_mimNumber, assoc.pheno_mimNumber, assoc.mapping_key))
@@ -0,0 +1,150 @@
+"""Curation and OMIM extraction tasks
+
+A run is fanned out as a group of tasks, one per OMIM page or curation shard,
+with a chord callback that finishes it. Tasks are idempotent, so they are
+acknowledged late and retried on transient database failures. OMIM requests
+are retried by the API client only, a page that still fails or runs out of the
+daily quota is reported in the task result instead of being retried.
+"""
+import gc
+import logging
+
+from celery import chord, group
+from celery.signals import worker_init, worker_process_init
+from mongoengine import connect, disconnect
+from pymongo.errors import AutoReconnect
+
+from api.extensions import celery
+from api.gene_discovery.change_log import mark_curated
+from api.gene_discovery.curation_run import Checkpoint, load_run, pending_shards
+from api.gene_discovery.data_curation import Curator
+from api.gene_discovery.models import AssociationInformation, CurationRun, EntryChange
+from api.gene_discovery.nlp_registry import preload
+from api.gene_discovery.omim_api_extraction import extract_page
+from api.gene_discovery.omim_quota import OmimQuotaExceeded
+from api.gene_discovery.settings import MONGO_URI, OMIM_RESPONSE_LIMIT
+from api.gene_discovery.write_buffer import WriteBuffer
+
+
+_curator = None
+
+
+@worker_init.connect
+def warm_up(sender=None, **kwargs):
+    """Load the NLP pipeline once per worker, before it takes tasks.
+    Prefork children inherit it from the main process, which keeps the loaded objects frozen out of
+    the garbage collector as it forks children for as long as it runs. See `nlp_registry.frozen`.
+    """
+    preload([Curator.nlp_model])
+    if 'prefork' in str(getattr(sender, 'pool_cls', '')):
+        gc.freeze()
+
+
+@worker_process_init.connect
+def reconnect(**kwargs):
+    """Reconnect in a prefork child as pymongo clients are not fork-safe"""
+    disconnect()
+    connect(host=MONGO_URI)
+    get_curator()
+
+
+def get_curator():
+    """Curator of this process. Created on first use when no worker signal was sent, e.g. eager tasks."""
+    global _curator
+    if _curator is None:
+        _curator = Curator()
+    return _curator
+
+
+@celery.task(bind=True, acks_late=True, autoretry_for=(AutoReconnect,), retry_backoff=True, retry_jitter=True,
+             max_retries=5)
+def extract_page_task(self, mims):
+    """Extract and save a page of OMIM entries.
+    Every OMIM request uses the daily quota, so failed requests are only retried by the API client.
+    The status of the result is 'extracted', 'failed' after the client's retries or 'quota_exceeded'.
+    Entries of failed pages are extracted again by the next run.
+    """
+    try:
+        extracted = extract_page(mims)
+    except OmimQuotaExceeded as e:
+        logging.warning(e)
+        return {'status': 'quota_exceeded', 'mims': len(mims), 'extracted': []}
+    if extracted is None:
+        logging.error(f"Page of {len(mims)} entries starting at {mims[0]} is not extracted")
+        return {'status': 'failed', 'mims': len(mims), 'extracted': []}
+    return {'status': 'extracted', 'mims': len(mims), 'extracted': extracted}
+
+
+@celery.task(bind=True, acks_late=True, autoretry_for=(AutoReconnect,), retry_backoff=True, retry_jitter=True,
+             max_retries=5)
+def curate_shard_task(self, run_id, index):
+    """Curate and write a shard of a curation run. Completed shards are skipped."""
+    run = CurationRun.objects(run_id=run_id).first()
+    if run.finished != None or index in run.completed_shards:
+        return {'shard': index, 'associations': 0, 'skipped': True}
+    curator = get_curator()
+    curator.instrumentation.reset()
+    assoc_ids = curator.shard(run, index)
+    assocs = list(AssociationInformation.objects(id__in=assoc_ids).order_by('id'))
+    write_buffer = WriteBuffer(AssociationInformation, curator.write_batch_size)
+    curator.curate_chunk(assocs, detect=run.detect, write_buffer=write_buffer)
+    checkpoint = Checkpoint(run, write_buffer)
+    checkpoint.completed(index, len(assocs))
+    checkpoint.save()
+    return {'shard': index, 'associations': len(assocs), 'skipped': False,
+            'counters': curator.instrumentation.counters}
+
+
+@celery.task(acks_late=True, autoretry_for=(AutoReconnect,), retry_backoff=True, max_retries=5)
+def finish_curation_task(results, run_id):
+    """Finish a curation run when all its shards are completed"""
+    run = CurationRun.objects(run_id=run_id).first()
+    finished = Checkpoint(run).finish()
+    if finished:
+        mark_curated(list(EntryChange.objects(id__in=run.changes).only('id')))
+    counters = {}
+    for result in results:
+        for counter, n in result.get('counters', {}).items():
+            counters[counter] = counters.get(counter, 0) + n
+    return {'run_id': run_id, 'finished': finished,
+            'associations': sum(r['associations'] for r in results), 'counters': counters}
+
+
+def extract_entries(mims):
+    """Fan out the extraction of OMIM entries, one task per page
+
+    Args:
+        mims (list): MIM numbers to extract
+
+    Returns:
+        GroupResult: Result of each page, see `extract_page_task`
+    """
+    pages = [mims[i:i+OMIM_RESPONSE_LIMIT] for i in range(0, len(mims), OMIM_RESPONSE_LIMIT)]
+    return group(extract_page_task.s(page) for page in pages).apply_async()
+
+
+def curate_associations(mims=[], detect='all', force_update=False, incremental=False, resume=None):
+    """Plan or resume a curation run and fan out its pending shards
+
+    Args:
+        mims (list, optional): MIM numbers to curate. Defaults to [] (all associations).
+        detect (str, optional): Detection modules. Defaults to 'all'.
+        force_update (bool, optional): Update even if the entry is already curated. Defaults to False.
+        incremental (bool, optional): Add the entries of the uncurated change log and the uncurated associations.
+                                    Defaults to False.
+        resume (str, optional): Run id of an unfinished run to continue. Defaults to None.
+
+    Returns:
+        CurationRun: The run. None if there is nothing to curate.
+        AsyncResult: Result of `finish_curation_task`
+    """
+    if resume:
+        run = load_run(resume)
+    else:
+        run, _ = get_curator().plan(mims, force_update, detect, incremental)
+        if run is None:
+            return None, None
+        Checkpoint(run).start()
+    shards = [curate_shard_task.s(run.run_id, index) for index, _, _ in pending_shards(run)]
+    logging.info(f"Curation run {run.run_id}: {len(shards)} shards sent")
+    return run, chord(shards)(finish_curation_task.s(run.run_id))
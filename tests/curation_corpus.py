@@ -0,0 +1,110 @@
+"""Fixture corpus of OMIM entries and associations, curated with a rule based stand-in of the spaCy pipeline"""
+import datetime
+import random
+
+import numpy
+import pytest
+import spacy
+from spacy.attrs import DEP, HEAD, LEMMA, POS
+from spacy.language import Language
+
+from api.gene_discovery import data_curation, nlp_registry
+from api.gene_discovery.data_curation import Curator
+from api.gene_discovery.models import AssociationInformation, CurationRun, GeneEntry, PubmedEntry
+from api.gene_discovery.pubmed_cache import pubmed_cache
+from tests.mongo import mongo_db  # noqa: F401
+
+
+PARSED = []    # Paragraphs the parser stand-in processed, reset by `corpus`
+RECOGNIZED = []    # Paragraphs the entity recognizer stand-in processed
+NOUNS = {"patient", "family", "families", "patients", "individuals", "individual"}
+ADJS = {"unrelated", "affected"}
+
+
+@Language.component("rule_parser")
+def rule_parser(doc):
+    """Stand-in of the statistical parser: counts and modifiers attach to the next cohort noun of the sentence"""
+    PARSED.append(doc.text)
+    heads, deps, pos, lemmas = [], [], [], []
+    for i, token in enumerate(doc):
+        lower = token.lower_
+        tag = "NUM" if token.like_num else "ADJ" if lower in ADJS else "NOUN" if lower in NOUNS else "X"
+        head, dep = i, "ROOT"
+        if tag in ("NUM", "ADJ"):
+            for k in range(i + 1, min(len(doc), i + 3)):
+                if doc[k].lower_ in NOUNS:
+                    head, dep = k, {"NUM": "nummod", "ADJ": "amod"}[tag]
+                    break
+        heads.append((head - i) % 2**64)
+        deps.append(doc.vocab.strings.add(dep))
+        pos.append(doc.vocab.strings.add(tag))
+        lemmas.append(doc.vocab.strings.add("family" if lower == "families" else lower.rstrip("s")))
+    doc.from_array([HEAD, DEP, POS, LEMMA], numpy.array([heads, deps, pos, lemmas], dtype="uint64").T)
+    return doc
+
+
+@Language.component("entity_recorder")
+def entity_recorder(doc):
+    """Stand-in of the entity recognizer, recognizes nothing"""
+    RECOGNIZED.append(doc.text)
+    return doc
+
+
+def build_corpus(rng, genes=6):
+    """Genes with allelic variants and phenotypes with cited molecular genetics and animal model sections"""
+    pmid = 1000
+    authors = ["Smith", "Lee", "Garcia", "Chen", "Olsen", "Yoo", "Tarui", "Fischer"]
+    for g in range(genes):
+        gene_mim, symbol = 600000 + g, f"GEN{g}"
+        phenos = [200000 + 10 * g + k for k in range(rng.randint(1, 3))]
+        refs = [{"reference": {"referenceNumber": r, "pubmedID": pmid + r, "authors": authors[r]}} for r in range(1, 6)]
+        cite = lambda: f"{{{(r := rng.randint(1, 5))}:{authors[r]} et al. ({rng.randint(1980, 2020)})}}"
+        GeneEntry(mimNumber=gene_mim, prefix="*", epochUpdated=1, mtgUpdated=datetime.datetime(2022, 1, 1),
+                  geneMap={"geneSymbols": symbol, "approvedGeneSymbols": symbol, "phenotypeMapList": [
+                      {"phenotypeMap": {"phenotype": f"Disorder {p}", "phenotypeMimNumber": p, "phenotypeMappingKey": 3,
+                                        "phenotypeInheritance": "Autosomal recessive"}} for p in phenos]},
+                  allelicVariantList=[{"allelicVariant": {"number": 1, "text": f"In {rng.randint(2, 9)} unrelated "
+                                                          f"patients with disorder ({phenos[0]}), {cite()} found it."}}],
+                  referenceList=refs).save()
+        for p in phenos:
+            paragraphs = [f"{cite()} reported {rng.randint(2, 9)} unrelated patients. In {rng.randint(2, 9)} affected "
+                          f"families, {cite()} identified mutations in the {symbol} gene ({gene_mim}). {cite()} studied mice."
+                          for _ in range(rng.randint(1, 3))]
+            GeneEntry(mimNumber=p, prefix="#", epochUpdated=1, mtgUpdated=datetime.datetime(2022, 1, 1), referenceList=refs,
+                      textSectionList=[{"textSection": {"textSectionName": "molecularGenetics",
+                                                        "textSectionContent": "\n\n".join(paragraphs)}}]).save()
+            AssociationInformation(gene_mimNumber=gene_mim, pheno_mimNumber=p, mapping_key=3).save()
+        for r in range(1, 6):
+            PubmedEntry(pmid=pmid + r, journal_name="J", pub_date=datetime.datetime(1980 + r, 1, 1),
+                        pub_year=str(1980 + r)).save()
+        pmid += 10
+
+
+def curated():
+    results = []
+    for assoc in AssociationInformation.objects.order_by("id"):
+        values = assoc.to_mongo().to_dict()
+        values.pop("gpad_updated", None)
+        results.append(values)
+    return results
+
+
+@pytest.fixture
+def corpus(mongo_db, monkeypatch):
+    """Fixture corpus curated with a rule based pipeline. Workers keep the in-memory database of the parent.
+    Returns the pipeline."""
+    nlp = spacy.blank("en")
+    nlp.add_pipe("rule_parser")
+    nlp.add_pipe("entity_recorder", name="ner")
+    monkeypatch.setitem(nlp_registry._pipelines, Curator.nlp_model, nlp)
+    monkeypatch.setattr(data_curation, "connect", lambda **kwargs: None)
+    monkeypatch.setattr(data_curation, "disconnect", lambda *args: None)
+    monkeypatch.setattr(Curator, "use_corpus_store", False)
+    for document in (GeneEntry, AssociationInformation, PubmedEntry, CurationRun):
+        document.drop_collection()
+    pubmed_cache.clear()
+    build_corpus(random.Random(1))
+    PARSED.clear()
+    RECOGNIZED.clear()
+    yield nlp
+    pubmed_cache.clear()
@@ -0,0 +1,33 @@
+import mongomock
+import pytest
+from mongoengine import connect, disconnect
+from pymongo import InsertOne, UpdateOne
+from pymongo.results import BulkWriteResult
+
+
+def _bulk_write(self, requests, ordered=True, **kwargs):
+    """bulk_write of mongomock in terms of single writes, mongomock's own does not work with recent pymongo"""
+    matched = modified = inserted = 0
+    upserted = []
+    for index, request in enumerate(requests):
+        if isinstance(request, UpdateOne):
+            result = self.update_one(request._filter, request._doc, upsert=request._upsert)
+            matched += result.matched_count
+            modified += result.modified_count
+            if result.upserted_id is not None:
+                upserted.append({"index": index, "_id": result.upserted_id})
+        elif isinstance(request, InsertOne):
+            self.insert_one(request._doc)
+            inserted += 1
+    return BulkWriteResult({"nMatched": matched, "nModified": modified, "nInserted": inserted,
+                            "nUpserted": len(upserted), "upserted": upserted}, True)
+
+
+@pytest.fixture
+def mongo_db(monkeypatch):
+    """gene_discovery models on an in-memory mongomock database"""
+    monkeypatch.setattr(mongomock.collection.Collection, "bulk_write", _bulk_write)
+    disconnect()
+    connect(db="gpad_test", host="mongodb://localhost", mongo_client_class=mongomock.MongoClient)
+    yield
+    disconnect()
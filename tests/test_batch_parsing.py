@@ -0,0 +1,34 @@
+from api.gene_discovery.data_curation import Curator
+from api.gene_discovery.models import AssociationInformation
+from tests.curation_corpus import PARSED, corpus, curated  # noqa: F401
+from tests.mongo import mongo_db  # noqa: F401
+
+
+def test_paragraphs_are_parsed_once_per_chunk(corpus, monkeypatch):
+    batches = []
+    pipe = corpus.pipe
+
+    def recording_pipe(texts, **kwargs):
+        batches.append(list(texts))
+        return pipe(batches[-1], **kwargs)
+
+    monkeypatch.setattr(corpus, "pipe", recording_pipe)
+    curator = Curator()
+    curator.shard_size = curator.chunk_size = 5
+    curator.curate([], force_update=True)
+
+    assert len(PARSED) == len(set(PARSED)) == sum(len(batch) for batch in batches)
+    assert len(batches) == len(range(0, AssociationInformation.objects.count(), 5))
+
+
+def test_batched_parsing_matches_parsing_per_association(corpus):
+    curator = Curator()
+    curator.chunk_size = 100
+    curator.curate([], force_update=True)
+    batched = curated()
+
+    curator = Curator()
+    for assoc in AssociationInformation.objects.order_by("id"):
+        curator.process(assoc)
+
+    assert curated() == batched
@@ -0,0 +1,57 @@
+import pytest
+import spacy
+from spacy.tokens import DocBin
+
+from api.gene_discovery.data_curation import Curator
+from api.gene_discovery.models import GeneEntry, ParsedSection
+from tests.mongo import mongo_db  # noqa: F401
+
+
+def entry(*paragraphs):
+    return GeneEntry(mimNumber=100100, epochUpdated=3, textSectionList=[{"textSection": {
+        "textSectionName": "molecularGenetics", "textSectionContent": "\n\n".join(paragraphs)}}])
+
+
+@pytest.fixture
+def curator(mongo_db):
+    """Curator parsing with a blank pipeline and storing parsed sections in the database"""
+    ParsedSection.drop_collection()
+    curator = Curator()
+    curator.nlp = spacy.blank("en")
+    yield curator
+    ParsedSection.drop_collection()
+
+
+def stored_paragraphs(vocab):
+    return {section.section: [doc.text for doc in DocBin().from_bytes(section.docbin).get_docs(vocab)]
+            for section in ParsedSection.objects}
+
+
+def test_complete_section_is_stored(curator):
+    curator.preparse([entry("Two unrelated families were reported.", "A mouse model was made.")])
+
+    assert stored_paragraphs(curator.nlp.vocab) == {
+        "molecularGenetics": ["Two unrelated families were reported.", "A mouse model was made."]}
+
+
+def test_dry_run_stores_nothing(curator):
+    curator.preparse([entry("Two unrelated families were reported.")], save_parsed=False)
+
+    assert ParsedSection.objects.count() == 0
+
+
+def test_partial_section_does_not_replace_stored_one(curator):
+    """A paragraph skipped by the lexical gate is not parsed, so the section is not stored without it"""
+    curator.preparse([entry("Two unrelated families were reported.", "Expression was reduced.")])
+
+    assert ParsedSection.objects.count() == 0
+
+
+def test_section_is_completed_from_parsed_paragraphs(curator):
+    """Paragraphs already parsed by an earlier chunk are stored along with the new ones"""
+    curator.preparse([entry("A mouse model was made.")])
+    ParsedSection.drop_collection()
+    curator.preparse([entry("A mouse model was made.", "Two unrelated families were reported.")])
+
+    assert stored_paragraphs(curator.nlp.vocab) == {
+        "molecularGenetics": ["A mouse model was made.", "Two unrelated families were reported."]}
@@ -0,0 +1,64 @@
+import pytest
+
+from api.gene_discovery.curation_run import Checkpoint, load_run, new_run, pending_shards
+from api.gene_discovery.models import AssociationInformation, CurationRun
+from api.gene_discovery.write_buffer import WriteBuffer
+from tests.mongo import mongo_db  # noqa: F401
+
+
+@pytest.fixture
+def run(mongo_db):
+    CurationRun.drop_collection()
+    AssociationInformation.drop_collection()
+    ids = [AssociationInformation(gene_mimNumber=1, pheno_mimNumber=i).save().id for i in range(7)]
+    yield new_run(reversed(ids), shard_size=3, mims=[1])
+    CurationRun.drop_collection()
+    AssociationInformation.drop_collection()
+
+
+def test_shards_are_consecutive_id_ranges(run):
+    ids = sorted(a.id for a in AssociationInformation.objects)
+
+    assert run.shards == [[ids[0], ids[2]], [ids[3], ids[5]], [ids[6], ids[6]]]
+    assert [shard[0] for shard in pending_shards(run)] == [0, 1, 2]
+
+
+def test_resume_skips_checkpointed_shards(run):
+    """Shards completed after the last checkpoint are curated again by the resumed run"""
+    buffer = WriteBuffer(AssociationInformation)
+    checkpoint = Checkpoint(run, buffer, interval=3)
+    checkpoint.start()
+    buffer.add(run.shards[0][0], {"total_cohort_size": 1})
+    checkpoint.completed(0, 3)
+    buffer.add(run.shards[1][0], {"total_cohort_size": 2})
+    checkpoint.completed(1, 2)
+    # Killed before the next checkpoint
+
+    resumed = load_run(run.run_id)
+    assert resumed.completed_shards == [0]
+    assert resumed.last_id == run.shards[0][1]
+    assert resumed.counters == {"associations": 3, "shards": 1, "written": 1}
+    assert [shard[0] for shard in pending_shards(resumed)] == [1, 2]
+    # The checkpoint is recorded only after the curated associations of its shards are written
+    assert AssociationInformation.objects(total_cohort_size=1).count() == 1
+    assert AssociationInformation.objects(total_cohort_size=2).count() == 0
+
+    checkpoint = Checkpoint(resumed, WriteBuffer(AssociationInformation), interval=3)
+    checkpoint.completed(1, 3)
+    assert not checkpoint.finish()
+    checkpoint.completed(2, 1)
+    assert checkpoint.finish()
+    with pytest.raises(ValueError):
+        load_run(run.run_id)
+
+
+def test_disabled_checkpoint_records_nothing(run):
+    checkpoint = Checkpoint(run, enabled=False)
+    checkpoint.start()
+    for shard in range(3):
+        checkpoint.completed(shard, 3)
+
+    assert checkpoint.finish()
+    assert CurationRun.objects.count() == 0
+    with pytest.raises(ValueError):
+        load_run(run.run_id)
@@ -0,0 +1,78 @@
+import pytest
+import requests
+from bson import ObjectId
+
+from api.gene_discovery.curation_run import new_run
+from api.gene_discovery.models import CurationRun, EntryChange, OmimQuota
+from api.gene_discovery.omim_api_extraction import get_omim_api
+from api.gene_discovery.omim_quota import quota_ledger
+from api.tasks.curation import curate_shard_task, extract_page_task, finish_curation_task
+from tests.mongo import mongo_db  # noqa: F401
+
+
+@pytest.fixture
+def curation_run(mongo_db):
+    change = EntryChange(mimNumber=600000, epochUpdated=2).save()
+    run = new_run([ObjectId() for _ in range(4)], shard_size=2, mims=[600000], changes=[change.id])
+    run.save()
+    return run
+
+
+def test_completed_shard_is_skipped(curation_run):
+    """A retried or redelivered shard task must not curate its shard again"""
+    curation_run.update(add_to_set__completed_shards=[0])
+    res = curate_shard_task.apply(args=(curation_run.run_id, 0))
+    assert res.get() == {"shard": 0, "associations": 0, "skipped": True}
+
+
+def test_finish_curation(curation_run):
+    """A run is finished and its changes are curated once all shards are completed"""
+    results = [{"shard": 0, "associations": 2, "skipped": False, "counters": {"paragraphs_parsed": 3}}]
+    curation_run.update(add_to_set__completed_shards=[0])
+    assert finish_curation_task.apply(args=(results, curation_run.run_id)).get()["finished"] is False
+
+    curation_run.update(add_to_set__completed_shards=[1])
+    res = finish_curation_task.apply(args=(results, curation_run.run_id)).get()
+    assert res == {"run_id": curation_run.run_id, "finished": True, "associations": 2,
+                   "counters": {"paragraphs_parsed": 3}}
+    assert CurationRun.objects(run_id=curation_run.run_id).first().finished is not None
+    assert EntryChange.objects(curated=None).count() == 0
+
+
+@pytest.fixture
+def unavailable_omim(mongo_db, monkeypatch):
+    """OMIM API answering every request with 503, retried without backoff. Returns the sent requests."""
+    sent = []
+
+    def request(method, url, **kwargs):
+        sent.append(url)
+        response = requests.Response()
+        response.status_code = 503
+        response._content = b"{}"
+        return response
+
+    OmimQuota.drop_collection()
+    omim_api = get_omim_api()
+    monkeypatch.setattr(omim_api.client.session, "request", request)
+    monkeypatch.setattr(omim_api.client, "backoff", 0)
+    monkeypatch.setattr(omim_api, "cache", None)
+    monkeypatch.setattr(quota_ledger, "daily_limit", 100)
+    return sent
+
+
+def test_failed_page_is_retried_by_the_client_only(unavailable_omim):
+    """A failing page uses the quota of the client's retries once and is reported as failed"""
+    res = extract_page_task.apply(args=([600001, 600002],)).get()
+
+    assert res == {"status": "failed", "mims": 2, "extracted": []}
+    assert len(unavailable_omim) == get_omim_api().client.max_retries + 1
+    assert quota_ledger.used() == len(unavailable_omim)
+
+
+def test_quota_exhaustion_is_reported(unavailable_omim, monkeypatch):
+    """A page without quota is reported instead of failing the group, no request is sent"""
+    monkeypatch.setattr(quota_ledger, "daily_limit", 0)
+    res = extract_page_task.apply(args=([600001, 600002],)).get()
+
+    assert res == {"status": "quota_exceeded", "mims": 2, "extracted": []}
+    assert unavailable_omim == []
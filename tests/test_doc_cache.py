@@ -0,0 +1,76 @@
+import gc
+
+import pytest
+import spacy
+
+from api.gene_discovery.doc_cache import DocCache
+
+
+@pytest.fixture
+def nlp():
+    return spacy.blank("en")
+
+
+def spilled(cache):
+    return sorted(path.name for path in cache.spill_dir.glob("*.spacy"))
+
+
+def test_least_recently_used_doc_is_evicted(nlp):
+    cache = DocCache(nlp.vocab, max_size=2)
+    for text in ["first", "second"]:
+        cache.put(text, nlp(text))
+    cache.get("first")
+    cache.put("third", nlp("third"))
+
+    assert "first" in cache and "third" in cache and "second" not in cache
+    assert cache.get("second") is None
+    assert cache.stats()["evictions"] == 1 and cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_docs_are_served_to_the_profiles_they_cover(nlp):
+    """A 'full' Doc serves every profile, a 'syntax' Doc does not serve a 'full' request"""
+    cache = DocCache(nlp.vocab)
+    full, syntax = nlp("full text"), nlp("syntax text")
+    cache.put("full text", full)
+    cache.put("syntax text", syntax, "syntax")
+
+    assert cache.get("full text", ("syntax", "full")) is full
+    assert cache.get("syntax text", ("syntax", "full")) is syntax
+    assert cache.get("syntax text") is None
+    assert not cache.contains("syntax text") and cache.contains("syntax text", ("syntax",))
+    # A larger profile is preferred in the given order
+    cache.put("syntax text", full, "full")
+    assert cache.get("syntax text", ("full", "syntax")) is full
+
+
+def test_spilled_docs_are_removed_when_loaded_again(nlp, tmp_path):
+    cache = DocCache(nlp.vocab, max_size=1, spill_dir=tmp_path)
+    cache.put("first", nlp("first"))
+    cache.put("second", nlp("second"))
+    assert spilled(cache) == [f"{DocCache.key('first')}.spacy"]
+
+    assert cache.get("first").text == "first"
+    assert spilled(cache) == [f"{DocCache.key('second')}.spacy"]
+    assert cache.stats()["spill_hits"] == 1
+
+
+def test_clear_removes_spilled_docs(nlp, tmp_path):
+    cache = DocCache(nlp.vocab, max_size=1, spill_dir=tmp_path)
+    for text in ["first", "second", "third"]:
+        cache.put(text, nlp(text))
+    cache.clear()
+
+    assert len(cache) == 0 and spilled(cache) == []
+    assert cache.get("first") is None
+
+
+def test_spill_dir_is_removed_with_the_cache(nlp, tmp_path):
+    cache = DocCache(nlp.vocab, max_size=1, spill_dir=tmp_path)
+    cache.put("first", nlp("first"))
+    cache.put("second", nlp("second"))
+    spill_dir = cache.spill_dir
+    assert spill_dir.parent == tmp_path
+
+    del cache
+    gc.collect()
+    assert not spill_dir.exists()
@@ -0,0 +1,65 @@
+import datetime
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from api.gene_discovery.models import AssociationInformation
+from api.gene_discovery import omim_api_extraction
+from api.gene_discovery.omim_api_extraction import dedupe_associations, ensure_association_index, save_gene_maps
+from tests.mongo import mongo_db  # noqa: F401
+
+
+def gene_map(gene, phenos):
+    return {"geneMap": {"mimNumber": gene, "geneSymbols": f"G{gene}", "phenotypeMapList": [
+        {"phenotypeMap": {"phenotypeMimNumber": pheno, "phenotype": f"P{pheno}", "phenotypeMappingKey": 3}}
+        for pheno in phenos]}}
+
+
+@pytest.fixture
+def associations(mongo_db):
+    AssociationInformation.drop_collection()
+    collection = AssociationInformation._get_collection()
+    collection.insert_many([
+        {"gene_mimNumber": 1, "pheno_mimNumber": 10, "gpad_created": datetime.datetime(2020, 1, 1),
+         "inheritance": "AD"},
+        {"gene_mimNumber": 1, "pheno_mimNumber": 10, "gpad_created": datetime.datetime(2021, 1, 1),
+         "gpad_updated": datetime.datetime(2022, 1, 1), "evidence": {"section_title": "molecularGenetics"}},
+        {"gene_mimNumber": 2, "pheno_mimNumber": 10, "gpad_updated": datetime.datetime(2022, 1, 1)},
+    ])
+    yield collection
+    AssociationInformation.drop_collection()
+
+
+def test_duplicate_pairs_are_merged_before_indexing(associations):
+    """The most recently curated duplicate is kept with the fields it lacks, then the pair becomes unique"""
+    assert dedupe_associations() == 1
+
+    assert associations.count_documents({}) == 2
+    merged = associations.find_one({"gene_mimNumber": 1, "pheno_mimNumber": 10})
+    assert merged["evidence"] == {"section_title": "molecularGenetics"}
+    assert merged["inheritance"] == "AD"
+    assert merged["gpad_created"] == datetime.datetime(2020, 1, 1)
+    with pytest.raises(DuplicateKeyError):
+        associations.insert_one({"gene_mimNumber": 1, "pheno_mimNumber": 10})
+
+
+def test_gene_map_upserts_keep_curation_time(associations):
+    """Pleiotropic phenotypes get an association per gene, ingestion does not touch gpad_updated"""
+    dedupe_associations()
+    mims = save_gene_maps([gene_map(1, [10, 11]), gene_map(3, [10])])
+
+    assert mims == [1, 10, 11, 3, 10]
+    assert {(a.gene_mimNumber, a.pheno_mimNumber) for a in AssociationInformation.objects} == \
+        {(1, 10), (1, 11), (2, 10), (3, 10)}
+    updated = AssociationInformation.objects(gene_mimNumber=1, pheno_mimNumber=10).first()
+    assert updated.gpad_updated == datetime.datetime(2022, 1, 1)
+    assert updated.gene_map_fetched is not None
+    inserted = AssociationInformation.objects(gene_mimNumber=3, pheno_mimNumber=10).first()
+    assert inserted.gpad_created is not None and inserted.gpad_updated is None
+
+
+def test_migration_runs_until_the_pair_index_exists(associations, monkeypatch):
+    assert ensure_association_index() == 1
+
+    monkeypatch.setattr(omim_api_extraction, "dedupe_associations", lambda: pytest.fail("migrated again"))
+    assert ensure_association_index() == 0
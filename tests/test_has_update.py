@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+import pytest
+
+from api.gene_discovery import omim_api_extraction
+from api.gene_discovery.models import GeneEntry
+from api.gene_discovery.omim_api_extraction import has_update
+from tests.mongo import mongo_db  # noqa: F401
+
+
+MIMS = list(range(100000, 100250))
+
+
+@pytest.fixture
+def omim(mongo_db, monkeypatch):
+    """Stored entries at epoch 10. OMIM answers the dates of a search with `omim.epochs`, or fails with `omim.failing`."""
+    GeneEntry.drop_collection()
+    for mim in MIMS:
+        GeneEntry(mimNumber=mim, epochUpdated=10).save()
+    omim = SimpleNamespace(epochs={}, searches=[], failing=set())
+
+    def omim_request(handle, params):
+        assert handle == "entry/search" and params["include"] == "dates"
+        batch = [int(m) for m in params["search"].split(":")[1].split(",")]
+        omim.searches.append(batch)
+        if set(batch) & omim.failing:
+            return False
+        entries = []
+        for mim in batch:
+            epoch = omim.epochs.get(mim, 10)
+            # Some responses only carry dateUpdated
+            dates = {"epochUpdated": epoch} if mim % 2 else {"dateUpdated": "Thu, 01 Jan 1970 00:00:%02d UTC" % epoch}
+            entries.append({"entry": {"mimNumber": mim, **dates}})
+        return SimpleNamespace(json=lambda: {"omim": {"searchResponse": {"entryList": entries}}})
+
+    monkeypatch.setattr(omim_api_extraction, "omim_request", omim_request)
+    yield omim
+    GeneEntry.drop_collection()
+
+
+def test_updates_are_checked_in_batches(omim):
+    omim.epochs = {100001: 11, 100002: 12, 100150: 9, 100249: 30}
+
+    assert has_update(reversed(MIMS)) == [100001, 100002, 100249]
+    assert omim.searches == [MIMS[:100], MIMS[100:200], MIMS[200:]]
+
+
+def test_checking_stops_at_a_failed_request(omim):
+    omim.epochs = {100001: 11, 100249: 30}
+    omim.failing = {100150}
+
+    assert has_update([str(mim) for mim in MIMS]) == [100001]
+    assert len(omim.searches) == 2
+
+
+def test_latest_stored_version_is_compared(omim):
+    """Entries stored more than once are compared by their latest version"""
+    GeneEntry(mimNumber=100003, epochUpdated=20).save()
+    omim.epochs = {100003: 15}
+
+    assert has_update([100003]) == []
@@ -0,0 +1,68 @@
+import pytest
+import requests
+
+from api.gene_discovery import http_client
+from api.gene_discovery.http_client import ApiClient
+
+
+def response(status, headers={}):
+    r = requests.Response()
+    r.status_code = status
+    r.headers.update(headers)
+    r._content = b"{}"
+    return r
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Client answering with the scripted `client.replies` and recording its waits instead of sleeping.
+    The jitter always picks the longest wait."""
+    client = ApiClient("http://api.test", max_retries=3, backoff=0.5, max_backoff=1.5,
+                       before_request=lambda: client.attempts.append(1))
+    client.replies, client.waits, client.attempts = [], [], []
+
+    def request(method, url, **kwargs):
+        reply = client.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    monkeypatch.setattr(client.session, "request", request)
+    monkeypatch.setattr(http_client.time, "sleep", client.waits.append)
+    monkeypatch.setattr(http_client.random, "uniform", lambda low, high: high)
+    return client
+
+
+def test_throttled_and_server_errors_are_retried(client):
+    client.replies = [response(503), response(429, {"Retry-After": "7"}), response(200)]
+
+    assert client.get("entry").status_code == 200
+    assert client.waits == [0.5, 7]
+    assert len(client.attempts) == 3
+    stats = client.stats()["entry"]
+    assert (stats["requests"], stats["retries"], stats["throttled"], stats["server_errors"], stats["failed"]) == (3, 2, 1, 1, 0)
+
+
+def test_backoff_doubles_up_to_the_maximum(client):
+    client.replies = [response(500)] * 4
+
+    with pytest.raises(requests.HTTPError):
+        client.get("entry")
+    assert client.waits == [0.5, 1.0, 1.5]
+    assert client.stats()["entry"]["failed"] == 1
+
+
+def test_client_errors_are_not_retried(client):
+    client.replies = [response(404)]
+
+    with pytest.raises(requests.HTTPError):
+        client.get("entry")
+    assert client.waits == [] and len(client.attempts) == 1
+
+
+def test_connection_errors_are_retried(client):
+    client.replies = [requests.ConnectionError("reset"), requests.Timeout("slow"), response(200)]
+
+    assert client.post("esummary.fcgi", data={}).ok
+    assert client.waits == [0.5, 1.0]
+    assert client.stats()["esummary.fcgi"]["retries"] == 2
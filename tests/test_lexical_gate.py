@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+import spacy
+from spacy.tokens import Doc
+
+from api.gene_discovery.data_curation import Curator
+from api.gene_discovery.lexical_gate import LexicalGate
+
+
+FILLER = ["the", "variant", "was", "found", "in", "a", "large", "pedigree", "with", "autosomal", "dominant",
+          "disease", "and", "segregated", "heterozygous", "mutation", "linkage", "mendelian", "analysis", "of",
+          "cells", "showed", "reduced", "expression", "by", "sequencing", "exome", "phenotype", "(", ")", ",", "."]
+# Word forms an English lemmatizer reduces to the cohort lemmas
+FORMS = {"family": ["families"], "child": ["children"], "man": ["men"], "woman": ["women"],
+         "people": ["peoples"], "individual": ["individuals"], "infant": ["infants"]}
+
+
+@pytest.fixture(scope="module")
+def curator():
+    """Curator whose matchers are built on a blank vocabulary, the gates do not need a pipeline"""
+    curator = Curator()
+    curator.nlp = spacy.blank("en")
+    return curator
+
+
+def filler(rng, low, high):
+    return [str(w) for w in rng.choice(FILLER, size=rng.integers(low, high))]
+
+
+def casings(word):
+    return {word, word.lower(), word.upper(), word.capitalize()}
+
+
+def cohort_doc(vocab, rng, lemma, form, with_det):
+    """Parsed paragraph where `form` is a cohort anchor, modified by a count or an article, within filler"""
+    before = filler(rng, 0, 8)
+    after = filler(rng, 0, 8)
+    if with_det:
+        phrase, pos, deps, lemmas = ["an"], ["DET"], ["det"], ["an"]
+    else:
+        phrase, pos, deps, lemmas = ["two", "unrelated"], ["NUM", "ADJ"], ["nummod", "amod"], ["two", "unrelated"]
+    anchor = len(before) + len(phrase)
+    words = before + phrase + [form] + after
+    return Doc(vocab, words=words,
+               heads=[anchor] * len(words),
+               deps=["dep"] * len(before) + deps + ["ROOT"] + ["dep"] * len(after),
+               pos=["X"] * len(before) + pos + ["NOUN"] + ["X"] * len(after),
+               lemmas=before + lemmas + [lemma] + after)
+
+
+def test_gates_pass_every_cohort_match(curator):
+    """Every inflection of the cohort anchors, in any case, is let through to the cohort matcher"""
+    rng = np.random.default_rng(14)
+    for name, pattern in curator.cohort_pattern.items():
+        with_det = name == "cohort_with_det"
+        for lemma in pattern[0]["RIGHT_ATTRS"]["LEMMA"]["IN"]:
+            for form in {lemma, *FORMS.get(lemma, [lemma + "s"])}:
+                for cased in casings(form):
+                    doc = cohort_doc(curator.nlp.vocab, rng, lemma, cased, with_det)
+                    assert curator.cohort_matcher(doc), doc.text
+                    assert curator.cohort_gate.passes(doc.text), doc.text
+                    assert curator.parse_gate.passes(doc.text), doc.text
+
+
+def test_parse_gate_passes_every_phrase_match(curator):
+    """Randomized paragraphs: whenever an animal model or a matcher platform matches, the paragraph is parsed"""
+    rng = np.random.default_rng(14)
+    terms = curator.animal_models + curator.matcher_platform
+    matched = 0
+    for _ in range(2000):
+        words = filler(rng, 1, 30)
+        if rng.random() < 0.5:
+            term = str(rng.choice(terms))
+            words.insert(int(rng.integers(0, len(words) + 1)), str(rng.choice(sorted(casings(term)))))
+        doc = curator.nlp.make_doc(" ".join(words))
+        if curator.animal_matcher(doc) or curator.matcher_platform_matcher(doc):
+            matched += 1
+            assert curator.parse_gate.passes(doc.text), doc.text
+    assert matched > 500
+
+
+def test_gates_skip_paragraphs_without_terms(curator):
+    rng = np.random.default_rng(14)
+    for _ in range(200):
+        text = " ".join(filler(rng, 1, 30))
+        doc = curator.nlp.make_doc(text)
+        assert not curator.animal_matcher(doc) and not curator.matcher_platform_matcher(doc)
+        assert not curator.parse_gate.passes(text)
+        assert not curator.cohort_gate.passes(text)
+
+
+def test_inflections_include_irregular_forms():
+    assert LexicalGate.inflections("family") >= {"family", "families"}
+    assert LexicalGate.inflections("child") >= {"child", "children"}
+    assert LexicalGate.inflections("mouse") >= {"mouse", "mice"}
@@ -0,0 +1,125 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from api.gene_discovery import omim_api_extraction
+from api.gene_discovery.models import GeneEntry, OmimQuota
+from api.gene_discovery.omim_api_extraction import OmimApiAdapter, extract_gene_info, fetch_page, save_entries
+from api.gene_discovery.omim_quota import QuotaLedger
+from api.gene_discovery.page_fetcher import PipelinedFetcher
+from tests.mongo import mongo_db  # noqa: F401
+
+
+class StubOmim(BaseHTTPRequestHandler):
+    """OMIM API `entry` handle. Pages answer slower the earlier their MIM numbers are, so they arrive out of order.
+    Pages with a MIM number in `failing` are answered with 503."""
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    state = {}
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        mims = [int(m) for m in parse_qs(urlparse(self.path).query)["mimNumber"][0].split(",")]
+        with self.lock:
+            self.state["requests"].append(mims)
+            self.state["inflight"] += 1
+            self.state["max_inflight"] = max(self.state["max_inflight"], self.state["inflight"])
+        time.sleep(0.01 * (10 - mims[0] % 10))
+        with self.lock:
+            self.state["inflight"] -= 1
+        if set(mims) & self.state["failing"]:
+            status, body = 503, {}
+        else:
+            status, body = 200, {"omim": {"entryList": [{"entry": {
+                "mimNumber": m, "prefix": "*", "status": "live", "titles": {"preferredTitle": f"GENE {m}"},
+                "creationDate": "", "editHistory": "", "epochCreated": 1, "dateCreated": "Mon, 01 Jan 2001 00:00:00 EST",
+                "epochUpdated": 2, "dateUpdated": "Tue, 02 Jan 2001 00:00:00 EST", "textSectionList": []}} for m in mims]}}
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+@pytest.fixture
+def omim_server(mongo_db, monkeypatch):
+    """OMIM API adapter of a local stub server, without cache or retry backoff. Returns the server state."""
+    StubOmim.state = {"requests": [], "inflight": 0, "max_inflight": 0, "failing": set()}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOmim)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    GeneEntry.drop_collection()
+    OmimQuota.drop_collection()
+    ledger = QuotaLedger(daily_limit=1000)
+    adapter = OmimApiAdapter(base_url=f"http://127.0.0.1:{server.server_port}", api_key=None, ledger=ledger,
+                             cache_mode="off")
+    adapter.client.backoff = 0
+    monkeypatch.setattr(omim_api_extraction, "_omim_api", adapter)
+    monkeypatch.setattr(omim_api_extraction, "quota_ledger", ledger)
+    monkeypatch.setattr(omim_api_extraction, "OMIM_RESPONSE_LIMIT", 2)
+    StubOmim.state["ledger"] = ledger
+    yield StubOmim.state
+    server.shutdown()
+    server.server_close()
+
+
+MIMS = list(range(100000, 100010))  # 5 pages
+
+
+def pages(mims):
+    return [mims[i:i + 2] for i in range(0, len(mims), 2)]
+
+
+def saved_mims():
+    return {e.mimNumber for e in GeneEntry.objects.only("mimNumber")}
+
+
+def test_pages_arriving_out_of_order_are_saved_in_order(omim_server):
+    extracted = extract_gene_info(MIMS, concurrency=3)
+
+    assert extracted == MIMS
+    assert saved_mims() == set(MIMS)
+    assert sorted(m for page in omim_server["requests"] for m in page) == MIMS
+    assert 1 < omim_server["max_inflight"] <= 3
+
+
+def test_failed_page_stops_fetching(omim_server):
+    """Pages fetched before the failure are saved, the failed page and the ones after it are counted unfetched"""
+    omim_server["failing"] = {100002}
+    fetcher = PipelinedFetcher(fetch_page, save_entries, concurrency=1)
+    extracted = fetcher.run(pages(MIMS))
+
+    assert extracted == [100000, 100001]
+    assert saved_mims() == {100000, 100001}
+    assert fetcher.unfetched == 4 and not fetcher.quota_exceeded
+    # Only the API client retries the failed page, the pages after it are not requested
+    retries = omim_api_extraction.get_omim_api().client.max_retries
+    assert omim_server["requests"] == [[100000, 100001]] + [[100002, 100003]] * (retries + 1)
+
+
+def test_pages_after_a_failed_page_are_not_saved(omim_server):
+    """Pages fetched concurrently after the failed page are dropped, so the result does not depend on timing"""
+    omim_server["failing"] = {100002}
+    fetcher = PipelinedFetcher(fetch_page, save_entries, concurrency=3)
+    extracted = fetcher.run(pages(MIMS))
+
+    assert extracted == [100000, 100001]
+    assert saved_mims() == {100000, 100001}
+    assert fetcher.unfetched == 4
+
+
+def test_quota_exhaustion_stops_fetching(omim_server):
+    omim_server["ledger"].daily_limit = 2
+    fetcher = PipelinedFetcher(fetch_page, save_entries, concurrency=1)
+    extracted = fetcher.run(pages(MIMS))
+
+    assert extracted == MIMS[:4]
+    assert saved_mims() == set(MIMS[:4])
+    assert fetcher.quota_exceeded and fetcher.unfetched == 3
+    assert len(omim_server["requests"]) == omim_server["ledger"].used() == 2
@@ -0,0 +1,20 @@
+from api.gene_discovery.data_curation import Curator
+from api.gene_discovery.models import AssociationInformation
+from tests.curation_corpus import corpus, curated  # noqa: F401
+from tests.mongo import mongo_db  # noqa: F401
+
+
+def test_parallel_curation_matches_serial(corpus):
+    curator = Curator()
+    curator.shard_size = 3
+    curator.curate([], force_update=True, workers=1)
+    serial = curated()
+    assert any("evidence" in values for values in serial) and any("cohort" in values for values in serial)
+
+    AssociationInformation.objects.update(unset__evidence=1, unset__cohort=1, unset__all_cohorts=1,
+                                          unset__animal_model=1, unset__total_cohort_size=1)
+    curator = Curator()
+    curator.shard_size = 3
+    curator.curate([], force_update=True, workers=2)
+
+    assert curated() == serial
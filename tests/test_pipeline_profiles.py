@@ -0,0 +1,35 @@
+from api.gene_discovery.data_curation import Curator
+from tests.curation_corpus import PARSED, RECOGNIZED, corpus  # noqa: F401
+from tests.mongo import mongo_db  # noqa: F401
+
+
+def test_detect_profile_is_the_largest_one_needed():
+    curator = Curator()
+
+    assert curator.detect_profile(["basic"]) == "tokens"
+    assert curator.detect_profile(["basic", "association", "animal"]) == "syntax"
+    assert curator.detect_profile(["animal", "cohort"]) == "full"
+    assert curator.detect_profile() == "full"
+
+
+def test_entities_are_recognized_only_for_the_cohort_detector(corpus):
+    curator = Curator()
+    curator.curate([], force_update=True, detect=["basic"], dry_run=True)
+    assert RECOGNIZED == []
+
+    curator.curate([], force_update=True, detect=["association", "animal"], dry_run=True)
+    assert PARSED and RECOGNIZED == []
+
+    # 'syntax' Docs do not serve the cohort detector, the paragraphs it reads are parsed again with the entities
+    parsed = len(PARSED)
+    curator.curate([], force_update=True, detect=["cohort"], dry_run=True)
+    assert RECOGNIZED and len(PARSED) == parsed + len(RECOGNIZED)
+
+
+def test_full_docs_serve_the_smaller_profiles(corpus):
+    curator = Curator()
+    curator.curate([], force_update=True, dry_run=True)
+    parsed = len(PARSED)
+
+    curator.curate([], force_update=True, detect=["association", "animal"], dry_run=True)
+    assert len(PARSED) == parsed
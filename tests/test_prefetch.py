@@ -0,0 +1,34 @@
+import datetime
+
+from api.gene_discovery.data_curation import Curator
+from api.gene_discovery.models import AssociationInformation, GeneEntry
+from tests.curation_corpus import corpus, curated  # noqa: F401
+from tests.mongo import mongo_db  # noqa: F401
+
+
+def test_entries_of_a_chunk_are_fetched_once(corpus):
+    """Gene and phenotype entries of the chunk, the latest stored one of duplicated entries, curated fields only"""
+    GeneEntry(mimNumber=600000, epochUpdated=2, mtgUpdated=datetime.datetime(2023, 1, 1),
+              titles={"preferredTitle": "GENE"}).save()
+    assocs = list(AssociationInformation.objects(gene_mimNumber__in=[600000, 600001]))
+
+    entries = Curator().prefetch_entries(assocs)
+
+    assert set(entries) == {a.gene_mimNumber for a in assocs} | {a.pheno_mimNumber for a in assocs}
+    assert entries[600000].epochUpdated == 2
+    assert not entries[600000].titles and entries[600001].geneMap
+
+
+def test_chunk_curation_matches_curation_per_association(corpus):
+    """Associations curated with prefetched entries get the same values as ones querying their entries"""
+    curator = Curator()
+    for assoc in AssociationInformation.objects.order_by("id"):
+        curator.process(assoc)
+    queried = curated()
+
+    AssociationInformation.objects.update(unset__evidence=1, unset__cohort=1, unset__all_cohorts=1,
+                                          unset__animal_model=1, unset__total_cohort_size=1)
+    curator = Curator()
+    curator.curate_chunk(list(AssociationInformation.objects.order_by("id")))
+
+    assert curated() == queried
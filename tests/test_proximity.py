@@ -0,0 +1,41 @@
+import numpy as np
+
+from api.gene_discovery.proximity import NONE, enclosing, nearest, offsets_array
+
+
+INF = 1e10
+
+
+def baseline_nearest(offsets, anchor):
+    """The loop `nearest` replaced: the nearest preceding offset, else the first following one. Ties keep the first."""
+    nearest_index = NONE
+    lowest_distance = INF
+    for index, start in enumerate(offsets):
+        distance = INF
+        if start < anchor:
+            distance = anchor - start
+        elif nearest_index == NONE and start > anchor:
+            distance = start - anchor
+        if distance < lowest_distance:
+            nearest_index = index
+            lowest_distance = distance
+    return nearest_index
+
+
+def test_nearest_matches_baseline_loop():
+    """Randomized offsets with duplicates, anchors on, between and outside the offsets"""
+    rng = np.random.default_rng(12)
+    for _ in range(2000):
+        offsets = sorted(rng.integers(0, 60, size=rng.integers(0, 12)).tolist())
+        anchors = rng.integers(-5, 70, size=rng.integers(1, 8)).tolist()
+        expected = [baseline_nearest(offsets, anchor) for anchor in anchors]
+        assert nearest(offsets_array(offsets), anchors).tolist() == expected, (offsets, anchors)
+
+
+def test_enclosing_matches_linear_scan():
+    rng = np.random.default_rng(7)
+    for _ in range(500):
+        bounds = sorted(set(rng.integers(0, 100, size=rng.integers(1, 10)).tolist()))
+        positions = rng.integers(-5, 110, size=5).tolist()
+        expected = [max([i for i, start in enumerate(bounds) if start <= p], default=NONE) for p in positions]
+        assert enclosing(offsets_array(bounds), positions).tolist() == expected
@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+
+import pytest
+
+from api.gene_discovery.models import PubmedEntry
+from api.gene_discovery.pubmed_cache import pubmed_cache
+from api.gene_discovery.pubmed_resolver import PubmedResolver
+from tests.mongo import mongo_db  # noqa: F401
+
+
+ESUMMARY_REPLY = b"""<?xml version="1.0" encoding="UTF-8" ?>
+<!DOCTYPE eSummaryResult PUBLIC "-//NLM//DTD esummary v1 20041029//EN" "https://eutils.ncbi.nlm.nih.gov/eutils/dtd/20041029/esummary-v1.dtd">
+<eSummaryResult>
+<DocSum>
+    <Id>11111</Id>
+    <Item Name="PubDate" Type="Date">1999 Jun 12</Item>
+    <Item Name="EPubDate" Type="Date"></Item>
+    <Item Name="FullJournalName" Type="String">Journal of Tests</Item>
+</DocSum>
+<DocSum>
+    <Id>22222</Id>
+    <Item Name="error" Type="String">cannot get document summary</Item>
+</DocSum>
+<ERROR>Invalid uid 33333 at position=2</ERROR>
+</eSummaryResult>
+"""
+
+
+@pytest.fixture
+def resolver(mongo_db):
+    """Resolver whose esummary requests are answered with ESUMMARY_REPLY and counted"""
+    pubmed_cache.clear()
+    resolver = PubmedResolver(rate=1000)
+    resolver.requests = []
+
+    def post(endpoint, data=None, **kwargs):
+        resolver.requests.append(data["id"])
+        return SimpleNamespace(content=ESUMMARY_REPLY)
+
+    resolver.client.post = post
+    yield resolver
+    pubmed_cache.clear()
+
+
+def test_esummary_errors_do_not_drop_batch(resolver):
+    """Invalid PMIDs and DocSums with an error item are not found, the other PMIDs of the batch are resolved"""
+    resolver.add([11111, 22222, 33333])
+    resolved = resolver.resolve()
+
+    assert list(resolved) == [11111]
+    assert resolved[11111].pub_year == "1999"
+    assert resolved[11111].journal_name == "Journal of Tests"
+    assert PubmedEntry.objects(pmid=11111, not_found=None).count() == 1
+    assert {pe.pmid for pe in PubmedEntry.objects(not_found__ne=None)} == {22222, 33333}
+    assert pubmed_cache.is_missing(22222) and pubmed_cache.is_missing(33333)
+
+
+def test_missing_pmid_is_requested_once(resolver):
+    """A PMID NCBI reports as invalid is not requested again, neither in the next chunk nor in the next run"""
+    resolver.add([33333])
+    assert resolver.resolve() == {}
+    resolver.add([33333])
+    assert resolver.resolve() == {}
+
+    # Next run: the process cache is empty, the not found stub is read from the database
+    pubmed_cache.clear()
+    resolver.add([33333])
+    assert resolver.resolve() == {}
+
+    assert resolver.requests == ["33333"]
+
+
+def test_fixture_records_are_not_stored(mongo_db, tmp_path):
+    """Benchmark fixtures resolve PMIDs in the process only, a PMID missing in the fixture is not marked missing"""
+    pubmed_cache.clear()
+    fixture = tmp_path / "esummary.json"
+    fixture.write_text('{"11111": {"Id": "11111", "PubDate": "1999 Jun 12", "EPubDate": "", "FullJournalName": "J"}}')
+    resolver = PubmedResolver(fixture=fixture, rate=1000)
+    resolver.add([11111, 44444])
+
+    assert list(resolver.resolve()) == [11111]
+    assert PubmedEntry.objects.count() == 0
+    pubmed_cache.clear()
@@ -0,0 +1,36 @@
+from api.gene_discovery import data_curation
+from api.gene_discovery.data_curation import Curator
+from api.gene_discovery.models import AssociationInformation, GeneEntry
+from tests.curation_corpus import corpus  # noqa: F401
+from tests.mongo import mongo_db  # noqa: F401
+
+
+def test_reference_index_is_built_once_per_entry_version(corpus):
+    curator = Curator()
+    entry = GeneEntry.objects(mimNumber=600000).first()
+    index = curator.reference_index(entry)
+
+    assert index[2] == (1002, "Garcia", None)
+    assert curator.reference_index(entry) is index
+    entry.epochUpdated += 1
+    entry.referenceList = entry.referenceList[:1]
+    assert curator.reference_index(entry) == {1: (1001, "Lee", None)}
+
+
+def test_publications_are_built_once_per_association(corpus, monkeypatch):
+    """A citation matched by several detectors is built into a publication and looked up once"""
+    matches, lookups = [], []
+    create = Curator._Curator__create_publication_object_from_match
+    monkeypatch.setattr(Curator, "_Curator__create_publication_object_from_match",
+                        lambda self, *args, **kwargs: matches.append(1) or create(self, *args, **kwargs))
+    get = data_curation.pubmed_cache.get
+    monkeypatch.setattr(data_curation.pubmed_cache, "get", lambda pmid, **kwargs: lookups.append(pmid) or get(pmid, **kwargs))
+    curator = Curator()
+    looked_up = 0
+    for assoc in AssociationInformation.objects.order_by("id"):
+        lookups.clear()
+        curator.process(assoc)
+        assert len(lookups) == len([pub for pub in curator.publications.values() if pub.pmid])
+        looked_up += len(lookups)
+
+    assert len(matches) > looked_up > 0
@@ -0,0 +1,39 @@
+import pytest
+
+from api.gene_discovery.models import GeneEntry
+from api.gene_discovery.streaming import Stream
+from tests.mongo import mongo_db  # noqa: F401
+
+
+FIELDS = ["id", "mimNumber", "prefix", "epochUpdated", "geneMap"]
+
+
+@pytest.fixture
+def entries(mongo_db):
+    GeneEntry.drop_collection()
+    for mim in [300, 100, 200]:
+        GeneEntry(mimNumber=mim, prefix="*" if mim != 200 else None, epochUpdated=mim + 1,
+                  geneMap={"geneSymbols": f"G{mim}"}, textSectionList=[{"textSection": {}}]).save()
+    yield
+    GeneEntry.drop_collection()
+
+
+def test_records_match_documents(entries):
+    records = list(Stream(GeneEntry, FIELDS, sort=[("mimNumber", 1)]))
+    documents = list(GeneEntry.objects.order_by("mimNumber"))
+
+    assert [r.mimNumber for r in records] == [100, 200, 300]
+    for record, document in zip(records, documents):
+        for field in FIELDS:
+            assert getattr(record, field) == getattr(document, field) == record[field]
+    assert "geneMap" in records[0] and "prefix" not in records[1]
+    # Fields left out of the projection are not read
+    assert not hasattr(records[0], "textSectionList")
+
+
+def test_query_and_raw_documents(entries):
+    stream = Stream(GeneEntry, query={"mimNumber": {"$gte": 200}}, batch_size=1)
+
+    assert len(stream) == 2
+    assert sorted(son["mimNumber"] for son in stream) == [200, 300]
+    assert all("textSectionList" in son for son in stream)
@@ -0,0 +1,49 @@
+import pytest
+
+from api.gene_discovery.models import AssociationInformation, CohortDescription
+from api.gene_discovery.write_buffer import WriteBuffer
+from tests.mongo import mongo_db  # noqa: F401
+
+
+@pytest.fixture
+def associations(mongo_db):
+    AssociationInformation.drop_collection()
+    assocs = [AssociationInformation(gene_mimNumber=1, pheno_mimNumber=10 + i, inheritance="AD").save() for i in range(5)]
+    yield assocs
+    AssociationInformation.drop_collection()
+
+
+def test_changed_values_are_the_changed_curated_fields(associations):
+    assoc = AssociationInformation.objects(pheno_mimNumber=10).first()
+    assoc.cohort = CohortDescription(cohort_count=3, cohort_type="unrelated")
+    assoc.total_cohort_size = 3
+    assoc.inheritance = "AR"
+
+    values = WriteBuffer.changed_values(assoc, ["cohort", "total_cohort_size", "evidence"])
+
+    assert values == {"cohort": {"cohort_count": 3, "cohort_type": "unrelated"}, "total_cohort_size": 3}
+
+
+def test_unchanged_document_adds_no_update(associations):
+    buffer = WriteBuffer(AssociationInformation)
+    buffer.add_document(AssociationInformation.objects.first(), ["cohort", "inheritance"])
+
+    assert buffer.operations == []
+
+
+def test_updates_are_written_in_batches(associations):
+    buffer = WriteBuffer(AssociationInformation, batch_size=2)
+    for assoc in associations:
+        assoc.total_cohort_size = assoc.pheno_mimNumber
+        buffer.add_document(assoc, ["total_cohort_size"])
+        assert not assoc._get_changed_fields()
+
+    # Full batches are written as they fill up, the rest on flush
+    assert buffer.stats()["batches"] == 2 and len(buffer.operations) == 1
+    assert AssociationInformation.objects(total_cohort_size__ne=None).count() == 4
+    buffer.flush()
+
+    assert buffer.stats()["written"] == 5 and buffer.operations == []
+    assert {a.pheno_mimNumber: a.total_cohort_size for a in AssociationInformation.objects} == \
+        {a.pheno_mimNumber: a.pheno_mimNumber for a in associations}
+    assert AssociationInformation.objects(inheritance="AD").count() == 5